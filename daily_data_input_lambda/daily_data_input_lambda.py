@@ -1,7 +1,13 @@
 import json
 import os
 import logging
-from handlers import health_data_handler
+from cold_start_profiler import ColdStartProfiler
+
+profiler = ColdStartProfiler("daily_data_input_lambda.lambda_handler")
+profiler.install_import_hook()
+
+with profiler.phase("import handlers"):
+    from handlers import health_data_handler
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -10,6 +16,13 @@ API_KEY = os.environ.get("DATA_INPUT_API_KEY", "")
 
 
 def lambda_handler(event, context):
+    try:
+        return _handle_request(event)
+    finally:
+        profiler.emit()
+
+
+def _handle_request(event):
     # Auth check
     headers = event.get("headers") or {}
     provided_key = headers.get("x-api-key") or headers.get("X-Api-Key")
@@ -28,7 +41,8 @@ def lambda_handler(event, context):
     logger.info("Received request: %s", route_key)
 
     if "POST /health-data" in route_key:
-        status_code, response_body = health_data_handler.handle(body)
+        with profiler.phase("handle health data"):
+            status_code, response_body = health_data_handler.handle(body)
     else:
         status_code, response_body = 404, {"error": f"Unknown route: {route_key}"}
 
@@ -59,7 +59,9 @@ echo "✅ S3 permissions attached."
 
 # ---------- 3. Build and Push Docker Image ----------
 echo "🔧 Building Docker image..."
-docker build --platform linux/amd64 --provenance=false -t $IMAGE_NAME .
+docker build --platform linux/amd64 --provenance=false \
+  --build-context lambda_helpers=../lambda/lambda_helpers \
+  -t $IMAGE_NAME .
 
 echo "🏷️ Tagging image: $ECR_URI"
 docker tag $IMAGE_NAME:latest $ECR_URI
@@ -15,7 +15,9 @@ IAM_ROLE_ARN="arn:aws:iam::$AWS_ACCOUNT_ID:role/service-role/bethpaige-black-bot
 cd $(dirname $0)
 
 echo "🔧 Building Docker image..."
-docker build --platform linux/amd64 --provenance=false -t $IMAGE_NAME .
+docker build --platform linux/amd64 --provenance=false \
+  --build-context lambda_helpers=../lambda/lambda_helpers \
+  -t $IMAGE_NAME .
 
 echo "🏷️ Tagging image with: $ECR_URI"
 docker tag $IMAGE_NAME:latest $ECR_URI
@@ -1,23 +1,62 @@
 import logging
+from collections import OrderedDict
+from datetime import datetime
+from lambda_helpers.date_handler import DateHandler
 from lambda_helpers.dynamo_db_connection import DynamoDBConnection
 from lambda_helpers.email_sender import EmailSender
 from lambda_helpers.one_time_link_handler import OneTimeLinkHandler
+from lambda_helpers.tee_time import normalize_count
 from lambda_helpers.bethpage_black_config import BethpageBlackBotConfig
 from decimal import Decimal
+import hashlib
 import json
 import traceback
 import time
 
 logger = logging.getLogger(__name__)
 
+RECENT_TIMES_CACHE_SECONDS = 15  # serve cached /getRecentTimes bodies without checking the publish id
+RECENT_TIMES_CACHE_MAX_BODIES = 64
+RECENT_TIMES_MAX_PAGE_SIZE = 500
+# New times are published at most every few minutes; let the browser/CDN reuse a response briefly
+RECENT_TIMES_CACHE_CONTROL = "public, max-age=30"
+
+
+class InvalidQueryError(ValueError):
+    pass
+
 
 class ApiGatewayHandler:
-    def __init__(self):
-        self.email_sender = EmailSender()
-        self.ddc = DynamoDBConnection()
-        self.otlh = OneTimeLinkHandler()
+    # Warm-container cache of the latest tee times and the serialized
+    # /getRecentTimes bodies built from them, keyed by (publish id, query)
+    _recent_times_cache = {"publish_id": None, "checked_at": 0.0, "tee_times": None, "bodies": OrderedDict()}
+
+    def __init__(self, email_sender=None, ddc=None, otlh=None):
+        # Collaborators are built on first use, so each route only pays for
+        # the clients it touches (/getRecentTimes never needs SES or secrets)
+        self._email_sender = email_sender
+        self._ddc = ddc
+        self._otlh = otlh
         self.verbose = False
 
+    @property
+    def email_sender(self):
+        if self._email_sender is None:
+            self._email_sender = EmailSender()
+        return self._email_sender
+
+    @property
+    def ddc(self):
+        if self._ddc is None:
+            self._ddc = DynamoDBConnection()
+        return self._ddc
+
+    @property
+    def otlh(self):
+        if self._otlh is None:
+            self._otlh = OneTimeLinkHandler()
+        return self._otlh
+
     def handle(self, event):
         headers = event.get("headers", {})
         origin = headers.get("origin") or headers.get("Origin")
@@ -38,14 +77,17 @@ class ApiGatewayHandler:
 
             response_body = {}
             status_code = 200
+            response_headers = {}
+            etag = None
 
             # GETS MOST RECENTLY-SCRAPED TEE TIMES
             if method == "GET" and path == "/getRecentTimes":
-                recentTimes = self.get_recent_times_from_db()
-                response_body = {
-                    "message": "Recent times retrieved",
-                    "result": recentTimes,
-                }
+                try:
+                    response_body, etag = self.get_recent_times_body(event.get("queryStringParameters") or {})
+                    response_headers["Cache-Control"] = RECENT_TIMES_CACHE_CONTROL
+                except InvalidQueryError as e:
+                    response_body = {"error": str(e)}
+                    status_code = 400
 
             # REGISTERS A NEW USER
             elif method == "POST" and path == "/register":
@@ -110,6 +152,13 @@ class ApiGatewayHandler:
                 response_body = {"error": "Unsupported route"}
                 status_code = 404
 
+            if etag:
+                response_headers["ETag"] = etag
+                # Only GET routes set an ETag: 304 is only defined for GET/HEAD (RFC 9110 13.1.2)
+                if method == "GET" and self.etag_matches(event, etag):
+                    response_body = ""
+                    status_code = 304
+
             elapsed_time = time.time() - start_time
             logger.info(
                 "API response: %s %s (%.2fs) - status %d",
@@ -118,7 +167,7 @@ class ApiGatewayHandler:
                 elapsed_time,
                 status_code,
             )
-            return self.format_api_response(response_body, status_code)
+            return self.format_api_response(response_body, status_code, response_headers)
         except Exception as e:
             logger.error(
                 "API error processing %s: %s",
@@ -132,6 +181,98 @@ class ApiGatewayHandler:
     def get_recent_times_from_db(self):
         return self.ddc.get_latest_tee_times_all()
 
+    @classmethod
+    def clear_recent_times_cache(cls):
+        cls._recent_times_cache.update(publish_id=None, checked_at=0.0, tee_times=None, bodies=OrderedDict())
+
+    def get_recent_times_body(self, query_params):
+        """(serialized body, ETag) for the filter/page in query_params, cached per publish."""
+        query = self.parse_recent_times_query(query_params)
+        publish_id, tee_times = self.get_cached_recent_times()
+
+        bodies = ApiGatewayHandler._recent_times_cache["bodies"]
+        cache_key = (publish_id, query)
+        if cache_key in bodies:
+            bodies.move_to_end(cache_key)
+            return bodies[cache_key]
+
+        body = json.dumps(
+            self.build_recent_times_response(tee_times, *query),
+            default=self.decimal_default,
+        )
+        bodies[cache_key] = body, self.make_etag(body)
+        if len(bodies) > RECENT_TIMES_CACHE_MAX_BODIES:
+            bodies.popitem(last=False)
+        return bodies[cache_key]
+
+    def get_cached_recent_times(self):
+        """(publish_id, tee_times), re-reading the list only when a new scrape has been published."""
+        cache = ApiGatewayHandler._recent_times_cache
+        now = time.time()
+        if cache["tee_times"] is not None and now - cache["checked_at"] < RECENT_TIMES_CACHE_SECONDS:
+            return cache["publish_id"], cache["tee_times"]
+
+        publish_id = self.ddc.get_latest_publish_id()
+        # Items written before publish ids existed have none, so they are never treated as cached
+        if publish_id is None or publish_id != cache["publish_id"] or cache["tee_times"] is None:
+            cache.update(
+                publish_id=publish_id,
+                tee_times=self.get_recent_times_from_db(),
+                bodies=OrderedDict(),
+            )
+            logger.info("Loaded latest tee times for publish %s", publish_id)
+        cache["checked_at"] = now
+        return cache["publish_id"], cache["tee_times"]
+
+    @staticmethod
+    def parse_recent_times_query(params):
+        """Validate queryStringParameters into a hashable (date, min_players, holes, limit, cursor)."""
+        try:
+            date = params.get("date") or None
+            if date:
+                try:
+                    # Accept YYYY-MM-DD as well as the site's "Saturday May 30th" labels
+                    date = DateHandler().format_date_label(datetime.strptime(date, "%Y-%m-%d").date())
+                except ValueError:
+                    pass
+            min_players = int(params["min_players"]) if params.get("min_players") else None
+            holes = int(params["holes"]) if params.get("holes") else None
+            limit = int(params["limit"]) if params.get("limit") else None
+            cursor = int(params.get("cursor") or 0)
+        except ValueError as e:
+            raise InvalidQueryError(f"Invalid query parameter: {e}") from e
+
+        if limit is not None and not 1 <= limit <= RECENT_TIMES_MAX_PAGE_SIZE:
+            raise InvalidQueryError(f"limit must be between 1 and {RECENT_TIMES_MAX_PAGE_SIZE}")
+        if cursor < 0:
+            raise InvalidQueryError("cursor must not be negative")
+        return date, min_players, holes, limit, cursor
+
+    @staticmethod
+    def count_matches(value, wanted, at_least=False):
+        """Compare a stored Players/Holes label; one that isn't a count (legacy rows) never matches."""
+        count = normalize_count(value)
+        if not isinstance(count, int):
+            return False
+        return count >= wanted if at_least else count == wanted
+
+    @staticmethod
+    def build_recent_times_response(tee_times, date, min_players, holes, limit, cursor):
+        count_matches = ApiGatewayHandler.count_matches
+        matching = [
+            t for t in tee_times or []
+            if (date is None or t["Date"] == date)
+            and (min_players is None or count_matches(t["Players"], min_players, at_least=True))
+            and (holes is None or count_matches(t["Holes"], holes))
+        ]
+        end = len(matching) if limit is None else cursor + limit
+        return {
+            "message": "Recent times retrieved",
+            "result": matching[cursor:end],
+            "total": len(matching),
+            "next_cursor": str(end) if end < len(matching) else None,
+        }
+
     def register_new_user(self, event):
         body = json.loads(event.get("body", "{}"))
         email = body.get("email")
@@ -194,17 +335,34 @@ class ApiGatewayHandler:
 
         return is_link_valid, emailOrErrorMessage, is_pause
 
-    def format_api_response(self, body, status_code):
+    @staticmethod
+    def format_api_response(body, status_code, headers=None):
         if not isinstance(body, str):
-            body = json.dumps(body, default=self.decimal_default)
+            body = json.dumps(body, default=ApiGatewayHandler.decimal_default)
 
         return {
             "statusCode": status_code,
             "body": body,
-            "headers": {"Content-Type": "application/json"},
+            "headers": {"Content-Type": "application/json", **(headers or {})},
         }
 
-    def decimal_default(self, obj):
+    @staticmethod
+    def make_etag(body):
+        """Strong ETag from the exact serialized body."""
+        return '"' + hashlib.sha256(body.encode()).hexdigest()[:32] + '"'
+
+    @staticmethod
+    def etag_matches(event, etag):
+        headers = event.get("headers") or {}
+        if_none_match = headers.get("if-none-match") or headers.get("If-None-Match")
+        if not if_none_match:
+            return False
+        # If-None-Match uses weak comparison, so W/"x" matches "x"
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+    @staticmethod
+    def decimal_default(obj):
         if isinstance(obj, Decimal):
             # Convert to int if whole number, else float
             return int(obj) if obj % 1 == 0 else float(obj)
@@ -0,0 +1,28 @@
+import logging
+from lambda_helpers.cold_start_profiler import ColdStartProfiler
+
+profiler = ColdStartProfiler("api_main.lambda_handler")
+profiler.install_import_hook()
+
+# API-only entry point (Dockerfile.api): boto3 plus the config/link helpers,
+# no Chrome, Selenium, astral or holidays
+with profiler.phase("import api_gateway_handler"):
+    from api_gateway_handler import ApiGatewayHandler
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def lambda_handler(event, context):
+    try:
+        if "routeKey" not in event:
+            logger.warning("api_main received a non-API Gateway event, ignoring")
+            return ApiGatewayHandler.format_api_response(
+                {"error": "This function only handles API Gateway requests"}, 400
+            )
+
+        with profiler.phase("handle api request"):
+            handler = ApiGatewayHandler()
+            return handler.handle(event)
+    finally:
+        profiler.emit()
@@ -0,0 +1,22 @@
+"""
+One-off migration for the one-time links table's TTL attribute.
+Deletes expired links in batches and adds the epoch expire_at to live links
+that only have the ISO expire_time, so DynamoDB TTL expires them from now on.
+Safe to re-run; only links without expire_at or already past it are scanned.
+Run from the lambda/ directory after deploy_dynamo_db.sh has enabled TTL:
+python backfill_one_time_link_ttl.py
+"""
+
+import logging
+from lambda_helpers.one_time_link_handler import OneTimeLinkHandler
+
+logging.basicConfig(level=logging.INFO)
+
+
+def run():
+    removed, backfilled = OneTimeLinkHandler().remove_old_one_time_links()
+    print(f"Removed {removed} expired links, added expire_at to {backfilled} live links")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,107 @@
+"""
+Benchmark API Gateway cold starts with eager vs. lazy collaborator construction.
+Every sample runs in a fresh interpreter (imports + handler init + one
+GET /getRecentTimes), which is what a cold Lambda container pays.
+Run from the lambda/ directory: python benchmark_api_cold_start.py [samples] [--offline]
+--offline fakes the Secrets Manager and DynamoDB round trips with fixed
+latencies so it runs without AWS credentials; boto3 client setup is still real.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import ExitStack
+from unittest.mock import MagicMock, patch
+
+SIMULATED_SECRET_SECONDS = 0.04
+SIMULATED_DYNAMODB_SECONDS = 0.01
+EVENT = {"routeKey": "GET /getRecentTimes", "headers": {"origin": "https://www.bethpage-black-bot.com"}}
+
+
+def fake_secrets_client():
+    def get_secret_value(SecretId):
+        time.sleep(SIMULATED_SECRET_SECONDS)
+        return {"SecretString": json.dumps({
+            "sender_email": "bot@example.com",
+            "one_time_link_email": "links@example.com",
+            "admin_notify_email": "admin@example.com",
+        })}
+
+    return MagicMock(get_secret_value=get_secret_value)
+
+
+def simulated_dynamodb_read(result):
+    def read(*args, **kwargs):
+        time.sleep(SIMULATED_DYNAMODB_SECONDS)
+        return result
+
+    return read
+
+
+def offline_aws(stack):
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    from lambda_helpers.dynamo_db_connection import DynamoDBConnection
+    from lambda_helpers.secret_handler import SecretHandler
+
+    stack.enter_context(patch.object(SecretHandler, "_get_client", return_value=fake_secrets_client()))
+    stack.enter_context(patch.object(
+        DynamoDBConnection, "get_latest_publish_id", simulated_dynamodb_read("2026-05-28T07:00:00")
+    ))
+    stack.enter_context(patch.object(
+        DynamoDBConnection, "get_latest_tee_times_all", simulated_dynamodb_read([])
+    ))
+
+
+def run_sample(mode, offline):
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        if offline:
+            offline_aws(stack)
+        from api_gateway_handler import ApiGatewayHandler
+        from lambda_helpers.dynamo_db_connection import DynamoDBConnection
+        from lambda_helpers.email_sender import EmailSender
+        from lambda_helpers.one_time_link_handler import OneTimeLinkHandler
+
+        if mode == "eager":
+            # What every request paid before collaborators were built lazily
+            handler = ApiGatewayHandler(
+                email_sender=EmailSender(), ddc=DynamoDBConnection(), otlh=OneTimeLinkHandler()
+            )
+        else:
+            handler = ApiGatewayHandler()
+        response = handler.handle(EVENT)
+    print(json.dumps({"seconds": time.perf_counter() - start, "status": response["statusCode"]}))
+
+
+def measure(mode, samples, offline):
+    timings = []
+    for _ in range(samples):
+        args = [sys.executable, __file__, "--sample", mode] + (["--offline"] if offline else [])
+        output = subprocess.run(args, capture_output=True, text=True, check=True).stdout
+        timings.append(json.loads(output.strip().splitlines()[-1])["seconds"])
+    return timings
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    offline = "--offline" in sys.argv
+    if "--sample" in sys.argv:
+        run_sample(args[0], offline)
+        return
+
+    samples = int(args[0]) if args else 10
+    results = {mode: measure(mode, samples, offline) for mode in ("eager", "lazy")}
+    for mode, timings in results.items():
+        print(
+            f"{mode:>5}: median {statistics.median(timings) * 1000:7.1f} ms, "
+            f"max {max(timings) * 1000:7.1f} ms over {samples} cold starts"
+        )
+    saved = statistics.median(results["eager"]) - statistics.median(results["lazy"])
+    print(f"Lazy construction saves {saved * 1000:.1f} ms per cold /getRecentTimes request")
+
+
+if __name__ == "__main__":
+    main()
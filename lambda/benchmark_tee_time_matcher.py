@@ -0,0 +1,110 @@
+"""
+Benchmark the TeeTimeMatcher inverted index against per-user filtering.
+Builds synthetic subscribers and a ~100-slot scrape, checks that both paths
+return identical results, and prints the timings at each scale. Index lookups
+only cost the users they return, so its time tracks the matches column.
+Run from the lambda/ directory: python benchmark_tee_time_matcher.py [max_users]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from lambda_helpers.bethpage_black_config import BethpageBlackBotConfig
+from lambda_helpers.date_handler import DateHandler
+from lambda_helpers.tee_time import TeeTime
+from lambda_helpers.tee_time_filterer import TeeTimeFilterer
+
+DAYS_OF_WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+EARLIEST_TIMES = ["5:00am", "6:30am", "7:00am", "8:00am", "9:30am", "11:00am", "1:00pm"]
+
+
+class SyntheticConfigStore:
+    """Stands in for DynamoDBConnection's config reads."""
+
+    def __init__(self, configs):
+        self.configs = configs
+
+    def get_user_config(self, email):
+        return self.configs.get(email)
+
+    def get_user_configs(self, emails):
+        return {email: self.configs[email] for email in emails if email in self.configs}
+
+
+def make_synthetic_users(count, rng):
+    today = datetime.now().date()
+    configs = {}
+    for i in range(count):
+        email = f"user{i}@example.com"
+        extra_day = today + timedelta(days=rng.randint(0, 8))
+        configs[email] = BethpageBlackBotConfig({
+            "playable_days_of_week": rng.sample(DAYS_OF_WEEK, rng.randint(1, 3)),
+            "earliest_playable_time": rng.choice(EARLIEST_TIMES),
+            "min_players": rng.randint(1, 4),
+            "minimum_minutes_before_sunset": rng.choice([60, 120, 240]),
+            "include_holidays": rng.random() < 0.5,
+            "in_state_golfer": rng.random() < 0.7,
+            "notifications_enabled": rng.random() < 0.9,
+            "extra_playable_days": (
+                [f"{extra_day.month}/{extra_day.day}/{extra_day.year}"] if rng.random() < 0.1 else []
+            ),
+            "start_date": "1/1",
+            "end_date": "12/31",
+        }).config_to_dynamodb_item(email)
+    return configs
+
+
+def make_synthetic_tee_times(rng, slots_per_day=11, days=9):
+    date_handler = DateHandler()
+    today = datetime.now().date()
+    tee_times = []
+    for offset in range(days):
+        day = today + timedelta(days=offset)
+        date_label = date_handler.format_date_label(day)
+        for _ in range(slots_per_day):
+            hour = rng.randint(6, 18)
+            tee_times.append(TeeTime.from_labels(
+                date_label,
+                f"{hour % 12 or 12}:{rng.choice(['00', '10', '20', '30', '40', '50'])}"
+                f"{'am' if hour < 12 else 'pm'}",
+                rng.randint(1, 4),
+                rng.choice([18, 18, 18, 9]),
+            ))
+    return tee_times
+
+
+def time_filter(configs, tee_times, use_index):
+    filterer = TeeTimeFilterer(db_connection=SyntheticConfigStore(configs))
+    # Config loading and compilation cost the same on both paths; time matching only
+    filterer.load_user_configs(list(configs))
+    for email in configs:
+        filterer.get_user_filter(email)
+    start = time.perf_counter()
+    result = filterer.filter_tee_times_for_users(tee_times, list(configs), use_index=use_index)
+    return result, time.perf_counter() - start
+
+
+def run(max_users):
+    rng = random.Random(42)
+    tee_times = make_synthetic_tee_times(rng)
+    all_configs = make_synthetic_users(max_users, rng)
+    print(f"{len(tee_times)} tee times per run")
+    print(f"{'users':>8} {'matches':>9} {'per-user (s)':>14} {'index (s)':>11} {'speedup':>9}")
+
+    user_count = 100
+    while user_count <= max_users:
+        configs = dict(list(all_configs.items())[:user_count])
+        per_user_result, per_user_seconds = time_filter(configs, tee_times, use_index=False)
+        index_result, index_seconds = time_filter(configs, tee_times, use_index=True)
+        assert per_user_result == index_result, "Matching engine output differs from per-user filter"
+        match_count = sum(len(matched) for matched in index_result.values())
+        print(
+            f"{user_count:>8} {match_count:>9} {per_user_seconds:>14.3f} {index_seconds:>11.3f} "
+            f"{per_user_seconds / index_seconds:>8.1f}x"
+        )
+        user_count *= 10
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -1,19 +1,35 @@
+import asyncio
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from lambda_helpers.dynamo_db_connection import DynamoDBConnection
+from lambda_helpers.email_dispatcher import EmailDispatcher, summarize_failures
 from lambda_helpers.email_sender import EmailSender
 from lambda_helpers.one_time_link_handler import OneTimeLinkHandler
 from lambda_helpers.secret_handler import SecretHandler
 from lambda_helpers.tee_time_filterer import TeeTimeFilterer
+from lambda_helpers.tee_time import fingerprint_tee_times, tee_time_key, tee_time_to_dict
 from lambda_helpers.web_scraper import WebScraper
+from datetime import datetime
 import traceback
 
 logger = logging.getLogger(__name__)
 
 PAUSE_LINK_EXPIRE_MINUTES = 10080  # 7 days
+USE_MATCHING_ENGINE = True  # False = filter every tee time for every user
+# "async" overlaps the DynamoDB reads with the scrape and the state writes with the
+# pause link writes; "serial" runs every step in turn
+PIPELINE_MODE = os.environ.get("BETHPAGE_PIPELINE_MODE", "async").lower()
+PIPELINE_THREADS = 2
 
 
 class BethpageBlackBot:
 
+    def __init__(self, pipeline_mode=PIPELINE_MODE):
+        self.pipeline_mode = pipeline_mode
+
     def notify_if_new_tee_times(self):
         logger.info("Starting tee time notification process")
         self.bethpage_email, self.bethpage_password = (
@@ -22,10 +38,16 @@ class BethpageBlackBot:
         email_sender = EmailSender()
         otlh = OneTimeLinkHandler(expire_minutes=PAUSE_LINK_EXPIRE_MINUTES)
         try:
-            new_times = self.get_new_tee_times()
-            for email, new_times_list in new_times.items():
-                pause_guid = otlh.generate_and_store_link(email, is_pause=True)
-                email_sender.send_email(email, new_times_list, pause_guid=pause_guid)
+            if self.pipeline_mode == "serial":
+                new_times = self.get_new_tee_times()
+                pause_guids = otlh.generate_and_store_links(new_times, is_pause=True)
+            else:
+                new_times, pause_guids = asyncio.run(self.get_new_tee_times_async(otlh))
+            results = EmailDispatcher(email_sender).send_all(new_times, pause_guids)
+            failure_summary = summarize_failures(results)
+            if failure_summary:
+                # Don't raise: the other users were notified and the times are already published
+                email_sender.send_error_email(failure_summary)
         except Exception as e:
             logger.error("Error in tee time notification process: %s", str(e), exc_info=True)
             error_message = traceback.format_exc()
@@ -40,39 +62,117 @@ class BethpageBlackBot:
         tee_times = web_scraper.get_tee_time_data()
         logger.info("Found %d tee times on website", len(tee_times))
 
-        available_times_by_day = dynamo_db_connection.get_available_times_by_day()
-        already_seen = [t for times in available_times_by_day.values() for t in times]
+        config_version = dynamo_db_connection.get_config_version()
+        fingerprint = fingerprint_tee_times(
+            tee_times, datetime.now().date().isoformat(), config_version
+        )
+        if fingerprint == dynamo_db_connection.get_scrape_fingerprint():
+            logger.info(
+                "Heartbeat: scrape unchanged since last run (%d tee times, fingerprint %s), skipping",
+                len(tee_times), fingerprint[:12],
+            )
+            return {}
+
+        already_seen = dynamo_db_connection.get_seen_tee_time_keys()
+
+        all_emails, user_configs = dynamo_db_connection.get_all_emails_and_configs(config_version)
+        emails_to_send, newly_sent = self.match_new_tee_times(
+            tee_time_filterer, tee_times, already_seen, all_emails, user_configs
+        )
+        self.save_run_state(dynamo_db_connection, tee_times, fingerprint, already_seen, newly_sent)
+
+        return emails_to_send
+
+    async def get_new_tee_times_async(self, otlh):
+        """
+        Same result as get_new_tee_times plus the stored pause link GUIDs, as
+        (emails_to_send, pause_guids). The config version and last fingerprint
+        are read while the scrape runs; the seen keys and user configs are only
+        read (side by side) once the scrape is known to have changed, so
+        heartbeat runs cost the same as in serial mode. The seen/publish writes
+        run alongside the pause link writes. boto3 resources aren't
+        thread-safe, so each DynamoDBConnection is only used by one thread at
+        a time (the link writes go through the OneTimeLinkHandler's own resource).
+        """
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        web_scraper = WebScraper(self.bethpage_email, self.bethpage_password)
+        dynamo_db_connection = DynamoDBConnection()
+
+        with ThreadPoolExecutor(max_workers=PIPELINE_THREADS) as executor:
+            tee_times, (config_version, last_fingerprint) = await asyncio.gather(
+                loop.run_in_executor(executor, web_scraper.get_tee_time_data),
+                loop.run_in_executor(executor, self.read_run_state, dynamo_db_connection),
+            )
+            logger.info("Found %d tee times on website", len(tee_times))
+
+            fingerprint = fingerprint_tee_times(
+                tee_times, datetime.now().date().isoformat(), config_version
+            )
+            if fingerprint == last_fingerprint:
+                logger.info(
+                    "Heartbeat: scrape unchanged since last run (%d tee times, fingerprint %s), skipping",
+                    len(tee_times), fingerprint[:12],
+                )
+                return {}, {}
 
-        all_emails = dynamo_db_connection.get_all_emails_list()
+            users_connection = DynamoDBConnection()
+            already_seen, (all_emails, user_configs) = await asyncio.gather(
+                loop.run_in_executor(executor, dynamo_db_connection.get_seen_tee_time_keys),
+                loop.run_in_executor(executor, users_connection.get_all_emails_and_configs, config_version),
+            )
+
+            tee_time_filterer = TeeTimeFilterer(db_connection=dynamo_db_connection)
+            emails_to_send, newly_sent = self.match_new_tee_times(
+                tee_time_filterer, tee_times, already_seen, all_emails, user_configs
+            )
+
+            # State is saved before any email goes out, as in serial mode
+            _, pause_guids = await asyncio.gather(
+                loop.run_in_executor(executor, partial(
+                    self.save_run_state, dynamo_db_connection, tee_times, fingerprint, already_seen, newly_sent
+                )),
+                loop.run_in_executor(executor, partial(
+                    otlh.generate_and_store_links, emails_to_send, is_pause=True
+                )),
+            )
+
+        logger.info("Async pipeline found alerts for %d users in %.2fs", len(emails_to_send), time.monotonic() - start)
+        return emails_to_send, pause_guids
+
+    def read_run_state(self, dynamo_db_connection):
+        """(config_version, last fingerprint): what the heartbeat check needs, in one worker thread."""
+        config_version = dynamo_db_connection.get_config_version()
+        last_fingerprint = dynamo_db_connection.get_scrape_fingerprint()
+        return config_version, last_fingerprint
+
+    def match_new_tee_times(self, tee_time_filterer, tee_times, already_seen, all_emails, user_configs):
+        """Returns ({email: [tee time dicts]}, tee_time_keys of new times across all users)."""
         logger.info("Processing tee times for %d users", len(all_emails))
+        tee_time_filterer.load_user_configs(all_emails, user_configs)
 
         emails_to_send = {}
-        newly_sent = {}  # {date: [tee_times]} accumulates new times across all users this run
+        newly_sent = set()  # tee_time_keys of new times across all users this run
+
+        filtered_by_email = tee_time_filterer.filter_tee_times_for_users(
+            tee_times, all_emails, use_index=USE_MATCHING_ENGINE
+        )
 
         for user_email in all_emails:
-            filtered_tee_times = tee_time_filterer.filter_tee_times_for_user(
-                tee_times, user_email
-            )
+            filtered_tee_times = filtered_by_email.get(user_email, [])
             new_tee_times = tee_time_filterer.remove_existing_tee_times(
                 filtered_tee_times, already_seen
             )
 
             if new_tee_times:
-                emails_to_send[user_email] = new_tee_times
+                emails_to_send[user_email] = [tee_time_to_dict(t) for t in new_tee_times]
                 logger.info("Found %d new tee times for %s", len(new_tee_times), user_email)
-                for t in new_tee_times:
-                    newly_sent.setdefault(t["Date"], [])
-                    if t not in newly_sent[t["Date"]]:
-                        newly_sent[t["Date"]].append(t)
+                newly_sent.update(tee_time_key(t) for t in new_tee_times)
 
-        if newly_sent:
-            for date, times in newly_sent.items():
-                available_times_by_day.setdefault(date, [])
-                for t in times:
-                    if t not in available_times_by_day[date]:
-                        available_times_by_day[date].append(t)
-            dynamo_db_connection.update_available_times_by_day(available_times_by_day)
+        return emails_to_send, newly_sent
 
-        dynamo_db_connection.publish_teetimes(tee_times)
+    def save_run_state(self, dynamo_db_connection, tee_times, fingerprint, already_seen, newly_sent):
+        if newly_sent:
+            dynamo_db_connection.update_seen_tee_time_keys(already_seen | newly_sent)
 
-        return emails_to_send
+        dynamo_db_connection.publish_teetimes(tee_times, fingerprint=fingerprint)
@@ -1,7 +1,9 @@
 #!/bin/bash
 
 # ---------- Config Variables ----------
-LAMBDA_NAME="bethpage-black-bot"
+# API-only function from deploy_api_lambda.sh; the scraper Lambda also
+# still handles these routes (main.py) if this is pointed back at it
+LAMBDA_NAME="bethpage-black-bot-api"
 API_NAME="bethpage-black-bot-api"
 STAGE_NAME="prod"
 RECENT_TIMES_ROUTE_PATH="/getRecentTimes"
@@ -60,10 +62,25 @@ ROUTES=(
 
 for ROUTE_KEY in "${ROUTES[@]}"; do
   echo "Adding route: $ROUTE_KEY"
-  aws apigatewayv2 create-route \
+  ROUTE_ID=$(aws apigatewayv2 get-routes \
     --api-id "$API_ID" \
-    --route-key "$ROUTE_KEY" \
-    --target integrations/$INTEGRATION_ID 2>/dev/null || echo "Route '$ROUTE_KEY' may already exist, skipping."
+    --query "Items[?RouteKey=='$ROUTE_KEY'].RouteId" \
+    --output text)
+  if [ -z "$ROUTE_ID" ]; then
+    aws apigatewayv2 create-route \
+      --api-id "$API_ID" \
+      --route-key "$ROUTE_KEY" \
+      --target integrations/$INTEGRATION_ID \
+      --no-cli-pager
+  else
+    # Re-point existing routes so switching LAMBDA_NAME takes effect
+    echo "Route '$ROUTE_KEY' exists, updating its integration."
+    aws apigatewayv2 update-route \
+      --api-id "$API_ID" \
+      --route-id "$ROUTE_ID" \
+      --target integrations/$INTEGRATION_ID \
+      --no-cli-pager
+  fi
 done
 
 # ---------- 5. Create Deployment and Stage ----------
@@ -108,7 +125,7 @@ aws lambda add-permission \
 echo "Enabling CORS..."
 aws apigatewayv2 update-api \
   --api-id "$API_ID" \
-  --cors-configuration AllowOrigins="$ALLOWED_ORIGINS",AllowMethods='["GET","POST","OPTIONS"]',AllowHeaders='["*"]',ExposeHeaders='["*"]',MaxAge=3600 \
+  --cors-configuration AllowOrigins="$ALLOWED_ORIGINS",AllowMethods='["GET","POST","OPTIONS"]',AllowHeaders='["*"]',ExposeHeaders='["ETag","Cache-Control"]',MaxAge=3600 \
   --no-cli-pager
 
 # ---------- 7. Output Final URL ----------
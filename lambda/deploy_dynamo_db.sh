@@ -28,7 +28,33 @@ create_table_if_not_exists() {
   fi
 }
 
+enable_ttl_if_disabled() {
+  local TABLE_NAME=$1
+  local ATTRIBUTE_NAME=$2
+
+  TTL_STATUS=$(aws dynamodb describe-time-to-live \
+    --table-name "$TABLE_NAME" \
+    --region "$AWS_REGION" \
+    --query 'TimeToLiveDescription.TimeToLiveStatus' \
+    --output text)
+  if [ "$TTL_STATUS" == "ENABLED" ] || [ "$TTL_STATUS" == "ENABLING" ]; then
+    echo "✅ TTL already enabled on '$TABLE_NAME'. Skipping."
+  else
+    echo "⏳ Enabling TTL on '$TABLE_NAME' ($ATTRIBUTE_NAME)"
+    aws dynamodb update-time-to-live \
+      --table-name "$TABLE_NAME" \
+      --time-to-live-specification "Enabled=true,AttributeName=$ATTRIBUTE_NAME" \
+      --region "$AWS_REGION" \
+      --no-cli-pager
+    echo "✅ TTL enabled on: $TABLE_NAME"
+  fi
+}
+
 # ---------- Run ----------
 create_table_if_not_exists "$CONFIG_TABLE_NAME"
 create_table_if_not_exists "$LINKS_TABLE_NAME"
 create_table_if_not_exists "$DAILY_UPDATES_TABLE_NAME"
+
+# One-time links carry an epoch expire_at; run lambda/backfill_one_time_link_ttl.py
+# once to migrate links written before it existed
+enable_ttl_if_disabled "$LINKS_TABLE_NAME" "expire_at"
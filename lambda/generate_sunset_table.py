@@ -0,0 +1,24 @@
+"""
+Regenerate lambda_helpers/sunset_table.json, the precomputed sunset table that
+ships with the Lambda image. Dates outside the table fall back to astral.
+Run from the lambda/ directory: python generate_sunset_table.py [first_year] [last_year]
+"""
+
+import json
+import sys
+from datetime import date, datetime
+from lambda_helpers.sunset_table import SunsetTable, SUNSET_TABLE_PATH
+
+
+def run(first_year, last_year):
+    table = SunsetTable.build_table(date(first_year, 1, 1), date(last_year, 12, 31))
+    with open(SUNSET_TABLE_PATH, "w") as f:
+        json.dump(table, f, indent=0, sort_keys=True)
+    print(f"Wrote {len(table)} sunsets to {SUNSET_TABLE_PATH}")
+
+
+if __name__ == "__main__":
+    this_year = datetime.now().year
+    first = int(sys.argv[1]) if len(sys.argv) > 1 else this_year
+    last = int(sys.argv[2]) if len(sys.argv) > 2 else first + 1
+    run(first, last)
@@ -0,0 +1,84 @@
+import builtins
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+PROFILE_COLD_START = os.environ.get("PROFILE_COLD_START", "false").lower() == "true"
+TOP_IMPORTS_LOGGED = 25
+
+
+class ColdStartProfiler:
+    """
+    Opt-in (PROFILE_COLD_START=true) import and init timing for a Lambda entry
+    point, logged as one JSON line per invocation. Import times are inclusive
+    (a module's time includes everything it imports) and cover modules first
+    loaded between install_import_hook() and the first emit().
+    """
+
+    def __init__(self, entry_point, enabled=PROFILE_COLD_START):
+        self.entry_point = entry_point
+        self.enabled = enabled
+        self.created_at = time.perf_counter()
+        self.cold_start = True
+        self.import_times = {}
+        self.phase_times = {}
+        self._original_import = None
+
+    def install_import_hook(self):
+        if not self.enabled or self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def remove_import_hook(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self.import_times.setdefault(name, time.perf_counter() - start)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.phase_times[name] = self.phase_times.get(name, 0.0) + time.perf_counter() - start
+
+    def emit(self):
+        """Log this invocation's profile and reset the per-invocation phases."""
+        if not self.enabled:
+            return
+        self.remove_import_hook()
+
+        record = {
+            "event": "cold_start_profile",
+            "entry_point": self.entry_point,
+            "cold_start": self.cold_start,
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phase_times.items()},
+        }
+        if self.cold_start:
+            slowest = sorted(self.import_times.items(), key=lambda item: item[1], reverse=True)
+            record["since_init_ms"] = round((time.perf_counter() - self.created_at) * 1000, 1)
+            record["modules_imported"] = len(self.import_times)
+            record["imports_ms"] = {
+                name: round(seconds * 1000, 1) for name, seconds in slowest[:TOP_IMPORTS_LOGGED]
+            }
+        logger.info(json.dumps(record))
+
+        self.cold_start = False
+        self.import_times = {}
+        self.phase_times = {}
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, time
+from typing import FrozenSet, NamedTuple, Optional, Tuple
+
+
+class CompiledUserFilter(NamedTuple):
+    """
+    Immutable, pre-parsed form of a BethpageBlackBotConfig.
+    Built once per user per run so the per-tee-time checks only compare
+    already-parsed values instead of re-parsing strings for every slot.
+    """
+
+    notifications_enabled: bool
+    earliest_playable_time: time
+    minimum_time_before_sunset: timedelta
+    min_players: int
+    playable_days_of_week: FrozenSet[str]
+    extra_playable_days: FrozenSet[str]  # M/D/YYYY
+    include_holidays: bool
+    date_range: Optional[Tuple[Tuple[int, int], Tuple[int, int]]]  # None = any date
+    in_state_golfer: bool
+    blackout_dates: FrozenSet[str]  # YYYY-MM-DD
+
+    @classmethod
+    def from_config(cls, user_config):
+        return cls(
+            notifications_enabled=user_config.notifications_enabled,
+            earliest_playable_time=datetime.strptime(
+                user_config.earliest_playable_time, "%I:%M%p"
+            ).time(),
+            minimum_time_before_sunset=timedelta(
+                minutes=user_config.minimum_minutes_before_sunset
+            ),
+            min_players=user_config.min_players,
+            playable_days_of_week=frozenset(user_config.playable_days_of_week),
+            extra_playable_days=frozenset(user_config.extra_playable_days),
+            include_holidays=user_config.include_holidays,
+            date_range=cls.parse_date_range(user_config.start_date, user_config.end_date),
+            in_state_golfer=user_config.in_state_golfer,
+            blackout_dates=frozenset(user_config.blackout_dates),
+        )
+
+    @staticmethod
+    def parse_date_range(start_date, end_date):
+        """Parse M/D start and end dates into (month, day) tuples, or None if unparseable."""
+        try:
+            start_parts = start_date.split('/')
+            end_parts = end_date.split('/')
+            start_md = (int(start_parts[0]), int(start_parts[1]))
+            end_md = (int(end_parts[0]), int(end_parts[1]))
+            return start_md, end_md
+        except (ValueError, AttributeError, IndexError):
+            # If parsing fails, default to allowing every date
+            return None
+
+    def is_in_date_range(self, date_obj):
+        if self.date_range is None:
+            return True
+        start_md, end_md = self.date_range
+        current_md = (date_obj.month, date_obj.day)
+
+        # Handle ranges that don't cross year boundary (e.g., March to November)
+        if start_md <= end_md:
+            return start_md <= current_md <= end_md
+        # Handle ranges that cross year boundary (e.g., November to March)
+        return current_md >= start_md or current_md <= end_md
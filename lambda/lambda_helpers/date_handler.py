@@ -11,6 +11,26 @@ class DateHandler():
 	
 	def strip_ordinal_suffix(self, s):
 		return re.sub(r'(st|nd|rd|th)', '', s)
+
+	def format_date_label(self, date_obj):
+		"""Format a date the way the booking site labels days, e.g. 'Saturday May 30th'."""
+		suffix = self.get_day_suffix(date_obj.day)
+		return date_obj.strftime(f"%A %B {date_obj.day}{suffix}")
+
+	def parse_date_label(self, date_str, year=None):
+		"""Parse 'Saturday May 30th' into ('Saturday', date). Defaults to the current year."""
+		parts = date_str.split()
+		day = self.strip_ordinal_suffix(parts[2])
+		year = year if year else datetime.now().year
+		return parts[0], datetime.strptime(f"{parts[1]} {day} {year}", "%B %d %Y").date()
+
+	def parse_time_label(self, time_str):
+		return datetime.strptime(time_str, "%I:%M%p").time()
+
+	def format_time_label(self, time_obj):
+		"""Format a time the way the booking site labels it, e.g. '8:10am'."""
+		meridiem = 'am' if time_obj.hour < 12 else 'pm'
+		return f"{time_obj.hour % 12 or 12}:{time_obj.minute:02d}{meridiem}"
 	
 	def get_date_from_day_number(self, day_number):
 		today = datetime.today()
@@ -18,7 +38,6 @@ class DateHandler():
 		for i in range(9):
 			candidate = today + timedelta(days=i)
 			if day_number.isdigit() and candidate.day == int(day_number):
-				suffix = self.get_day_suffix(candidate.day)
-				return candidate.strftime(f"%A %B {candidate.day}{suffix}")
+				return self.format_date_label(candidate)
 		
 		return None  # If not found in the next 7 days
\ No newline at end of file
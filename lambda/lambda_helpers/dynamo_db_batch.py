@@ -0,0 +1,26 @@
+import time
+
+BATCH_MAX_RETRIES = 5
+BATCH_RETRY_BASE_SECONDS = 0.05
+
+
+def retry_unprocessed(batch_call, request_items, unprocessed_key, on_response=None):
+    """
+    Call batch_call(RequestItems=request_items) (BatchGetItem/BatchWriteItem),
+    re-sending whatever comes back under unprocessed_key ("UnprocessedKeys" or
+    "UnprocessedItems") with exponential backoff, up to BATCH_MAX_RETRIES
+    times. on_response sees every response. Returns the request items still
+    unprocessed, or None once everything went through.
+    """
+    for attempt in range(BATCH_MAX_RETRIES + 1):
+        response = batch_call(RequestItems=request_items)
+        if on_response:
+            on_response(response)
+
+        request_items = response.get(unprocessed_key)
+        if not request_items:
+            return None
+        if attempt < BATCH_MAX_RETRIES:
+            time.sleep(BATCH_RETRY_BASE_SECONDS * (2 ** attempt))
+
+    return request_items
@@ -1,36 +1,159 @@
 import logging
+import os
+import time
 import boto3
+from boto3.dynamodb.conditions import Attr
 from datetime import datetime
 from lambda_helpers.bethpage_black_config import BethpageBlackBotConfig
+from lambda_helpers.dynamo_db_batch import retry_unprocessed
+from lambda_helpers.tee_time import decode_compact, diff_tee_times, encode_compact, tee_time_key, tee_time_to_dict
 
 logger = logging.getLogger(__name__)
 
 TEE_TIMES_TABLE_NAME = "tee-times"
 CONFIG_TABLE_NAME = "bethpage-black-bot-config"
 CONFIG_TABLE_ALL_EMAILS_ID = "all-emails"
+CONFIG_VERSION_OBJECT_ID = "config-version"
+CONFIG_VERSION_KEY = "version"
 LATEST_TEE_TIMES_OBJECT_ID = "latest-tee-times"
 ALL_TEE_TIMES_OBJECT_ID = "all_tee_times"
 AVAILABLE_TIMES_BY_DAY_ID = "available-times-by-day"
 AVAILABLE_TIMES_RESET_DATE_KEY = "last_reset_date"
+SCRAPE_FINGERPRINT_KEY = "scrape_fingerprint"
+PUBLISH_ID_KEY = "publish_id"
+HISTORY_TYPE_KEY = "history_type"
+HISTORY_SNAPSHOT = "snapshot"
+HISTORY_DELTA = "delta"
+HISTORY_ADDED_KEY = "added"
+HISTORY_REMOVED_KEY = "removed"
+DELTAS_SINCE_SNAPSHOT_KEY = "deltas_since_snapshot"
+SNAPSHOT_EVERY_N_DELTAS = 480  # roughly daily at one change per 3-minute poll
+BATCH_GET_MAX_KEYS = 100  # DynamoDB BatchGetItem limit
+# Backstop for config edits that skip bump_config_version (console, ad-hoc scripts)
+CONFIG_CACHE_MAX_AGE_SECONDS = int(os.environ.get("CONFIG_CACHE_MAX_AGE_SECONDS", "900"))
+
+
 class DynamoDBConnection:
+    # Module-lifetime cache of the email list and user configs. Lambda reuses
+    # warm containers between scheduled runs, so this survives until the
+    # config-version counter moves (bumped on every config/email-list write)
+    # or CONFIG_CACHE_MAX_AGE_SECONDS pass, whichever comes first.
+    _config_cache = {"version": None, "emails": None, "configs": None, "loaded_at": 0.0}
+
     def __init__(self):
         self.dynamodb = boto3.resource("dynamodb")
         self.table = self.dynamodb.Table(TEE_TIMES_TABLE_NAME)
         self.config_table = self.dynamodb.Table(CONFIG_TABLE_NAME)
 
-    def publish_teetimes(self, all_tee_times):
-        item = {
-            "id": datetime.now().isoformat(),
-            ALL_TEE_TIMES_OBJECT_ID: all_tee_times,
-        }
-        self.table.put_item(Item=item)
+    def publish_teetimes(self, all_tee_times, fingerprint=None):
+        """
+        Overwrite latest-tee-times and append to the history under an ISO
+        timestamp id. History items are deltas (slots added/removed since the
+        previous scrape), with a full snapshot every SNAPSHOT_EVERY_N_DELTAS
+        deltas; an unchanged list adds nothing. Returns the history id, or None.
+        """
+        all_tee_times = [tee_time_to_dict(t) for t in all_tee_times]
+        previous = self.get_latest_tee_times_object()
+        deltas_since_snapshot = int(previous.get(DELTAS_SINCE_SNAPSHOT_KEY, 0)) if previous else 0
+        history_id = datetime.now().isoformat()
+
+        if (
+            not previous
+            or ALL_TEE_TIMES_OBJECT_ID not in previous
+            or deltas_since_snapshot >= SNAPSHOT_EVERY_N_DELTAS
+        ):
+            history_item = {
+                "id": history_id,
+                HISTORY_TYPE_KEY: HISTORY_SNAPSHOT,
+                ALL_TEE_TIMES_OBJECT_ID: all_tee_times,
+            }
+            deltas_since_snapshot = 0
+        else:
+            added, removed = diff_tee_times(previous[ALL_TEE_TIMES_OBJECT_ID], all_tee_times)
+            history_item = None
+            if added or removed:
+                history_item = {
+                    "id": history_id,
+                    HISTORY_TYPE_KEY: HISTORY_DELTA,
+                    HISTORY_ADDED_KEY: added,
+                    HISTORY_REMOVED_KEY: removed,
+                }
+                deltas_since_snapshot += 1
+
+        if history_item:
+            self.table.put_item(Item=history_item)
+            logger.info("Stored %s history item %s", history_item[HISTORY_TYPE_KEY], history_id)
 
         latest_item = {
             "id": LATEST_TEE_TIMES_OBJECT_ID,
             ALL_TEE_TIMES_OBJECT_ID: all_tee_times,
+            DELTAS_SINCE_SNAPSHOT_KEY: deltas_since_snapshot,
+            PUBLISH_ID_KEY: history_id,
         }
+        if fingerprint:
+            latest_item[SCRAPE_FINGERPRINT_KEY] = fingerprint
         self.table.put_item(Item=latest_item)
-        return item["id"]
+        return history_item["id"] if history_item else None
+
+    def get_tee_times_at(self, timestamp):
+        """
+        Rebuild the published tee time list as of timestamp (datetime or ISO
+        string) from the last snapshot at or before it plus the deltas since.
+        Slots added by a delta come last. Returns None if no snapshot is that old.
+        """
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.isoformat()
+        history = sorted(self.scan_history_until(timestamp), key=lambda item: item["id"])
+
+        # Pre-delta history items are full copies without a history_type; they count as snapshots
+        snapshot_indexes = [
+            i for i, item in enumerate(history)
+            if item.get(HISTORY_TYPE_KEY, HISTORY_SNAPSHOT) == HISTORY_SNAPSHOT
+        ]
+        if not snapshot_indexes:
+            logger.warning("No tee time snapshot at or before %s", timestamp)
+            return None
+
+        start = snapshot_indexes[-1]
+        state = {tee_time_key(t): t for t in history[start][ALL_TEE_TIMES_OBJECT_ID]}
+        for delta in history[start + 1:]:
+            for tee_time in delta.get(HISTORY_REMOVED_KEY, []):
+                state.pop(tee_time_key(tee_time), None)
+            for tee_time in delta.get(HISTORY_ADDED_KEY, []):
+                state[tee_time_key(tee_time)] = tee_time
+        return list(state.values())
+
+    def scan_history_until(self, timestamp):
+        # The table has no sort key, so reading history means a filtered scan
+        scan_kwargs = {
+            "FilterExpression": Attr("id").lte(timestamp)
+            & (Attr(HISTORY_TYPE_KEY).exists() | Attr(ALL_TEE_TIMES_OBJECT_ID).exists())
+        }
+        items = []
+        while True:
+            response = self.table.scan(**scan_kwargs)
+            items.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                return items
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def get_latest_publish_id(self):
+        """Id of the last publish_teetimes call, for callers caching latest-tee-times."""
+        response = self.table.get_item(
+            Key={"id": LATEST_TEE_TIMES_OBJECT_ID},
+            ProjectionExpression="#publish_id",
+            ExpressionAttributeNames={"#publish_id": PUBLISH_ID_KEY},
+        )
+        return response.get("Item", {}).get(PUBLISH_ID_KEY)
+
+    def get_scrape_fingerprint(self):
+        """Fingerprint stored with the last published scrape (without reading the tee time list)."""
+        response = self.table.get_item(
+            Key={"id": LATEST_TEE_TIMES_OBJECT_ID},
+            ProjectionExpression="#fingerprint",
+            ExpressionAttributeNames={"#fingerprint": SCRAPE_FINGERPRINT_KEY},
+        )
+        return response.get("Item", {}).get(SCRAPE_FINGERPRINT_KEY)
     
     def get_latest_tee_times_object(self):
         response = self.table.get_item(Key = {'id': LATEST_TEE_TIMES_OBJECT_ID})
@@ -43,18 +166,27 @@ class DynamoDBConnection:
         all_tee_times = self.get_latest_tee_times_object()[ALL_TEE_TIMES_OBJECT_ID]
         return all_tee_times
 
-    def get_available_times_by_day(self):
-        """Returns {tee_time_date: [tee_times]} for today. Resets if it's a new day."""
+    def get_seen_tee_time_keys(self):
+        """Returns the set of tee_time_keys already notified today. Resets if it's a new day."""
         today = datetime.now().date().isoformat()
         response = self.table.get_item(Key={"id": AVAILABLE_TIMES_BY_DAY_ID})
         item = response.get("Item")
         if not item or item.get(AVAILABLE_TIMES_RESET_DATE_KEY) != today:
             logger.info("Resetting available-times-by-day for new day")
-            return {}
-        return {k: v for k, v in item.items() if k not in ("id", AVAILABLE_TIMES_RESET_DATE_KEY)}
+            return set()
+        return {
+            decode_compact(date_str, value)
+            for date_str, values in item.items()
+            if date_str not in ("id", AVAILABLE_TIMES_RESET_DATE_KEY)
+            for value in values
+        }
 
-    def update_available_times_by_day(self, times_by_day):
+    def update_seen_tee_time_keys(self, seen_keys):
+        """Store seen keys as {tee_time_date: ["Time|Players|Holes", ...]}."""
         today = datetime.now().date().isoformat()
+        times_by_day = {}
+        for key in sorted(seen_keys, key=str):
+            times_by_day.setdefault(key[0], []).append(encode_compact(key))
         item = {
             "id": AVAILABLE_TIMES_BY_DAY_ID,
             AVAILABLE_TIMES_RESET_DATE_KEY: today,
@@ -77,6 +209,7 @@ class DynamoDBConnection:
 
         updated_emails_object = {'id': CONFIG_TABLE_ALL_EMAILS_ID, 'emails': current_list + [new_email]}
         self.config_table.put_item(Item=updated_emails_object)
+        self.bump_config_version()
         logger.info("Added new email to list: %s", new_email)
         return True, ""
 
@@ -88,11 +221,84 @@ class DynamoDBConnection:
         item = response.get("Item")
         return item
     
+    def get_user_configs(self, emails):
+        """
+        Fetch many user configs with BatchGetItem, 100 keys per call, retrying
+        UnprocessedKeys with exponential backoff. Returns {email: item};
+        users without a config are omitted.
+        """
+        unique_emails = list(dict.fromkeys(emails))
+        configs = {}
+        for start in range(0, len(unique_emails), BATCH_GET_MAX_KEYS):
+            request_items = {
+                CONFIG_TABLE_NAME: {
+                    "Keys": [{"id": email} for email in unique_emails[start:start + BATCH_GET_MAX_KEYS]]
+                }
+            }
+            request_items = retry_unprocessed(
+                self.dynamodb.batch_get_item,
+                request_items,
+                "UnprocessedKeys",
+                on_response=lambda response: configs.update(
+                    (item["id"], item) for item in response.get("Responses", {}).get(CONFIG_TABLE_NAME, [])
+                ),
+            )
+            if request_items:
+                remaining = [key["id"] for key in request_items[CONFIG_TABLE_NAME]["Keys"]]
+                logger.warning("BatchGetItem left %d keys unprocessed, fetching individually", len(remaining))
+                for email in remaining:
+                    item = self.get_user_config(email)
+                    if item:
+                        configs[email] = item
+
+        logger.info("Loaded %d user configs for %d emails", len(configs), len(unique_emails))
+        return configs
+
     def create_or_update_user_config(self, user_email, new_config=None):
         config_object = BethpageBlackBotConfig(new_config) # uses defaults if new_config is none
         db_item = config_object.config_to_dynamodb_item(user_email)
 
         self.config_table.put_item(Item=db_item)
+        self.bump_config_version()
+
+    def get_config_version(self):
+        response = self.config_table.get_item(Key={"id": CONFIG_VERSION_OBJECT_ID})
+        item = response.get("Item")
+        return int(item[CONFIG_VERSION_KEY]) if item else 0
+
+    def bump_config_version(self):
+        """Invalidate warm-container config caches. Call after the write it covers."""
+        self.config_table.update_item(
+            Key={"id": CONFIG_VERSION_OBJECT_ID},
+            UpdateExpression="ADD #version :one",
+            ExpressionAttributeNames={"#version": CONFIG_VERSION_KEY},
+            ExpressionAttributeValues={":one": 1},
+        )
+
+    def get_all_emails_and_configs(self, version=None, max_age=CONFIG_CACHE_MAX_AGE_SECONDS):
+        """
+        Returns (emails, {email: config item}), re-reading the config table only
+        when the version stamp differs from the one the cached copy was read at
+        or the copy is older than max_age seconds. Pass version if the caller
+        has already read it this run.
+        """
+        cache = DynamoDBConnection._config_cache
+        if version is None:
+            version = self.get_config_version()
+        if (
+            cache["version"] == version
+            and cache["emails"] is not None
+            and time.time() - cache["loaded_at"] < max_age
+        ):
+            logger.info("Config version %d unchanged, using cached configs", version)
+            return cache["emails"], cache["configs"]
+
+        emails = self.get_all_emails_list() or []
+        configs = self.get_user_configs(emails)
+        # The version was read first, so a write racing this load just forces a reload next run
+        cache.update(version=version, emails=emails, configs=configs, loaded_at=time.time())
+        logger.info("Loaded configs at version %d", version)
+        return emails, configs
 
 
 # d = DynamoDBConnection()
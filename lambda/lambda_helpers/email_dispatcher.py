@@ -0,0 +1,258 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+from botocore.exceptions import ClientError
+from lambda_helpers.email_templates import alert_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# SES production accounts start at 14 messages/second; raise to match the account's quota
+EMAIL_SEND_RATE = float(os.environ.get("EMAIL_SEND_RATE", "14"))
+EMAIL_MAX_WORKERS = int(os.environ.get("EMAIL_MAX_WORKERS", "8"))
+EMAIL_BULK_SEND = os.environ.get("EMAIL_BULK_SEND", "true").lower() == "true"
+BULK_SEND_MAX_DESTINATIONS = 50  # SES SendBulkTemplatedEmail limit
+BULK_SEND_MIN_RECIPIENTS = 2
+MAX_SEND_ATTEMPTS = 4
+BASE_BACKOFF_SECONDS = 0.25
+MAX_BACKOFF_SECONDS = 4.0
+THROTTLE_ERROR_CODES = {"Throttling", "ThrottlingException", "TooManyRequestsException"}
+TEMPLATE_MISSING_ERROR_CODES = {"TemplateDoesNotExist", "TemplateDoesNotExistException"}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: acquire() blocks until a token is available.
+    Refills at `rate` tokens per second up to `capacity` (defaults to one second's worth).
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated_at = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+
+class SendResult(NamedTuple):
+    email: str
+    sent: bool
+    attempts: int
+    error: Optional[str] = None
+
+
+def is_throttle_error(error):
+    if not isinstance(error, ClientError):
+        return False
+    code = error.response.get("Error", {}).get("Code", "")
+    message = error.response.get("Error", {}).get("Message", "")
+    return code in THROTTLE_ERROR_CODES or "Maximum sending rate exceeded" in message
+
+
+def is_template_missing_error(error):
+    return isinstance(error, ClientError) and error.response.get("Error", {}).get("Code") in TEMPLATE_MISSING_ERROR_CODES
+
+
+def backoff_seconds(attempt):
+    """Full-jitter exponential backoff for the given (1-based) failed attempt."""
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** (attempt - 1)))
+
+
+class EmailDispatcher:
+    """
+    Sends tee time alerts on a bounded thread pool. Every message takes a token
+    from a shared bucket so the pool never exceeds the SES send rate, and
+    throttled sends are retried with jittered backoff. One recipient's failure
+    doesn't stop the others; each gets a SendResult.
+
+    Recipients with identical new times are sent as one SES bulk templated
+    email per 50 destinations; anything the bulk call can't deliver falls
+    back to single sends.
+    """
+
+    def __init__(
+        self, email_sender, rate=EMAIL_SEND_RATE, max_workers=EMAIL_MAX_WORKERS,
+        bulk_send=EMAIL_BULK_SEND, sleep=time.sleep,
+    ):
+        self.email_sender = email_sender
+        self.max_workers = max_workers
+        self.bulk_send = bulk_send
+        self.sleep = sleep
+        self.bucket = TokenBucket(rate, sleep=sleep)
+
+    def send_one(self, email, new_times, pause_guid=None):
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            self.bucket.acquire()
+            try:
+                self.email_sender.send_email(email, new_times, pause_guid=pause_guid)
+                return SendResult(email, True, attempt)
+            except Exception as e:
+                if is_throttle_error(e) and attempt < MAX_SEND_ATTEMPTS:
+                    delay = backoff_seconds(attempt)
+                    logger.warning("SES throttled send to %s (attempt %d), retrying in %.2fs", email, attempt, delay)
+                    self.sleep(delay)
+                    continue
+                logger.error("Failed to send tee time alert to %s: %s", email, str(e))
+                return SendResult(email, False, attempt, str(e))
+
+    def ensure_template(self, new_times, with_pause_link):
+        """
+        Create (or reuse) the SES template for this chunk. CreateTemplate has its
+        own API limit, so throttles are retried here without taking send tokens.
+        """
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            try:
+                return self.email_sender.ensure_alert_template(new_times, with_pause_link)
+            except Exception as e:
+                if is_throttle_error(e) and attempt < MAX_SEND_ATTEMPTS:
+                    delay = backoff_seconds(attempt)
+                    logger.warning(
+                        "SES throttled template creation (attempt %d), retrying in %.2fs", attempt, delay
+                    )
+                    self.sleep(delay)
+                    continue
+                raise
+
+    def send_individually(self, new_times, emails, pause_guids):
+        return [self.send_one(email, new_times, pause_guids.get(email)) for email in emails]
+
+    def send_bulk(self, new_times, emails, pause_guids):
+        """Send one bulk chunk; returns a SendResult per email, falling back to send_one."""
+        with_pause_link = all(pause_guids.get(email) for email in emails)
+        try:
+            # Created before taking any send tokens, so template retries never spend them
+            template_name = self.ensure_template(new_times, with_pause_link)
+        except Exception as e:
+            logger.warning(
+                "Could not create SES alert template (%s), sending %d users individually", str(e), len(emails)
+            )
+            return self.send_individually(new_times, emails, pause_guids)
+
+        template_recreated = False
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            for _ in emails:
+                # SES counts each destination of a bulk send against the rate
+                self.bucket.acquire()
+            try:
+                errors = self.email_sender.send_bulk_email(
+                    template_name, {email: pause_guids.get(email) for email in emails}
+                )
+                break
+            except Exception as e:
+                if is_template_missing_error(e) and not template_recreated and attempt < MAX_SEND_ATTEMPTS:
+                    # Another warm container pruned it while it was still in this one's cache
+                    logger.warning("SES template %s is gone, recreating it", template_name)
+                    self.email_sender.forget_alert_template(template_name)
+                    template_recreated = True
+                    try:
+                        template_name = self.ensure_template(new_times, with_pause_link)
+                    except Exception as create_error:
+                        logger.warning(
+                            "Could not recreate SES alert template (%s), sending individually", str(create_error)
+                        )
+                        return self.send_individually(new_times, emails, pause_guids)
+                    continue
+                if is_throttle_error(e) and attempt < MAX_SEND_ATTEMPTS:
+                    delay = backoff_seconds(attempt)
+                    logger.warning("SES throttled bulk send (attempt %d), retrying in %.2fs", attempt, delay)
+                    self.sleep(delay)
+                    continue
+                logger.warning("Bulk send to %d users failed (%s), sending individually", len(emails), str(e))
+                return self.send_individually(new_times, emails, pause_guids)
+
+        results = []
+        for email in emails:
+            if errors[email] is None:
+                results.append(SendResult(email, True, attempt))
+            else:
+                logger.warning("Bulk send to %s failed (%s), sending individually", email, errors[email])
+                results.append(self.send_one(email, new_times, pause_guids.get(email)))
+        return results
+
+    def group_recipients(self, new_times_by_email, pause_guids):
+        """Recipient lists keyed by identical payload (times, and whether they get a pause link)."""
+        groups = OrderedDict()
+        for email, new_times in new_times_by_email.items():
+            key = (alert_fingerprint(new_times), bool(pause_guids.get(email)))
+            groups.setdefault(key, (new_times, []))[1].append(email)
+        return list(groups.values())
+
+    def send_all(self, new_times_by_email, pause_guids=None):
+        """Send every alert and return one SendResult per recipient, in input order."""
+        pause_guids = pause_guids or {}
+        if not new_times_by_email:
+            return []
+
+        start = time.monotonic()
+        single_sends = []
+        bulk_chunks = []
+        if self.bulk_send:
+            for new_times, emails in self.group_recipients(new_times_by_email, pause_guids):
+                if len(emails) < BULK_SEND_MIN_RECIPIENTS:
+                    single_sends.extend(emails)
+                    continue
+                for chunk_start in range(0, len(emails), BULK_SEND_MAX_DESTINATIONS):
+                    bulk_chunks.append((new_times, emails[chunk_start:chunk_start + BULK_SEND_MAX_DESTINATIONS]))
+        else:
+            single_sends = list(new_times_by_email)
+
+        if bulk_chunks:
+            try:
+                self.email_sender.prune_alert_templates()
+            except Exception as e:
+                logger.warning("Could not prune old SES alert templates: %s", str(e))
+
+        workers = max(1, min(self.max_workers, len(single_sends) + len(bulk_chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            bulk_futures = [
+                pool.submit(self.send_bulk, new_times, emails, pause_guids) for new_times, emails in bulk_chunks
+            ]
+            single_futures = [
+                pool.submit(self.send_one, email, new_times_by_email[email], pause_guids.get(email))
+                for email in single_sends
+            ]
+            by_email = {}
+            for future in bulk_futures:
+                by_email.update((result.email, result) for result in future.result())
+            for future in single_futures:
+                result = future.result()
+                by_email[result.email] = result
+        results = [by_email[email] for email in new_times_by_email]
+
+        sent = sum(1 for result in results if result.sent)
+        logger.info(
+            "Sent %d/%d tee time alerts (%d bulk calls) in %.2fs using %d workers",
+            sent, len(results), len(bulk_chunks), time.monotonic() - start, workers,
+        )
+        return results
+
+
+def summarize_failures(results):
+    """Plain-text summary of failed sends for the admin error email, or None if all succeeded."""
+    failed = [result for result in results if not result.sent]
+    if not failed:
+        return None
+    lines = [f"{len(failed)} of {len(results)} tee time alerts failed to send:"]
+    lines += [f"- {result.email} after {result.attempts} attempt(s): {result.error}" for result in failed]
+    return "\n".join(lines)
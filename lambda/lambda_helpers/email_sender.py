@@ -1,6 +1,15 @@
+import json
 import logging
 import boto3
-from collections import defaultdict
+from botocore.exceptions import ClientError
+from datetime import datetime, timedelta, timezone
+from lambda_helpers.email_templates import (
+    BOOKING_URL,
+    FRONTEND_URL,
+    TEE_TIME_ALERT_SUBJECT,
+    TeeTimeAlertTemplates,
+    pause_url,
+)
 from lambda_helpers.secret_handler import SecretHandler
 
 logger = logging.getLogger(__name__)
@@ -21,18 +30,22 @@ ONE_TIME_LINK_EMAIL_TEXT = (
 )
 ONE_TIME_LINK_EMAIL_SUBJECT = "One Time Link to Update Your Bethpage Black Bot Settings"
 
-FRONTEND_URL = "https://www.bethpage-black-bot.com"
+ALERT_TEMPLATE_PREFIX = "bethpage-alert-"
+ALERT_TEMPLATE_MAX_AGE = timedelta(days=2)
 
 
 class EmailSender:
 
+    # SES templates known to exist, shared by warm invocations
+    _created_alert_templates = set()
+
     def __init__(self):
         self.admin_email = SecretHandler.get_sender_email()
         self.one_time_link_email = SecretHandler.get_one_time_link_sender_email()
         self.admin_notify_email = SecretHandler.get_admin_notify_email()
         self.ses = boto3.client("ses", region_name="us-east-1")
 
-    BOOKING_URL = "https://foreupsoftware.com/index.php/booking/19765/2431#/teetimes"
+    BOOKING_URL = BOOKING_URL
 
     def send_email(self, email, new_times, pause_guid=None):
         logger.info(
@@ -40,70 +53,105 @@ class EmailSender:
             email,
             len(new_times),
         )
-        # Group times by date
-        grouped = defaultdict(list)
-        for time in new_times:
-            grouped[time["Date"]].append(time)
-
-        cell_style = "border: 1px solid #ddd; padding: 8px;"
-        header_style = f"{cell_style} text-align: left;"
-
-        # Build the HTML table
-        html_lines = [
-            "<html><body style=\"font-family: 'Roboto', Arial, sans-serif;\">",
-            "<h2>New Bethpage Tee Times Found</h2>",
-            "<table style='width: auto; border-collapse: collapse;'>",
-            f"<thead><tr style='background-color: #f0f0f0;'>"
-            f"<th style='{header_style}'>Date</th>"
-            f"<th style='{header_style}'>Time</th>"
-            f"<th style='{header_style}'>Players</th>"
-            f"<th style='{header_style}'>Holes</th>"
-            f"</tr></thead>",
-            "<tbody>",
-        ]
-
-        for date, entries in grouped.items():
-            for i, entry in enumerate(entries):
-                row = "<tr>"
-                if i == 0:
-                    row += (
-                        f"<td style='{cell_style}' rowspan='{len(entries)}'>{date}</td>"
-                    )
-                row += f"<td style='{cell_style}'>{entry['Time']}</td>"
-                row += f"<td style='{cell_style}'>{entry['Players']}</td>"
-                row += f"<td style='{cell_style}'>{entry['Holes']}</td>"
-                row += "</tr>"
-                html_lines.append(row)
-
-        pause_footer = ""
-        if pause_guid:
-            pause_url = f"{FRONTEND_URL}/updateSettings/{pause_guid}"
-            pause_footer = (
-                f"<hr style='margin-top:2rem; border:none; border-top:1px solid #ddd;'/>"
-                f"<p style='font-size:0.85em; color:#666;'>"
-                f"<a href='{pause_url}'>Pause notifications</a>"
-                f"To resume later, visit <a href='{FRONTEND_URL}'>{FRONTEND_URL}</a>, "
-                f"</p>"
-            )
-
-        html_lines += [
-            "</tbody></table>",
-            f"<p><a href='{self.BOOKING_URL}' target='_blank'>Book on Bethpage</a></p>",
-            pause_footer,
-            "</body></html>",
-        ]
-        body_html = "".join(html_lines)
+        # Recipients with the same new times share one render; only the pause link differs
+        body_html = TeeTimeAlertTemplates.render(new_times, pause_guid)
 
         # Send email with HTML body
         self.ses.send_email(
             Source=self.admin_email,
             Destination={"ToAddresses": [email]},
             Message={
-                "Subject": {"Data": "New Bethpage Tee Times Found"},
+                "Subject": {"Data": TEE_TIME_ALERT_SUBJECT},
                 "Body": {"Html": {"Data": body_html}},
             },
         )
 
+    def ensure_alert_template(self, new_times, with_pause_link=True):
+        """
+        Store the rendered alert for these times as an SES template (named by
+        its fingerprint, so the content never changes) and return its name.
+        """
+        fingerprint, template_html = TeeTimeAlertTemplates.get_template(new_times, with_pause_link)
+        template_name = f"{ALERT_TEMPLATE_PREFIX}{fingerprint[:40]}{'-pause' if with_pause_link else ''}"
+        if template_name in EmailSender._created_alert_templates:
+            return template_name
+
+        try:
+            self.ses.create_template(Template={
+                "TemplateName": template_name,
+                "SubjectPart": TEE_TIME_ALERT_SUBJECT,
+                "HtmlPart": template_html,
+            })
+            logger.info("Created SES template %s", template_name)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("AlreadyExists", "AlreadyExistsException"):
+                raise
+        EmailSender._created_alert_templates.add(template_name)
+        return template_name
+
+    def forget_alert_template(self, template_name):
+        """Drop a template from the warm-container cache, e.g. after another container pruned it."""
+        EmailSender._created_alert_templates.discard(template_name)
+
+    def send_bulk_email(self, template_name, pause_guids_by_email):
+        """
+        One send_bulk_templated_email call (at most 50 destinations), each
+        destination getting its own pause_url. Returns {email: error or None}.
+        """
+        emails = list(pause_guids_by_email)
+        logger.info("Sending tee time notification to %d users with template %s", len(emails), template_name)
+        destinations = []
+        for email in emails:
+            pause_guid = pause_guids_by_email[email]
+            replacement = {"pause_url": pause_url(pause_guid)} if pause_guid else {}
+            destinations.append({
+                "Destination": {"ToAddresses": [email]},
+                "ReplacementTemplateData": json.dumps(replacement),
+            })
+
+        response = self.ses.send_bulk_templated_email(
+            Source=self.admin_email,
+            Template=template_name,
+            DefaultTemplateData="{}",
+            Destinations=destinations,
+        )
+        # Status entries are in the same order as Destinations
+        statuses = response.get("Status", [])
+        errors = {}
+        for i, email in enumerate(emails):
+            status = statuses[i] if i < len(statuses) else {"Status": "Missing", "Error": "No status returned"}
+            if status.get("Status") == "Success":
+                errors[email] = None
+            else:
+                errors[email] = f"{status.get('Status')}: {status.get('Error', '')}"
+        return errors
+
+    def prune_alert_templates(self, max_age=ALERT_TEMPLATE_MAX_AGE):
+        """
+        Delete alert templates older than max_age so they don't pile up against
+        the SES template quota. Other warm containers may still have a deleted
+        template cached; EmailDispatcher recreates it when a bulk send reports
+        it missing.
+        """
+        cutoff = datetime.now(timezone.utc) - max_age
+        removed = 0
+        list_kwargs = {"MaxItems": 100}
+        while True:
+            response = self.ses.list_templates(**list_kwargs)
+            for template in response.get("TemplatesMetadata", []):
+                name = template.get("Name", "")
+                created = template.get("CreatedTimestamp")
+                if name.startswith(ALERT_TEMPLATE_PREFIX) and created and created < cutoff:
+                    self.ses.delete_template(TemplateName=name)
+                    EmailSender._created_alert_templates.discard(name)
+                    removed += 1
+            if not response.get("NextToken"):
+                break
+            list_kwargs["NextToken"] = response["NextToken"]
+        if removed:
+            logger.info("Deleted %d old SES alert templates", removed)
+        return removed
+
     def send_user_update_to_admin_email(
         self, user_email, config_dict, is_new_account=True
     ):
@@ -0,0 +1,115 @@
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+
+FRONTEND_URL = "https://www.bethpage-black-bot.com"
+BOOKING_URL = "https://foreupsoftware.com/index.php/booking/19765/2431#/teetimes"
+TEE_TIME_ALERT_SUBJECT = "New Bethpage Tee Times Found"
+
+# Handlebars-style so a rendered alert can also be used as an SES template
+PAUSE_URL_PLACEHOLDER = "{{pause_url}}"
+RENDERED_ALERTS_KEPT = 128
+
+CELL_STYLE = "border: 1px solid #ddd; padding: 8px;"
+HEADER_STYLE = f"{CELL_STYLE} text-align: left;"
+
+ALERT_HEADER_HTML = (
+    "<html><body style=\"font-family: 'Roboto', Arial, sans-serif;\">"
+    "<h2>New Bethpage Tee Times Found</h2>"
+    "<table style='width: auto; border-collapse: collapse;'>"
+    "<thead><tr style='background-color: #f0f0f0;'>"
+    f"<th style='{HEADER_STYLE}'>Date</th>"
+    f"<th style='{HEADER_STYLE}'>Time</th>"
+    f"<th style='{HEADER_STYLE}'>Players</th>"
+    f"<th style='{HEADER_STYLE}'>Holes</th>"
+    "</tr></thead>"
+    "<tbody>"
+)
+PAUSE_FOOTER_HTML = (
+    "<hr style='margin-top:2rem; border:none; border-top:1px solid #ddd;'/>"
+    "<p style='font-size:0.85em; color:#666;'>"
+    f"<a href='{PAUSE_URL_PLACEHOLDER}'>Pause notifications</a>"
+    f"To resume later, visit <a href='{FRONTEND_URL}'>{FRONTEND_URL}</a>, "
+    "</p>"
+)
+
+
+def pause_url(pause_guid):
+    return f"{FRONTEND_URL}/updateSettings/{pause_guid}"
+
+
+def alert_fingerprint(new_times):
+    """sha256 of the times in send order (row order is part of the rendered HTML)."""
+    digest = hashlib.sha256()
+    for time in new_times:
+        fields = (time.get("Date"), time.get("Time"), time.get("Players"), time.get("Holes"))
+        digest.update(("|".join(str(field) for field in fields) + "\n").encode())
+    return digest.hexdigest()
+
+
+def render_alert_template(new_times, with_pause_link):
+    """Full alert HTML with PAUSE_URL_PLACEHOLDER where the per-user pause link goes."""
+    grouped = defaultdict(list)
+    for time in new_times:
+        grouped[time["Date"]].append(time)
+
+    rows = []
+    for date, entries in grouped.items():
+        for i, entry in enumerate(entries):
+            row = "<tr>"
+            if i == 0:
+                row += f"<td style='{CELL_STYLE}' rowspan='{len(entries)}'>{date}</td>"
+            row += f"<td style='{CELL_STYLE}'>{entry['Time']}</td>"
+            row += f"<td style='{CELL_STYLE}'>{entry['Players']}</td>"
+            row += f"<td style='{CELL_STYLE}'>{entry['Holes']}</td>"
+            row += "</tr>"
+            rows.append(row)
+
+    return "".join([
+        ALERT_HEADER_HTML,
+        *rows,
+        "</tbody></table>",
+        f"<p><a href='{BOOKING_URL}' target='_blank'>Book on Bethpage</a></p>",
+        PAUSE_FOOTER_HTML if with_pause_link else "",
+        "</body></html>",
+    ])
+
+
+class TeeTimeAlertTemplates:
+    """
+    Rendered alert HTML keyed by the tee time set's fingerprint, so recipients
+    with the same new times share one render and only the pause link is filled
+    in per user. Kept at class level so warm invocations reuse it; locked
+    because EmailDispatcher renders from several threads.
+    """
+
+    _rendered = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_template(cls, new_times, with_pause_link=True):
+        """Returns (fingerprint, template_html) for this set of times."""
+        fingerprint = alert_fingerprint(new_times)
+        key = (fingerprint, with_pause_link)
+        with cls._lock:
+            template = cls._rendered.get(key)
+            if template is None:
+                template = render_alert_template(new_times, with_pause_link)
+                cls._rendered[key] = template
+                if len(cls._rendered) > RENDERED_ALERTS_KEPT:
+                    cls._rendered.popitem(last=False)
+            else:
+                cls._rendered.move_to_end(key)
+        return fingerprint, template
+
+    @classmethod
+    def render(cls, new_times, pause_guid=None):
+        _, template = cls.get_template(new_times, with_pause_link=bool(pause_guid))
+        if not pause_guid:
+            return template
+        return template.replace(PAUSE_URL_PLACEHOLDER, pause_url(pause_guid))
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._rendered.clear()
@@ -0,0 +1,160 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import requests
+from lambda_helpers.date_handler import DateHandler
+from lambda_helpers.tee_time import TeeTime, normalize_count
+
+logger = logging.getLogger(__name__)
+
+FOREUP_BASE_URL = "https://foreupsoftware.com/index.php"
+BETHPAGE_COURSE_ID = "19765"
+BETHPAGE_BLACK_SCHEDULE_ID = "2431"
+# Booking class of the "Verified NYS Resident - Bethpage/Sunken Meadow" button
+FOREUP_BOOKING_CLASS_ID = os.environ.get("FOREUP_BOOKING_CLASS_ID", "")
+FOREUP_API_KEY = "no_limits"  # public key the booking page itself sends
+DAYS_TO_FETCH = 9  # same window the calendar shows (see DateHandler.get_date_from_day_number)
+REQUEST_TIMEOUT_SECONDS = 10
+MAX_CONCURRENT_DAY_FETCHES = 4
+DAY_FETCH_ATTEMPTS = 3
+DAY_FETCH_RETRY_SECONDS = 0.25
+
+
+class ForeUpApiError(Exception):
+    pass
+
+
+class ForeUpApiClient:
+    """
+    Reads tee times straight from the foreUP booking backend that the booking
+    page calls, skipping Chrome entirely. Login gives a JWT that authorizes
+    the per-day /api/booking/times requests.
+    """
+
+    def __init__(
+        self,
+        username,
+        password,
+        base_url=FOREUP_BASE_URL,
+        booking_class_id=FOREUP_BOOKING_CLASS_ID,
+        max_workers=MAX_CONCURRENT_DAY_FETCHES,
+    ):
+        self.username = username
+        self.password = password
+        self.base_url = base_url.rstrip("/")
+        self.booking_class_id = booking_class_id
+        self.max_workers = max_workers
+        self.date_handler = DateHandler()
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Api-Key": FOREUP_API_KEY,
+            "X-Requested-With": "XMLHttpRequest",
+            "Accept": "application/json",
+        })
+
+    def get_tee_time_data(self, dates=None):
+        """
+        Log in, then fetch every date (default: the next 9 days) concurrently on a
+        bounded worker pool. Results are merged in date order.
+        """
+        if not self.booking_class_id:
+            raise ForeUpApiError("FOREUP_BOOKING_CLASS_ID is not configured")
+        if dates is None:
+            today = datetime.now().date()
+            dates = [today + timedelta(days=i) for i in range(DAYS_TO_FETCH)]
+
+        self.login()
+        if not dates:
+            return []
+        dates = sorted(dates)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(dates))) as executor:
+            # map() yields in input order, so the merge stays in date order
+            tee_times_by_day = list(executor.map(self.get_tee_times_for_date_with_retries, dates))
+        tee_times = [t for day_tee_times in tee_times_by_day for t in day_tee_times]
+
+        logger.info("Fetched %d tee times for %d days from foreUP API", len(tee_times), len(dates))
+        return tee_times
+
+    def login(self):
+        response = self.session.post(
+            f"{self.base_url}/api/booking/users/login",
+            data={
+                "username": self.username,
+                "password": self.password,
+                "booking_class_id": self.booking_class_id,
+                "api_key": FOREUP_API_KEY,
+                "course_id": BETHPAGE_COURSE_ID,
+            },
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        )
+        if response.status_code != 200:
+            raise ForeUpApiError(f"Login failed with status {response.status_code}")
+
+        jwt = response.json().get("jwt")
+        if not jwt:
+            raise ForeUpApiError("Login response did not include a session token")
+        self.session.headers["X-Authorization"] = f"Bearer {jwt}"
+        logger.info("Logged in to foreUP API")
+
+    def get_tee_times_for_date_with_retries(self, date_obj):
+        for attempt in range(1, DAY_FETCH_ATTEMPTS + 1):
+            try:
+                return self.get_tee_times_for_date(date_obj)
+            except (ForeUpApiError, requests.RequestException, ValueError) as e:
+                if attempt == DAY_FETCH_ATTEMPTS:
+                    # A missing day would look like freed-up times vanishing; fail the whole fetch
+                    raise ForeUpApiError(
+                        f"Failed to fetch {date_obj.isoformat()} after {attempt} attempts: {e}"
+                    ) from e
+                logger.debug("Retrying %s (attempt %d): %s", date_obj.isoformat(), attempt, str(e))
+                time.sleep(DAY_FETCH_RETRY_SECONDS * attempt)
+
+    def get_tee_times_for_date(self, date_obj):
+        response = self.session.get(
+            f"{self.base_url}/api/booking/times",
+            params={
+                "time": "all",
+                "date": date_obj.strftime("%m-%d-%Y"),
+                "holes": "all",
+                "players": 0,
+                "booking_class": self.booking_class_id,
+                "schedule_id": BETHPAGE_BLACK_SCHEDULE_ID,
+                "schedule_ids[]": BETHPAGE_BLACK_SCHEDULE_ID,
+                "specials_only": 0,
+                "api_key": FOREUP_API_KEY,
+            },
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        )
+        if response.status_code != 200:
+            raise ForeUpApiError(
+                f"Tee time request for {date_obj.isoformat()} failed with status {response.status_code}"
+            )
+
+        slots = response.json()
+        if slots is False or slots == []:
+            # foreUP answers an unbookable day with false rather than []
+            logger.debug("No tee times available on %s", date_obj.isoformat())
+            return []
+        if not isinstance(slots, list):
+            # e.g. {"success": false, "msg": ...} for a bad api_key, expired session or rate limit;
+            # treating it as an empty day would publish the day's times as gone
+            raise ForeUpApiError(
+                f"Unexpected tee time payload for {date_obj.isoformat()}: {str(slots)[:200]}"
+            )
+        return [self.parse_time_slot(slot) for slot in slots]
+
+    def parse_time_slot(self, slot):
+        """Convert one foreUP slot ({"time": "2026-05-30 08:10", "available_spots": 4, "holes": 18}) to a TeeTime."""
+        start = datetime.strptime(slot["time"], "%Y-%m-%d %H:%M")
+        # normalize_count is shared with the Selenium path (TeeTime.from_labels), so
+        # a "9/18" slot gets the same key and filter result in either scrape mode
+        return TeeTime(
+            date=start.date(),
+            time=start.time(),
+            players=normalize_count(slot["available_spots"]),
+            holes=normalize_count(slot.get("holes")),
+            date_label=self.date_handler.format_date_label(start.date()),
+            time_label=self.date_handler.format_time_label(start.time()),
+        )
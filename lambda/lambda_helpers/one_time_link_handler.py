@@ -1,6 +1,9 @@
 import logging
+import time
 import uuid
 import boto3
+from boto3.dynamodb.conditions import Attr
+from lambda_helpers.dynamo_db_batch import retry_unprocessed
 from lambda_helpers.email_sender import EmailSender
 from datetime import datetime, timedelta, timezone
 
@@ -8,6 +11,8 @@ logger = logging.getLogger(__name__)
 
 ONE_TIME_LINKS_TABLE_NAME = "bethpage-black-bot-one-time-links"
 EXPIRE_TIME_KEY = "expire_time"
+EXPIRE_AT_KEY = "expire_at"  # epoch seconds; the table's TTL attribute
+BATCH_WRITE_MAX_ITEMS = 25  # DynamoDB BatchWriteItem limit
 
 class OneTimeLinkHandler:
 
@@ -19,11 +24,14 @@ class OneTimeLinkHandler:
 
     def generate_one_time_link(self, email, is_pause=False):
         guid = str(uuid.uuid4())
-        expire_time = (
-            datetime.now(timezone.utc) + timedelta(minutes=self.expire_minutes)
-        ).isoformat()
-
-        item = {"id": guid, "email": email, EXPIRE_TIME_KEY: expire_time}
+        expire_time = datetime.now(timezone.utc) + timedelta(minutes=self.expire_minutes)
+
+        item = {
+            "id": guid,
+            "email": email,
+            EXPIRE_TIME_KEY: expire_time.isoformat(),
+            EXPIRE_AT_KEY: int(expire_time.timestamp()),
+        }
         if is_pause:
             item["pause"] = True
         return item
@@ -36,6 +44,38 @@ class OneTimeLinkHandler:
         logger.debug("Stored one-time link for %s (expires %s)", email, link_obj[EXPIRE_TIME_KEY])
         return link_obj["id"]
 
+    def generate_and_store_links(self, emails, is_pause=False):
+        """
+        Generate one link per email and write them with BatchWriteItem, 25 items
+        per call, retrying UnprocessedItems with exponential backoff. Returns
+        {email: guid}; like generate_and_store_link, sends no email.
+        """
+        links = [self.generate_one_time_link(email, is_pause=is_pause) for email in dict.fromkeys(emails)]
+        self.batch_write([{"PutRequest": {"Item": link}} for link in links])
+        logger.info("Stored %d one-time links (pause=%s)", len(links), is_pause)
+        return {link["email"]: link["id"] for link in links}
+
+    def batch_write(self, requests):
+        """
+        Run Put/DeleteRequests through BatchWriteItem, 25 per call, retrying
+        UnprocessedItems with exponential backoff and falling back to single
+        put_item/delete_item calls for whatever is still left.
+        """
+        for start in range(0, len(requests), BATCH_WRITE_MAX_ITEMS):
+            request_items = retry_unprocessed(
+                self.dynamodb.batch_write_item,
+                {ONE_TIME_LINKS_TABLE_NAME: requests[start:start + BATCH_WRITE_MAX_ITEMS]},
+                "UnprocessedItems",
+            )
+            if request_items:
+                remaining = request_items[ONE_TIME_LINKS_TABLE_NAME]
+                logger.warning("BatchWriteItem left %d requests unprocessed, writing individually", len(remaining))
+                for request in remaining:
+                    if "PutRequest" in request:
+                        self.one_time_link_table.put_item(Item=request["PutRequest"]["Item"])
+                    else:
+                        self.one_time_link_table.delete_item(Key=request["DeleteRequest"]["Key"])
+
     def handle_one_time_link_creation(self, email, welcome_email=False):
         if not self.email_sender:
             self.email_sender = EmailSender()
@@ -47,14 +87,18 @@ class OneTimeLinkHandler:
         self.email_sender.send_one_time_link_email(email, guid, welcome_email)
 
     def is_one_time_link_valid(self, one_time_link_item):
+        # TTL deletes lag expiry (up to a couple of days), so expiry is still checked here.
+        # expire_at is preferred; items written before it existed only have the ISO expire_time.
+        expire_at = one_time_link_item.get(EXPIRE_AT_KEY)
         expire_time_str = one_time_link_item.get(EXPIRE_TIME_KEY)
-        if not expire_time_str:
+        if expire_at is not None:
+            is_active = int(expire_at) > time.time()
+        elif expire_time_str:
+            is_active = datetime.fromisoformat(expire_time_str) > datetime.now(timezone.utc)
+        else:
             return False, "Expire time doesn't exist"  # Missing expiration time
 
-        expire_time = datetime.fromisoformat(expire_time_str)
-        now = datetime.now(timezone.utc)
-
-        if expire_time > now:
+        if is_active:
             return True, one_time_link_item.get("email")
         else:
             return False, "One time link is expired"  # Expired
@@ -91,18 +135,50 @@ class OneTimeLinkHandler:
 
         return all_items
 
-    def remove_old_one_time_links(self):
-        logger.info("Cleaning up expired one-time links")
+    def get_links_needing_cleanup(self):
+        """Links that are past expire_at or predate it; DynamoDB TTL handles the rest."""
+        now = int(time.time())
+        scan_kwargs = {
+            "FilterExpression": Attr(EXPIRE_AT_KEY).not_exists() | Attr(EXPIRE_AT_KEY).lt(now)
+        }
+        items = []
+        while True:
+            response = self.one_time_link_table.scan(**scan_kwargs)
+            items.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                return items
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
 
-        all_link_items = self.get_all_link_objects()
-        removed_count = 0
-        for item in all_link_items:
+    def remove_old_one_time_links(self):
+        """
+        Migration sweep, no longer run on every scheduled invocation: deletes
+        expired links in batches and adds expire_at to live links that only
+        have the ISO expire_time, so TTL picks them up. Returns (removed, backfilled).
+        """
+        logger.info("Sweeping expired and pre-TTL one-time links")
+
+        delete_requests = []
+        backfilled_count = 0
+        for item in self.get_links_needing_cleanup():
             is_link_active, message = self.is_one_time_link_valid(item)
             if not is_link_active:
-                self.one_time_link_table.delete_item(Key={"id": item["id"]})
-                removed_count += 1
-
-        logger.info("Removed %d expired one-time links", removed_count)
+                delete_requests.append({"DeleteRequest": {"Key": {"id": item["id"]}}})
+            else:
+                expire_at = int(datetime.fromisoformat(item[EXPIRE_TIME_KEY]).timestamp())
+                self.one_time_link_table.update_item(
+                    Key={"id": item["id"]},
+                    UpdateExpression="SET #expire_at = :expire_at",
+                    ExpressionAttributeNames={"#expire_at": EXPIRE_AT_KEY},
+                    ExpressionAttributeValues={":expire_at": expire_at},
+                )
+                backfilled_count += 1
+
+        self.batch_write(delete_requests)
+        logger.info(
+            "Removed %d expired one-time links, backfilled %s on %d",
+            len(delete_requests), EXPIRE_AT_KEY, backfilled_count,
+        )
+        return len(delete_requests), backfilled_count
 
     def one_time_link_to_str(self, one_time_link_item):
         return f"[id={one_time_link_item['id']}, email='{one_time_link_item['email']}',\
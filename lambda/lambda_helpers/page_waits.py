@@ -0,0 +1,155 @@
+import logging
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+TIME_TILE_SELECTOR = "div.time.time-tile"
+ACTIVE_DAY_SELECTOR = "td.active.day"
+TILES_SIGNATURE_SCRIPT = """
+return Array.from(document.querySelectorAll('div.time.time-tile')).map(function (tile) {
+    return (tile.innerText || tile.textContent).trim();
+}).join('\\n');
+"""
+NO_TEE_TIMES_HEADER_XPATH = "//h1[text()='Use Time/Day filters to find desired teetime']"
+POLL_INTERVAL_SECONDS = 0.1
+MIN_TIMEOUT_SECONDS = 1.0
+MAX_TIMEOUT_SECONDS = 10.0
+DAY_CLEAR_TIMEOUT_SECONDS = 2.0  # only hit when two consecutive days show identical (non-empty) tiles
+TIMEOUT_HEADROOM = 3  # allow 3x the slowest recent wait for the same step
+RECENT_WAITS_KEPT = 10
+
+
+class AdaptiveTimeouts:
+    """
+    Per-step wait timeouts sized from how long recent waits for that step took.
+    Kept at class level so warm Lambda invocations reuse the history.
+    """
+
+    _recent_waits = defaultdict(lambda: deque(maxlen=RECENT_WAITS_KEPT))
+
+    @classmethod
+    def get(cls, step, max_timeout=MAX_TIMEOUT_SECONDS):
+        recent = cls._recent_waits.get(step)
+        if not recent:
+            return max_timeout
+        return min(max_timeout, max(MIN_TIMEOUT_SECONDS, TIMEOUT_HEADROOM * max(recent)))
+
+    @classmethod
+    def record(cls, step, seconds):
+        cls._recent_waits[step].append(seconds)
+
+    @classmethod
+    def reset(cls):
+        cls._recent_waits.clear()
+
+
+def wait_for(driver, step, condition, max_timeout=MAX_TIMEOUT_SECONDS):
+    """WebDriverWait.until with an adaptive timeout; logs how long the wait took."""
+    timeout = AdaptiveTimeouts.get(step, max_timeout)
+    start = time.monotonic()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL_SECONDS).until(condition)
+    except TimeoutException:
+        # Record the full timeout so the next wait for this step gets more room
+        AdaptiveTimeouts.record(step, timeout)
+        logger.warning("Timed out after %.2fs waiting for %s", timeout, step)
+        raise
+
+    elapsed = time.monotonic() - start
+    AdaptiveTimeouts.record(step, elapsed)
+    logger.debug("Waited %.2fs for %s", elapsed, step)
+    return result
+
+
+@contextmanager
+def timed_step(step):
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        logger.info("Step '%s' took %.2fs", step, time.monotonic() - start)
+
+
+class TilesSettled:
+    """
+    Wait condition for a day's tee time list to finish rendering: either the
+    tile count is unchanged across two consecutive polls, or the "Use Time/Day
+    filters" header shows the day has no times. The tiles end up in self.tiles.
+    """
+
+    def __init__(self):
+        self.tiles = []
+        self.last_count = None
+
+    def __call__(self, driver):
+        tiles = driver.find_elements(By.CSS_SELECTOR, TIME_TILE_SELECTOR)
+        if not tiles:
+            self.last_count = None
+            self.tiles = []
+            return bool(driver.find_elements(By.XPATH, NO_TEE_TIMES_HEADER_XPATH))
+
+        settled = len(tiles) == self.last_count
+        self.last_count = len(tiles)
+        self.tiles = tiles
+        return settled
+
+
+class SelectHasOptions:
+    """Wait condition for a <select> whose options have been populated. Returns the element."""
+
+    def __init__(self, locator):
+        self.locator = locator
+
+    def __call__(self, driver):
+        element = driver.find_element(*self.locator)
+        options = element.find_elements(By.TAG_NAME, "option")
+        return element if any(o.text.strip() for o in options) else False
+
+
+def find_day_marker(driver):
+    """The first tile or the no-times header; replaced when the next day renders."""
+    markers = driver.find_elements(By.CSS_SELECTOR, TIME_TILE_SELECTOR) or driver.find_elements(
+        By.XPATH, NO_TEE_TIMES_HEADER_XPATH
+    )
+    return markers[0] if markers else None
+
+
+def tiles_signature(driver):
+    """All tile text in one round trip, to tell one day's list from the next."""
+    return driver.execute_script(TILES_SIGNATURE_SCRIPT) or ""
+
+
+class DayIsActive:
+    """Wait condition for the calendar to show day_text as the selected day. Returns the cell."""
+
+    def __init__(self, day_text):
+        self.day_text = day_text.strip()
+
+    def __call__(self, driver):
+        cells = driver.find_elements(By.CSS_SELECTOR, ACTIVE_DAY_SELECTOR)
+        return cells[0] if cells and cells[0].text.strip() == self.day_text else False
+
+
+class DayReplaced:
+    """
+    Wait condition for the previous day's list to be gone: its first tile (or
+    no-times header) was re-rendered, or the tiles now read differently. The
+    content check covers foreUP updating the list in place, where nothing goes stale.
+    """
+
+    def __init__(self, previous_marker, previous_signature):
+        self.previous_marker = previous_marker
+        self.previous_signature = previous_signature
+
+    def __call__(self, driver):
+        if self.previous_marker is not None:
+            try:
+                self.previous_marker.is_enabled()
+            except StaleElementReferenceException:
+                return True
+        return tiles_signature(driver) != self.previous_signature
@@ -0,0 +1,67 @@
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from astral import LocationInfo
+from astral.sun import sun
+
+logger = logging.getLogger(__name__)
+
+BETHPAGE_LOCATION = LocationInfo(
+    "Farmingdale", "USA", "America/New_York", 40.7326, -73.4457
+)
+# Precomputed {YYYY-MM-DD: sunset ISO datetime}, generated by generate_sunset_table.py
+SUNSET_TABLE_PATH = os.path.join(os.path.dirname(__file__), "sunset_table.json")
+
+
+class SunsetTable:
+    """
+    Date-keyed sunset lookup shared by every user in the container.
+    A scrape window only spans ~9 dates, so astral runs at most once per date
+    (and not at all for dates covered by the shipped season table).
+    """
+
+    _sunset_cache = {}
+    _precomputed = None
+
+    @classmethod
+    def get_sunset(cls, date_obj):
+        sunset = cls._sunset_cache.get(date_obj)
+        if sunset is None:
+            precomputed = cls._get_precomputed().get(date_obj.isoformat())
+            sunset = (
+                datetime.fromisoformat(precomputed)
+                if precomputed
+                else cls.compute_sunset(date_obj)
+            )
+            cls._sunset_cache[date_obj] = sunset
+        return sunset
+
+    @classmethod
+    def _get_precomputed(cls):
+        """Load the shipped season table once; a missing or bad file just means astral is used."""
+        if cls._precomputed is None:
+            try:
+                with open(SUNSET_TABLE_PATH) as f:
+                    cls._precomputed = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("Sunset table unavailable, computing sunsets on demand: %s", str(e))
+                cls._precomputed = {}
+        return cls._precomputed
+
+    @staticmethod
+    def compute_sunset(date_obj):
+        return sun(
+            BETHPAGE_LOCATION.observer,
+            date=date_obj,
+            tzinfo=BETHPAGE_LOCATION.timezone,
+        )["sunset"]
+
+    @classmethod
+    def build_table(cls, start_date, end_date):
+        table = {}
+        current = start_date
+        while current <= end_date:
+            table[current.isoformat()] = cls.compute_sunset(current).isoformat()
+            current += timedelta(days=1)
+        return table
@@ -0,0 +1,138 @@
+import hashlib
+from datetime import date, time
+from typing import NamedTuple
+from lambda_helpers.date_handler import DateHandler
+
+COMPACT_KEY_SEPARATOR = "|"
+DATE_HANDLER = DateHandler()
+
+
+def normalize_count(value):
+    """
+    Players/Holes arrive as "4" or 4 (or Decimal from DynamoDB); compare them as ints.
+    A "9/18" slot can be booked for either, so it counts as 18 holes. Anything
+    else unparseable is kept as its string label.
+    """
+    if isinstance(value, str) and "/" in value:
+        options = [normalize_count(part) for part in value.split("/")]
+        if all(isinstance(option, int) for option in options):
+            return max(options)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def tee_time_key(tee_time):
+    """Canonical hashable identity of a tee time: (Date, Time, Players, Holes)."""
+    if isinstance(tee_time, TeeTime):
+        return tee_time.key
+    return (
+        tee_time["Date"],
+        tee_time["Time"],
+        normalize_count(tee_time["Players"]),
+        normalize_count(tee_time["Holes"]),
+    )
+
+
+def build_seen_set(tee_times):
+    return {tee_time_key(t) for t in tee_times}
+
+
+def diff_tee_times(previous, current):
+    """(added, removed) between two scrapes, matched by tee_time_key. Both keep scrape order."""
+    previous_keys = build_seen_set(previous)
+    current_keys = build_seen_set(current)
+    added = [t for t in current if tee_time_key(t) not in previous_keys]
+    removed = [t for t in previous if tee_time_key(t) not in current_keys]
+    return added, removed
+
+
+def fingerprint_tee_times(tee_times, *context):
+    """
+    Stable sha256 of a scrape: independent of scrape order and of str/int
+    Players/Holes. context (e.g. today's date, config version) is mixed in so
+    a reset of the seen set or a config change counts as a change too.
+    """
+    digest = hashlib.sha256()
+    for part in context:
+        digest.update(f"{part}\n".encode())
+    for key in sorted(build_seen_set(tee_times), key=str):
+        digest.update(f"{key}\n".encode())
+    return digest.hexdigest()
+
+
+def encode_compact(key):
+    """Encode a key minus its date as "Time|Players|Holes" for the per-date seen lists."""
+    _, time_str, players, holes = key
+    return COMPACT_KEY_SEPARATOR.join((time_str, str(players), str(holes)))
+
+
+def decode_compact(date_str, value):
+    """Inverse of encode_compact. Also accepts legacy full tee time dicts."""
+    if isinstance(value, dict):
+        return tee_time_key(value)
+    time_str, players, holes = value.split(COMPACT_KEY_SEPARATOR)
+    return date_str, time_str, normalize_count(players), normalize_count(holes)
+
+
+class TeeTime(NamedTuple):
+    """
+    One bookable slot, parsed once at scrape time. The original site labels are
+    kept so the dict/DynamoDB shapes (and tee_time_key) round-trip exactly.
+    """
+
+    date: date
+    time: time
+    players: int
+    holes: int
+    date_label: str  # e.g. "Saturday May 30th"
+    time_label: str  # e.g. "8:00am"
+
+    @classmethod
+    def from_labels(cls, date_label, time_label, players, holes, year=None):
+        _, date_obj = DATE_HANDLER.parse_date_label(date_label, year)
+        return cls(
+            date=date_obj,
+            time=DATE_HANDLER.parse_time_label(time_label),
+            players=normalize_count(players),
+            holes=normalize_count(holes),
+            date_label=date_label,
+            time_label=time_label,
+        )
+
+    @classmethod
+    def from_dict(cls, tee_time, year=None):
+        """Accepts the {"Date", "Time", "Players", "Holes"} dict shape, including DynamoDB items."""
+        return cls.from_labels(
+            tee_time["Date"], tee_time["Time"], tee_time["Players"], tee_time["Holes"], year
+        )
+
+    @classmethod
+    def coerce(cls, tee_time):
+        return tee_time if isinstance(tee_time, cls) else cls.from_dict(tee_time)
+
+    @property
+    def day_of_week(self):
+        return self.date_label.split()[0]
+
+    @property
+    def key(self):
+        return self.date_label, self.time_label, self.players, self.holes
+
+    def to_dict(self):
+        return {
+            "Date": self.date_label,
+            "Time": self.time_label,
+            "Players": self.players,
+            "Holes": self.holes,
+        }
+
+    def to_dynamodb_item(self):
+        # Players/Holes are ints (or an unparseable label string), both of which boto3 serializes
+        return self.to_dict()
+
+
+def tee_time_to_dict(tee_time):
+    """Adapter for code that still expects the dict shape (email, API, DynamoDB)."""
+    return tee_time.to_dict() if isinstance(tee_time, TeeTime) else tee_time
@@ -1,14 +1,30 @@
 import logging
-from astral.sun import sun
-from astral import LocationInfo
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from lambda_helpers.date_handler import DateHandler
 import holidays
 from lambda_helpers.dynamo_db_connection import DynamoDBConnection
 from lambda_helpers.bethpage_black_config import BethpageBlackBotConfig
+from lambda_helpers.compiled_user_filter import CompiledUserFilter
+from lambda_helpers.sunset_table import SunsetTable
+from lambda_helpers.tee_time_matcher import TeeTimeMatcher
+from lambda_helpers.tee_time import TeeTime, build_seen_set, tee_time_key
+from typing import NamedTuple
 
 logger = logging.getLogger(__name__)
 
+OUT_OF_STATE_BOOKING_WINDOW_DAYS = 5
+
+
+class ParsedTeeTime(NamedTuple):
+    day_of_week: str
+    date_obj: date
+    time_of_day: time
+    players: int
+    has_18_holes: bool
+    month_day_year: str  # M/D/YYYY, matches extra_playable_days and holiday_dates
+    iso_date: str  # YYYY-MM-DD, matches blackout_dates
+    sunset: datetime
+
 
 class TeeTimeFilterer:
 
@@ -16,165 +32,153 @@ class TeeTimeFilterer:
         try:
             self.db_table = db_connection if db_connection else DynamoDBConnection()
 
-            self.bethpage_info = LocationInfo(
-                "Farmingdale", "USA", "America/New_York", 40.7326, -73.4457
-            )
             us_holidays = holidays.UnitedStates(years=datetime.now().year)
             self.holiday_dates = {
-                f"{date.month}/{date.day}/{date.year}"
-                for date, name in us_holidays.items()
+                f"{holiday.month}/{holiday.day}/{holiday.year}"
+                for holiday, name in us_holidays.items()
                 if "Veterans Day" not in name
             }
             self.date_handler = DateHandler()
+            self.user_filters = {}  # {email: CompiledUserFilter}, built once per run
+            self.user_configs = None  # {email: config item or None} once load_user_configs runs
+            self.parsed_tee_times = {}
         except Exception as e:
             logger.error("Error initializing TeeTimeFilterer: %s", str(e), exc_info=True)
             raise e
 
     def filter_tee_times_for_user(self, tee_times_to_consider, user_email):
         logger.debug("Filtering %d tee times for user: %s", len(tee_times_to_consider), user_email)
-        user_config = self.get_user_config_as_object(user_email)
+        user_filter = self.get_user_filter(user_email)
 
-        if not user_config.notifications_enabled:
+        if not user_filter.notifications_enabled:
             logger.debug("User %s has notifications disabled", user_email)
             return []
 
-        filtered_tee_times = []
-
-        for tee_time in tee_times_to_consider:
-            day_of_week, date_obj = self.parse_date_string(tee_time["Date"])
-
-            # is within user's configured date range (e.g., March 1 - November 30)
-            is_in_date_range = self.is_within_date_range(user_config, date_obj)
-
-            # is ok day (weekend, holiday, etc.)
-            is_playable_day = self.is_playable_day(user_config, day_of_week, date_obj)
-
-            tee_time_of_day = datetime.strptime(tee_time["Time"], "%I:%M%p").time()
-            is_acceptable_time = self.is_far_enough_before_sunset(
-                user_config, date_obj, tee_time_of_day
-            ) and self.is_after_earliest_acceptable_time(user_config, tee_time_of_day)
-
-            hits_min_players = int(tee_time["Players"]) >= user_config.min_players
-
-            has_18_holes = tee_time["Holes"] == 18 or tee_time["Holes"] == "18"
-
-            is_within_in_state_booking_window = self.is_within_in_state_booking_window(user_config, date_obj)
-
-            is_not_blacked_out = self.is_not_blacked_out(user_config, date_obj)
-
-            if (
-                is_in_date_range
-                and is_playable_day
-                and is_acceptable_time
-                and hits_min_players
-                and has_18_holes
-                and is_within_in_state_booking_window
-                and is_not_blacked_out
-            ):
-                filtered_tee_times.append(tee_time)
+        last_out_of_state_date = self.get_last_out_of_state_booking_date()
+        filtered_tee_times = [
+            tee_time
+            for tee_time in tee_times_to_consider
+            if self.tee_time_matches_filter(
+                user_filter, self.parse_tee_time(tee_time), last_out_of_state_date
+            )
+        ]
 
         logger.debug("Filtered to %d tee times for user %s", len(filtered_tee_times), user_email)
         return filtered_tee_times
 
-    def is_after_earliest_acceptable_time(self, user_config, time_of_day):
-        earliest_playable_time_as_dt = datetime.strptime(
-            user_config.earliest_playable_time, "%I:%M%p"
-        ).time()
-        return time_of_day > earliest_playable_time_as_dt
-
-    def is_far_enough_before_sunset(self, user_config, date_obj, time_of_day):
-        sunset_time = sun(
-            self.bethpage_info.observer,
-            date=date_obj,
-            tzinfo=self.bethpage_info.timezone,
-        )["sunset"]
-        before_sunset_dt = sunset_time - timedelta(
-            minutes=user_config.minimum_minutes_before_sunset
+    def filter_tee_times_for_users(self, tee_times_to_consider, user_emails, use_index=True):
+        """
+        Return {email: [tee_times]} for every user with at least one match.
+        use_index=True goes through the TeeTimeMatcher inverted index; False
+        falls back to filter_tee_times_for_user per user. Both give the same result.
+        """
+        if not use_index:
+            matches = {}
+            for user_email in user_emails:
+                filtered_tee_times = self.filter_tee_times_for_user(tee_times_to_consider, user_email)
+                if filtered_tee_times:
+                    matches[user_email] = filtered_tee_times
+            return matches
+
+        user_filters = {email: self.get_user_filter(email) for email in user_emails}
+        return TeeTimeMatcher(self, user_filters).match(tee_times_to_consider)
+
+    def tee_time_matches_filter(self, user_filter, slot, last_out_of_state_date):
+        """Apply every user criterion to a pre-parsed slot, cheapest checks first."""
+        return (
+            slot.has_18_holes
+            and slot.players >= user_filter.min_players
+            and slot.time_of_day > user_filter.earliest_playable_time
+            # is ok day (weekend, holiday, etc.)
+            and (
+                slot.day_of_week in user_filter.playable_days_of_week
+                or slot.month_day_year in user_filter.extra_playable_days
+                or (user_filter.include_holidays and slot.month_day_year in self.holiday_dates)
+            )
+            and (user_filter.in_state_golfer or slot.date_obj <= last_out_of_state_date)
+            and self.tee_time_matches_unindexed_criteria(user_filter, slot)
         )
 
-        return time_of_day < before_sunset_dt.time()
+    def tee_time_matches_unindexed_criteria(self, user_filter, slot):
+        """The criteria TeeTimeMatcher does not index: date range, blackout dates and sunset."""
+        return (
+            # is within user's configured date range (e.g., March 1 - November 30)
+            user_filter.is_in_date_range(slot.date_obj)
+            and slot.iso_date not in user_filter.blackout_dates
+            and slot.time_of_day < (slot.sunset - user_filter.minimum_time_before_sunset).time()
+        )
 
-    def parse_date_string(self, date_str):
-        parts = date_str.split()
-        day_of_week = parts[0]
-        month = parts[1]
-        day = self.date_handler.strip_ordinal_suffix(parts[2])
+    def parse_tee_time(self, tee_time):
+        """
+        Derive the per-slot values the filters compare against. TeeTime records
+        from the scraper are already parsed; legacy dicts are parsed here once per run.
+        """
+        cache_key = (
+            tee_time
+            if isinstance(tee_time, TeeTime)
+            else (tee_time["Date"], tee_time["Time"], tee_time["Players"], tee_time["Holes"])
+        )
+        slot = self.parsed_tee_times.get(cache_key)
+        if slot is None:
+            record = TeeTime.coerce(tee_time)
+            date_obj = record.date
+            slot = ParsedTeeTime(
+                day_of_week=record.day_of_week,
+                date_obj=date_obj,
+                time_of_day=record.time,
+                players=record.players,
+                has_18_holes=record.holes == 18,
+                month_day_year=f"{date_obj.month}/{date_obj.day}/{date_obj.year}",
+                iso_date=date_obj.strftime("%Y-%m-%d"),
+                sunset=SunsetTable.get_sunset(date_obj),
+            )
+            self.parsed_tee_times[cache_key] = slot
+        return slot
 
-        year = datetime.now().year
+    def get_user_filter(self, user_email):
+        """Compile each user's config once and reuse it for every tee time this run."""
+        user_filter = self.user_filters.get(user_email)
+        if user_filter is None:
+            user_filter = CompiledUserFilter.from_config(self.get_user_config_as_object(user_email))
+            self.user_filters[user_email] = user_filter
+        return user_filter
 
-        # Parse to datetime object
-        date_obj = datetime.strptime(f"{month} {day} {year}", "%B %d %Y").date()
-        return day_of_week, date_obj
+    def parse_date_string(self, date_str):
+        return self.date_handler.parse_date_label(date_str)
 
     def get_day_of_week_from_str(self, date_str):
         return date_str.split()[0]
 
-    def is_playable_day(self, user_config, day_of_week, date_obj):
-        is_playable_day_of_week = day_of_week in user_config.playable_days_of_week
-
-        formatted = f"{date_obj.month}/{date_obj.day}/{date_obj.year}"
-        is_extra_day_to_notify = formatted in user_config.extra_playable_days
-
-        is_us_holiday = (
-            formatted in self.holiday_dates if user_config.include_holidays else False
-        )
-
-        return is_playable_day_of_week or is_extra_day_to_notify or is_us_holiday
+    def get_last_out_of_state_booking_date(self):
+        return datetime.now().date() + timedelta(days=OUT_OF_STATE_BOOKING_WINDOW_DAYS)
 
-    def is_within_date_range(self, user_config, date_obj):
-        """Check if date is within user's configured start_date and end_date (annual range)."""
-        try:
-            # Parse start and end dates (format: M/D or MM/DD)
-            start_parts = user_config.start_date.split('/')
-            end_parts = user_config.end_date.split('/')
-            start_month, start_day = int(start_parts[0]), int(start_parts[1])
-            end_month, end_day = int(end_parts[0]), int(end_parts[1])
-
-            # Create comparable tuples (month, day)
-            current_md = (date_obj.month, date_obj.day)
-            start_md = (start_month, start_day)
-            end_md = (end_month, end_day)
-
-            # Handle ranges that don't cross year boundary (e.g., March to November)
-            if start_md <= end_md:
-                return start_md <= current_md <= end_md
-            # Handle ranges that cross year boundary (e.g., November to March)
-            else:
-                return current_md >= start_md or current_md <= end_md
-        except (ValueError, AttributeError, IndexError):
-            # If parsing fails, default to allowing the date
-            return True
-
-    def is_not_blacked_out(self, user_config, date_obj):
-        """Return False if date_obj falls on a user-configured blackout date (YYYY-MM-DD)."""
-        formatted = date_obj.strftime("%Y-%m-%d")
-        return formatted not in user_config.blackout_dates
-
-    def is_within_in_state_booking_window(self, user_config, date_obj):
+    def load_user_configs(self, user_emails, configs=None):
         """
-        Out-of-state golfers may only book tee times up to 5 days in advance.
-        In-state (NY resident) golfers have no such restriction.
-        e.g. today=4/18 → out-of-state can book through 4/23, not 4/24+.
+        Bulk-load every user's config up front instead of one get_item per user.
+        Pass configs to reuse ones already read (e.g. from the warm-container cache).
         """
-        if user_config.in_state_golfer:
-            return True
-        today = datetime.now().date()
-        return date_obj <= today + timedelta(days=5)
+        if configs is None:
+            configs = self.db_table.get_user_configs(user_emails)
+        # Users without a stored config get None, i.e. the defaults, like get_user_config
+        self.user_configs = {email: configs.get(email) for email in user_emails}
 
     def get_user_config_as_object(self, user_email):
-        config_data = self.db_table.get_user_config(user_email)
+        if self.user_configs is not None and user_email in self.user_configs:
+            config_data = self.user_configs[user_email]
+        else:
+            config_data = self.db_table.get_user_config(user_email)
         return BethpageBlackBotConfig(config_data)
 
     def remove_existing_tee_times(self, times_from_site, existing_times):
+        """existing_times may be tee time dicts or a set of tee_time_keys built once per run."""
         if existing_times:
-            existing_times_set = set(
-                tuple(sorted(item.items())) for item in existing_times
+            existing_keys = (
+                existing_times
+                if isinstance(existing_times, (set, frozenset))
+                else build_seen_set(existing_times)
             )
-
             new_times = [
-                item
-                for item in times_from_site
-                if tuple(sorted(item.items())) not in existing_times_set
+                item for item in times_from_site if tee_time_key(item) not in existing_keys
             ]
         else:
             logger.debug("No existing times in database, all times are new")
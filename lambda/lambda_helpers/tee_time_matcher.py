@@ -0,0 +1,120 @@
+import logging
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import islice
+
+logger = logging.getLogger(__name__)
+
+
+class ThresholdIndex:
+    """
+    The users of one day bucket, grouped by every criterion other than the day
+    and earliest time (min players, in-state flag, date range, sunset margin,
+    blackout dates), with each group's users sorted by earliest playable time.
+    A slot is checked once per group and then only walks the sorted prefix of
+    times before it, so a lookup costs the number of groups plus the users it
+    returns, not the number of subscribers.
+    """
+
+    def __init__(self, user_filters):
+        by_group = {}
+        for email, user_filter in user_filters:
+            key = (
+                user_filter.min_players,
+                user_filter.in_state_golfer,
+                user_filter.date_range,
+                user_filter.minimum_time_before_sunset,
+                user_filter.blackout_dates,
+            )
+            # Any member's filter stands in for the group: they only differ in day and earliest time
+            _, by_time = by_group.setdefault(key, (user_filter, defaultdict(list)))
+            by_time[user_filter.earliest_playable_time].append(email)
+
+        self.groups = []  # (representative filter, sorted earliest times, emails per time)
+        for user_filter, by_time in by_group.values():
+            times = sorted(by_time)
+            self.groups.append((user_filter, times, [by_time[t] for t in times]))
+
+    def users_matching(self, slot, within_out_of_state_window, matches_unindexed_criteria):
+        for user_filter, times, emails_by_time in self.groups:
+            if (
+                user_filter.min_players > slot.players
+                or not (user_filter.in_state_golfer or within_out_of_state_window)
+                or not matches_unindexed_criteria(user_filter, slot)
+            ):
+                continue
+            # Earliest time is exclusive (the slot must be strictly later)
+            for emails in islice(emails_by_time, bisect_left(times, slot.time_of_day)):
+                yield from emails
+
+
+class TeeTimeMatcher:
+    """
+    Inverted index from tee time attributes to subscribers.
+
+    Users are bucketed by playable weekday, extra day and holiday opt-in, and
+    each bucket is a ThresholdIndex over the remaining criteria, so each
+    scraped slot only visits the users that want it. The per-group check uses
+    TeeTimeFilterer.tee_time_matches_unindexed_criteria, which keeps the
+    output identical to calling filter_tee_times_for_user for every user.
+    """
+
+    def __init__(self, tee_time_filterer, user_filters):
+        self.tee_time_filterer = tee_time_filterer
+        self.user_filters = {
+            email: user_filter
+            for email, user_filter in user_filters.items()
+            if user_filter.notifications_enabled
+        }
+
+        users_by_day_of_week = defaultdict(list)
+        users_by_extra_day = defaultdict(list)
+        holiday_users = []
+        for email, user_filter in self.user_filters.items():
+            for day_of_week in user_filter.playable_days_of_week:
+                users_by_day_of_week[day_of_week].append((email, user_filter))
+            for extra_day in user_filter.extra_playable_days:
+                users_by_extra_day[extra_day].append((email, user_filter))
+            if user_filter.include_holidays:
+                holiday_users.append((email, user_filter))
+
+        self.index_by_day_of_week = {day: ThresholdIndex(users) for day, users in users_by_day_of_week.items()}
+        self.index_by_extra_day = {day: ThresholdIndex(users) for day, users in users_by_extra_day.items()}
+        self.holiday_index = ThresholdIndex(holiday_users)
+
+    def match(self, tee_times):
+        """Return {email: [tee_times]} in scrape order, omitting users with no matches."""
+        matches = defaultdict(list)
+        last_out_of_state_date = self.tee_time_filterer.get_last_out_of_state_booking_date()
+
+        for tee_time in tee_times:
+            slot = self.tee_time_filterer.parse_tee_time(tee_time)
+            for email in self.get_matching_users(slot, last_out_of_state_date):
+                matches[email].append(tee_time)
+
+        logger.debug("Matched tee times for %d of %d users", len(matches), len(self.user_filters))
+        return dict(matches)
+
+    def get_matching_users(self, slot, last_out_of_state_date):
+        if not slot.has_18_holes:
+            return []
+
+        indexes = [
+            index
+            for index in (
+                self.index_by_day_of_week.get(slot.day_of_week),
+                self.index_by_extra_day.get(slot.month_day_year),
+                self.holiday_index if slot.month_day_year in self.tee_time_filterer.holiday_dates else None,
+            )
+            if index is not None
+        ]
+        within_window = slot.date_obj <= last_out_of_state_date
+        matches_unindexed_criteria = self.tee_time_filterer.tee_time_matches_unindexed_criteria
+        if len(indexes) == 1:
+            # Each user appears once per index, so a single bucket needs no de-duplication
+            return list(indexes[0].users_matching(slot, within_window, matches_unindexed_criteria))
+
+        users = set()
+        for index in indexes:
+            users.update(index.users_matching(slot, within_window, matches_unindexed_criteria))
+        return users
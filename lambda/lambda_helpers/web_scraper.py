@@ -1,5 +1,7 @@
+import json
 import logging
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -7,17 +9,51 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 from lambda_helpers.date_handler import DateHandler
-import time
+from lambda_helpers.foreup_api_client import ForeUpApiClient
+from lambda_helpers.page_waits import (
+    DAY_CLEAR_TIMEOUT_SECONDS,
+    DayIsActive,
+    DayReplaced,
+    SelectHasOptions,
+    TilesSettled,
+    find_day_marker,
+    tiles_signature,
+    timed_step,
+    wait_for,
+)
+from lambda_helpers.tee_time import TeeTime
 import os
 
 logger = logging.getLogger(__name__)
 
 BETHPAGE_TEE_TIMES_WEBSITE_URL = 'https://foreupsoftware.com/index.php/booking/19765/2431#/teetimes'
+# Reads every tile's fields in one WebDriver round trip; add_time_to_dict is the per-element fallback
+EXTRACT_TIME_TILES_SCRIPT = """
+function text(tile, selector) {
+    var el = tile.querySelector(selector);
+    return el ? (el.innerText || el.textContent).trim() : null;
+}
+return JSON.stringify(Array.from(document.querySelectorAll('div.time.time-tile')).map(function (tile) {
+    return {
+        time: text(tile, 'div.booking-start-time-label'),
+        holes: text(tile, 'span.booking-slot-holes.js-booking-slot-holes span'),
+        players: text(tile, 'span.booking-slot-players.js-booking-slot-players span')
+    };
+}));
+"""
+RESIDENT_BUTTON_XPATH = "//button[normalize-space(text())='Verified NYS Resident - Bethpage/Sunken Meadow']"
+# "http" tries the foreUP JSON API first and falls back to Selenium; "selenium" always drives Chrome
+SCRAPE_MODE = os.environ.get("BETHPAGE_SCRAPE_MODE", "selenium")
+# Keep Chrome (and its login session) alive across warm invocations instead of quitting after each scrape
+REUSE_BROWSER = os.environ.get("BETHPAGE_REUSE_BROWSER", "false").lower() == "true"
+COOKIES_PATH = "/tmp/bethpage_cookies.json"
 
 
 class WebScraper:
+    # Driver left running by the previous warm invocation (only used when reuse_browser is on)
+    _shared_driver = None
 
-    def __init__(self, username, password):
+    def __init__(self, username, password, scrape_mode=SCRAPE_MODE, reuse_browser=REUSE_BROWSER):
         # Ensure Selenium cache directory is writable in AWS Lambda
         os.environ['SELENIUM_CACHE_DIR'] = '/tmp/selenium'
         os.environ["HOME"] = "/tmp"
@@ -26,6 +62,14 @@ class WebScraper:
         os.environ["TMPDIR"] = "/tmp"
         self.username = username
         self.password = password
+        self.scrape_mode = scrape_mode
+        self.reuse_browser = reuse_browser
+        self.driver = None
+
+    def start_driver(self):
+        """Launch headless Chrome and open the booking page. Only the Selenium path needs this."""
+        if self.reuse_browser and self.attach_shared_driver():
+            return
 
         chrome_options = Options()
         chrome_options.add_argument("--headless=new")
@@ -73,76 +117,228 @@ class WebScraper:
             )
 
         self.driver.maximize_window()
+        self.open_booking_page()
+        if self.reuse_browser:
+            self.load_cookies()
+
+    def open_booking_page(self, reload=False):
+        if reload:
+            # A parked browser is still on the booking URL (showing last run's calendar); getting the
+            # same URL again is only a fragment navigation, so leave the page first to force a real load
+            self.driver.get("about:blank")
         self.driver.get(BETHPAGE_TEE_TIMES_WEBSITE_URL)
         self.wait = WebDriverWait(self.driver, 10)
         self.wait_short = WebDriverWait(self.driver, 0.5)
 
-    def get_tee_time_data(self):
+    def attach_shared_driver(self):
+        driver = WebScraper._shared_driver
+        if driver is None:
+            return False
+
+        self.driver = driver
+        try:
+            self.open_booking_page(reload=True)
+        except WebDriverException as e:
+            logger.info("Browser from previous invocation is gone, starting a new one: %s", str(e))
+            self.discard_driver()
+            return False
+        logger.info("Reusing browser from previous invocation")
+        return True
+
+    def close_driver(self):
+        """Quit Chrome, or park it for the next warm invocation when reuse_browser is on."""
+        if self.driver is None:
+            return
+        if self.reuse_browser:
+            self.save_cookies()
+            WebScraper._shared_driver = self.driver
+            return
+        self.driver.quit()
+
+    def discard_driver(self):
+        """Quit Chrome and forget the shared driver, e.g. after an error left the page in an unknown state."""
+        if WebScraper._shared_driver is self.driver:
+            WebScraper._shared_driver = None
+        if self.driver is None:
+            return
+        try:
+            self.driver.quit()
+        except WebDriverException:
+            pass
+        self.driver = None
+
+    def load_cookies(self):
+        """Restore the login cookies saved by an earlier invocation, if any survived in /tmp."""
+        try:
+            with open(COOKIES_PATH) as f:
+                cookies = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+            except WebDriverException:
+                # Expired or cross-domain cookies are rejected; the session probe decides what to do
+                continue
+        self.driver.refresh()
+        logger.debug("Restored %d cookies from %s", len(cookies), COOKIES_PATH)
+
+    def save_cookies(self):
+        try:
+            cookies = self.driver.get_cookies()
+            with open(COOKIES_PATH, "w") as f:
+                json.dump(cookies, f)
+        except (OSError, WebDriverException) as e:
+            logger.warning("Could not save browser cookies: %s", str(e))
+
+    def is_logged_in(self):
+        """Cheap session probe: once the booking page renders, the login link only shows when signed out."""
+        wait_for(self.driver, "booking page", EC.presence_of_element_located((By.XPATH, RESIDENT_BUTTON_XPATH)))
+        login_links = self.driver.find_elements(By.CSS_SELECTOR, "a.login")
+        return not any(link.is_displayed() for link in login_links)
+
+    def ensure_logged_in(self):
+        if self.reuse_browser:
+            try:
+                if self.is_logged_in():
+                    logger.info("Existing Bethpage session is still valid, skipping login")
+                    return True
+            except (TimeoutException, WebDriverException) as e:
+                logger.debug("Session probe failed, logging in again: %s", str(e))
+
         if not self.login():
+            return False
+        if self.reuse_browser:
+            self.save_cookies()
+        return True
+
+    def get_tee_time_data(self):
+        if self.scrape_mode == "http":
+            try:
+                return ForeUpApiClient(self.username, self.password).get_tee_time_data()
+            except Exception as e:
+                logger.warning("foreUP API scrape failed, falling back to Selenium: %s", str(e))
+        return self.get_tee_time_data_with_selenium()
+
+    def get_tee_time_data_with_selenium(self):
+        with timed_step("start driver"):
+            self.start_driver()
+        try:
+            return self.scrape_calendar()
+        except Exception:
+            self.discard_driver()
+            raise
+
+    def scrape_calendar(self):
+        with timed_step("login"):
+            logged_in = self.ensure_logged_in()
+        if not logged_in:
             logger.error("Login failed, aborting scrape")
+            self.discard_driver()
             return []
 
-        nav_result = self.move_to_calendar_page()
+        with timed_step("navigate to calendar"):
+            nav_result = self.move_to_calendar_page()
         if nav_result is None:
             return []
         if not nav_result:
             logger.error("Failed to navigate to calendar page, aborting scrape")
+            self.discard_driver()
             return []
 
         tee_times = []
         days_checked = []
         next_day_to_check = self.get_available_day(days_checked, True)
         while next_day_to_check:
-            next_day_formatted = DateHandler().get_date_from_day_number(next_day_to_check.text)
-            days_checked.append(next_day_to_check.text)
-
-            self.driver.execute_script("arguments[0].click();", next_day_to_check)
-            self.wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "td.active.day"))
-            )
-
-            self.add_available_times_from_day(next_day_formatted, tee_times)
+            day_text = next_day_to_check.text
+            next_day_formatted = DateHandler().get_date_from_day_number(day_text)
+            is_first_day = not days_checked
+            days_checked.append(day_text)
+
+            with timed_step(f"read {next_day_formatted}"):
+                if not is_first_day:
+                    previous_day_marker = find_day_marker(self.driver)
+                    previous_signature = tiles_signature(self.driver)
+                self.driver.execute_script("arguments[0].click();", next_day_to_check)
+                self.wait_for_day_to_activate(day_text)
+                # The first day is the one already showing, so there is nothing to replace. After an
+                # empty day there is nothing to compare either: an in-place update of the no-times
+                # header never reads differently, so DayIsActive plus TilesSettled have to do
+                if not is_first_day and previous_signature:
+                    self.wait_for_day_to_replace(previous_day_marker, previous_signature)
+
+                self.add_available_times_from_day(next_day_formatted, tee_times)
             next_day_to_check = self.get_available_day(days_checked)
 
         logger.info("Scraped %d tee times from %d days", len(tee_times), len(days_checked))
-        self.driver.quit()
+        self.close_driver()
         return tee_times
 
+    def wait_for_day_to_activate(self, day_text):
+        """Block until the calendar shows the clicked day as selected."""
+        try:
+            wait_for(self.driver, "day to activate", DayIsActive(day_text))
+        except TimeoutException:
+            logger.warning("Calendar never showed day %s as selected, reading the list anyway", day_text)
+
+    def wait_for_day_to_replace(self, previous_day_marker, previous_signature):
+        """Block until the previously shown day's tiles (or no-times header) are gone or changed."""
+        try:
+            wait_for(
+                self.driver,
+                "previous day to clear",
+                DayReplaced(previous_day_marker, previous_signature),
+                max_timeout=DAY_CLEAR_TIMEOUT_SECONDS,
+            )
+        except TimeoutException:
+            # Two days with identical tiles: the list reads the same either way
+            pass
+
     def add_available_times_from_day(self, day_formatted, tee_times):
-        time.sleep(0.5)
         for i in range(5):
             try:
-                time_tiles = self.driver.find_elements(
-                    By.CSS_SELECTOR, "div.time.time-tile"
-                )
-                if not len(time_tiles):
-                    if self.driver.find_elements(
-                        By.XPATH,
-                        "//h1[text()='Use Time/Day filters to find desired teetime']",
-                    ):
-                        logger.debug("No tee times available on %s", day_formatted)
-                        return
-                    time.sleep(0.25)
-                    continue
+                tiles_settled = TilesSettled()
+                wait_for(self.driver, "time tiles", tiles_settled)
+                time_tiles = tiles_settled.tiles
+                if not time_tiles:
+                    logger.debug("No tee times available on %s", day_formatted)
+                    return
 
                 logger.debug("Found %d tee times on %s", len(time_tiles), day_formatted)
+                day_tee_times = self.extract_time_tiles(day_formatted)
+                if day_tee_times is not None:
+                    tee_times.extend(day_tee_times)
+                    return
+
                 for tile in time_tiles:
                     self.add_time_to_dict(tile, tee_times, day_formatted)
                 return
 
             except Exception as e:
-                if self.driver.find_elements(
-                    By.XPATH,
-                    "//h1[text()='Use Time/Day filters to find desired teetime']",
-                ):
-                    logger.debug("No tee times available on %s", day_formatted)
-                    return
                 if i < 4:
-                    time.sleep(0.25)
                     logger.debug("Retrying tee time retrieval for %s (attempt %d)", day_formatted, i + 1)
                     continue
                 logger.error("Failed to retrieve tee times for %s after %d attempts: %s", day_formatted, i + 1, str(e))
 
+    def extract_time_tiles(self, day):
+        """Read all tiles with one execute_script call. Returns None if the result is malformed."""
+        try:
+            tiles = json.loads(self.driver.execute_script(EXTRACT_TIME_TILES_SCRIPT))
+            if not isinstance(tiles, list) or not tiles:
+                raise ValueError(f"expected a non-empty list, got {tiles!r}")
+
+            day_tee_times = []
+            for tile in tiles:
+                fields = [tile.get("time"), tile.get("players"), tile.get("holes")]
+                if not all(isinstance(field, str) and field for field in fields):
+                    raise ValueError(f"tile is missing fields: {tile!r}")
+                day_tee_times.append(TeeTime.from_labels(day, *fields))
+            return day_tee_times
+        except (TypeError, ValueError, AttributeError, WebDriverException) as e:
+            logger.warning("Tile extraction script failed for %s, reading tiles one by one: %s", day, str(e))
+            return None
+
     def add_time_to_dict(self, tile, tee_times, day):
         start_time = tile.find_element(
             By.CSS_SELECTOR, "div.booking-start-time-label"
@@ -158,9 +354,7 @@ class WebScraper:
         )
         players_number = players_span.find_element(By.TAG_NAME, "span").text
 
-        tee_times.append(
-            {"Date": day, "Time": start_time, "Players": players_number, "Holes": holes_number}
-        )
+        tee_times.append(TeeTime.from_labels(day, start_time, players_number, holes_number))
 
     def get_available_day(self, days_checked, log_days=False):
         days = []
@@ -194,10 +388,14 @@ class WebScraper:
     def login(self):
         for i in range(5):
             try:
-                login_button = self.driver.find_element(By.CSS_SELECTOR, "a.login")
+                login_button = wait_for(
+                    self.driver, "login link", EC.element_to_be_clickable((By.CSS_SELECTOR, "a.login"))
+                )
                 self.driver.execute_script("arguments[0].click();", login_button)
 
-                email_input = self.driver.find_element(By.ID, "login_email")
+                email_input = wait_for(
+                    self.driver, "login form", EC.visibility_of_element_located((By.ID, "login_email"))
+                )
                 password_input = self.driver.find_element(By.ID, "login_password")
 
                 email_input.send_keys(self.username)
@@ -212,7 +410,6 @@ class WebScraper:
                 return True
             except Exception as e:
                 if i < 4:
-                    time.sleep(0.5)
                     self.driver.save_screenshot("login_fail.png")
                     logger.debug("Login attempt %d failed, retrying", i + 1)
                     continue
@@ -225,18 +422,12 @@ class WebScraper:
                 logger.debug("Navigating to tee times page")
 
                 resident_button = self.wait.until(
-                    EC.element_to_be_clickable(
-                        (
-                            By.XPATH,
-                            "//button[normalize-space(text())='Verified NYS Resident - Bethpage/Sunken Meadow']",
-                        )
-                    )
+                    EC.element_to_be_clickable((By.XPATH, RESIDENT_BUTTON_XPATH))
                 )
                 self.driver.execute_script("arguments[0].click();", resident_button)
-                time.sleep(2)
 
-                course_select_element = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "select#schedule_select"))
+                course_select_element = wait_for(
+                    self.driver, "course dropdown", SelectHasOptions((By.CSS_SELECTOR, "select#schedule_select"))
                 )
                 course_select = Select(course_select_element)
                 available_options = [o.text.strip() for o in course_select.options]
@@ -248,7 +439,7 @@ class WebScraper:
                 )
                 if not black_option:
                     logger.info("Bethpage Black Course not currently in dropdown, returning no tee times")
-                    self.driver.quit()
+                    self.close_driver()
                     return None
 
                 course_select.select_by_visible_text(black_option.text.strip())
@@ -260,7 +451,6 @@ class WebScraper:
 
             except Exception as e:
                 if i < 4:
-                    time.sleep(0.75)
                     logger.debug("Navigation attempt %d failed, retrying", i + 1)
                     continue
                 logger.error("Failed to navigate to tee times page after %d attempts: %s", i + 1, str(e))
@@ -1,28 +1,41 @@
 import logging
-from bethpage_black_bot import BethpageBlackBot
-from api_gateway_handler import ApiGatewayHandler
-from lambda_helpers.one_time_link_handler import OneTimeLinkHandler
+from lambda_helpers.cold_start_profiler import ColdStartProfiler
+
+profiler = ColdStartProfiler("main.lambda_handler")
+profiler.install_import_hook()
+
+# Only the API stack is imported up front; the scraper (selenium, astral,
+# holidays) is imported on the scheduled path that needs it
+with profiler.phase("import api_gateway_handler"):
+    from api_gateway_handler import ApiGatewayHandler
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 def lambda_handler(event, context):
-    # If the event came from API Gateway (HTTP API)
-    if "routeKey" in event:
-        handler = ApiGatewayHandler()
-        response = handler.handle(event)
-        return response
-
-    # Otherwise, this is a scheduled or direct invocation
-    bot = BethpageBlackBot()
-    bot.notify_if_new_tee_times()
-
-    # remove old one time links
-    one_time_link_handler = OneTimeLinkHandler()
-    one_time_link_handler.remove_old_one_time_links()
-
-    success_message = {"message": "Tee time check completed."}
-    return ApiGatewayHandler().format_api_response(success_message, 200)
+    try:
+        # If the event came from API Gateway (HTTP API)
+        if "routeKey" in event:
+            with profiler.phase("handle api request"):
+                handler = ApiGatewayHandler()
+                response = handler.handle(event)
+            return response
+
+        # Otherwise, this is a scheduled or direct invocation
+        with profiler.phase("import bethpage_black_bot"):
+            from bethpage_black_bot import BethpageBlackBot
+
+        with profiler.phase("notify if new tee times"):
+            bot = BethpageBlackBot()
+            bot.notify_if_new_tee_times()
+
+        # Expired one-time links are removed by DynamoDB TTL on expire_at
+        # (backfill_one_time_link_ttl.py migrates older links)
+
+        success_message = {"message": "Tee time check completed."}
+        return ApiGatewayHandler.format_api_response(success_message, 200)
+    finally:
+        profiler.emit()
 
 # lambda_handler({}, None)  # For local testing only
@@ -30,9 +30,10 @@ def run():
         # times look "new" and we don't pollute the DB.
         from lambda_helpers.dynamo_db_connection import DynamoDBConnection as RealDDB
         real_ddb = RealDDB()
-        real_ddb.get_available_times_by_day = lambda: {}           # nothing seen yet
-        real_ddb.update_available_times_by_day = lambda x: None    # don't write
-        real_ddb.publish_teetimes = lambda x: None                 # don't write
+        real_ddb.get_seen_tee_time_keys = lambda: set()            # nothing seen yet
+        real_ddb.update_seen_tee_time_keys = lambda x: None        # don't write
+        real_ddb.publish_teetimes = lambda x, fingerprint=None: None  # don't write
+        real_ddb.get_scrape_fingerprint = lambda: None             # always treat the scrape as changed
         mock_ddc_cls.return_value = real_ddb
 
         # Use the real TeeTimeFilterer with the live DB so user prefs apply
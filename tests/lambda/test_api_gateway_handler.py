@@ -5,28 +5,57 @@ from unittest.mock import patch, MagicMock
 
 def make_handler():
     """Create ApiGatewayHandler with mocked dependencies."""
-    with patch("api_gateway_handler.EmailSender") as mock_email, \
-         patch("api_gateway_handler.DynamoDBConnection") as mock_ddc, \
-         patch("api_gateway_handler.OneTimeLinkHandler") as mock_otlh:
-        from api_gateway_handler import ApiGatewayHandler
-        h = ApiGatewayHandler()
-        # Attach mocks to handler for test access
-        h._mock_ddc = mock_ddc.return_value
-        h._mock_otlh = mock_otlh.return_value
-        h._mock_email = mock_email.return_value
-        return h
+    from api_gateway_handler import ApiGatewayHandler
+    ApiGatewayHandler.clear_recent_times_cache()
+    mock_email, mock_ddc, mock_otlh = MagicMock(), MagicMock(), MagicMock()
+    h = ApiGatewayHandler(email_sender=mock_email, ddc=mock_ddc, otlh=mock_otlh)
+    # Attach mocks to handler for test access
+    h._mock_ddc = mock_ddc
+    h._mock_otlh = mock_otlh
+    h._mock_email = mock_email
+    return h
 
 
-def make_event(method, path, body=None, origin="http://localhost:3000"):
+def make_event(method, path, body=None, origin="http://localhost:3000", query=None, if_none_match=None):
     event = {
         "routeKey": f"{method} {path}",
         "headers": {"origin": origin},
     }
+    if if_none_match is not None:
+        event["headers"]["if-none-match"] = if_none_match
+    if query is not None:
+        event["queryStringParameters"] = query
     if body is not None:
         event["body"] = json.dumps(body)
     return event
 
 
+class TestLazyCollaborators:
+    def test_recent_times_builds_only_dynamodb(self):
+        with patch("api_gateway_handler.EmailSender") as mock_email, \
+             patch("api_gateway_handler.DynamoDBConnection") as mock_ddc, \
+             patch("api_gateway_handler.OneTimeLinkHandler") as mock_otlh:
+            from api_gateway_handler import ApiGatewayHandler
+            ApiGatewayHandler.clear_recent_times_cache()
+            mock_ddc.return_value.get_latest_publish_id.return_value = "2026-05-28T07:00:00"
+            mock_ddc.return_value.get_latest_tee_times_all.return_value = []
+
+            h = ApiGatewayHandler()
+            mock_ddc.assert_not_called()
+            assert h.handle(make_event("GET", "/getRecentTimes"))["statusCode"] == 200
+
+            mock_ddc.assert_called_once()
+            mock_email.assert_not_called()
+            mock_otlh.assert_not_called()
+
+    def test_collaborators_built_once(self):
+        with patch("api_gateway_handler.EmailSender") as mock_email:
+            from api_gateway_handler import ApiGatewayHandler
+            h = ApiGatewayHandler()
+            assert h.email_sender is h.email_sender
+            mock_email.assert_called_once()
+
+
 class TestFormatApiResponse:
     def test_dict_body(self):
         h = make_handler()
@@ -84,6 +113,151 @@ class TestOriginValidation:
         assert resp["statusCode"] == 200
 
 
+RECENT_TIMES = [
+    {"Date": "Saturday May 30th", "Time": "8:00am", "Players": Decimal(4), "Holes": Decimal(18)},
+    {"Date": "Saturday May 30th", "Time": "9:00am", "Players": Decimal(1), "Holes": Decimal(18)},
+    {"Date": "Sunday May 31st", "Time": "7:00am", "Players": Decimal(3), "Holes": Decimal(9)},
+    {"Date": "Sunday May 31st", "Time": "8:00am", "Players": Decimal(2), "Holes": Decimal(18)},
+]
+
+
+class TestGetRecentTimesQuery:
+    def get(self, h, query=None):
+        resp = h.handle(make_event("GET", "/getRecentTimes", query=query))
+        return resp["statusCode"], json.loads(resp["body"])
+
+    def make_handler(self, publish_id="2026-05-28T07:00:00"):
+        h = make_handler()
+        h._mock_ddc.get_latest_publish_id.return_value = publish_id
+        h._mock_ddc.get_latest_tee_times_all.return_value = RECENT_TIMES
+        return h
+
+    def test_filters(self):
+        h = self.make_handler()
+        _, body = self.get(h, {"date": "Saturday May 30th", "min_players": "2"})
+        assert [t["Time"] for t in body["result"]] == ["8:00am"]
+        _, body = self.get(h, {"holes": "18", "min_players": "2"})
+        assert [(t["Date"], t["Time"]) for t in body["result"]] == [
+            ("Saturday May 30th", "8:00am"),
+            ("Sunday May 31st", "8:00am"),
+        ]
+
+    def test_label_counts_filter_without_erroring(self):
+        h = self.make_handler()
+        h._mock_ddc.get_latest_tee_times_all.return_value = RECENT_TIMES + [
+            {"Date": "Monday June 1st", "Time": "6:00am", "Players": "4", "Holes": "9/18"},
+            {"Date": "Monday June 1st", "Time": "7:00am", "Players": "?", "Holes": "TBD"},
+        ]
+        status, body = self.get(h, {"holes": "18", "min_players": "4"})
+        assert status == 200
+        assert [(t["Date"], t["Time"]) for t in body["result"]] == [
+            ("Saturday May 30th", "8:00am"),
+            ("Monday June 1st", "6:00am"),
+        ]
+        status, body = self.get(h, {"holes": "9"})
+        assert status == 200
+        assert [(t["Date"], t["Time"]) for t in body["result"]] == [("Sunday May 31st", "7:00am")]
+
+    def test_iso_date_filter(self):
+        from lambda_helpers.date_handler import DateHandler
+        from datetime import date
+        label = DateHandler().format_date_label(date(2026, 5, 30))
+        h = self.make_handler()
+        h._mock_ddc.get_latest_tee_times_all.return_value = [dict(RECENT_TIMES[0], Date=label)]
+        _, body = self.get(h, {"date": "2026-05-30"})
+        assert body["total"] == 1
+
+    def test_pagination(self):
+        h = self.make_handler()
+        _, first = self.get(h, {"limit": "3"})
+        assert len(first["result"]) == 3
+        assert first["total"] == 4
+        _, second = self.get(h, {"limit": "3", "cursor": first["next_cursor"]})
+        assert [t["Time"] for t in second["result"]] == ["8:00am"]
+        assert second["next_cursor"] is None
+
+    def test_no_query_returns_everything(self):
+        _, body = self.get(self.make_handler())
+        assert len(body["result"]) == 4
+        assert body["next_cursor"] is None
+
+    def test_invalid_query_is_400(self):
+        h = self.make_handler()
+        assert self.get(h, {"min_players": "two"})[0] == 400
+        assert self.get(h, {"limit": "0"})[0] == 400
+        assert self.get(h, {"cursor": "-1"})[0] == 400
+
+    def test_repeated_requests_skip_dynamodb(self):
+        h = self.make_handler()
+        self.get(h, {"limit": "2"})
+        self.get(h, {"limit": "2"})
+        self.get(h, {"holes": "9"})
+        h._mock_ddc.get_latest_tee_times_all.assert_called_once()
+        h._mock_ddc.get_latest_publish_id.assert_called_once()
+
+    def test_new_publish_reloads_after_ttl(self):
+        from api_gateway_handler import ApiGatewayHandler
+        h = self.make_handler()
+        self.get(h)
+        ApiGatewayHandler._recent_times_cache["checked_at"] = 0.0
+        self.get(h)
+        h._mock_ddc.get_latest_tee_times_all.assert_called_once()
+
+        ApiGatewayHandler._recent_times_cache["checked_at"] = 0.0
+        h._mock_ddc.get_latest_publish_id.return_value = "2026-05-28T07:03:00"
+        h._mock_ddc.get_latest_tee_times_all.return_value = RECENT_TIMES[:1]
+        _, body = self.get(h)
+        assert len(body["result"]) == 1
+
+
+class TestConditionalGet:
+    def test_recent_times_etag_and_304(self):
+        h = make_handler()
+        h._mock_ddc.get_latest_publish_id.return_value = "2026-05-28T07:00:00"
+        h._mock_ddc.get_latest_tee_times_all.return_value = RECENT_TIMES
+        first = h.handle(make_event("GET", "/getRecentTimes"))
+        etag = first["headers"]["ETag"]
+        assert first["headers"]["Cache-Control"] == "public, max-age=30"
+
+        second = h.handle(make_event("GET", "/getRecentTimes", if_none_match=etag))
+        assert second["statusCode"] == 304
+        assert second["body"] == ""
+        assert second["headers"]["ETag"] == etag
+
+    def test_etag_differs_per_query(self):
+        h = make_handler()
+        h._mock_ddc.get_latest_publish_id.return_value = "2026-05-28T07:00:00"
+        h._mock_ddc.get_latest_tee_times_all.return_value = RECENT_TIMES
+        etag = h.handle(make_event("GET", "/getRecentTimes"))["headers"]["ETag"]
+        resp = h.handle(make_event("GET", "/getRecentTimes", query={"holes": "9"}, if_none_match=etag))
+        assert resp["statusCode"] == 200
+        assert resp["headers"]["ETag"] != etag
+
+    def test_user_config_post_has_no_etag(self):
+        # A POST can never be answered with 304, so the per-user route sends no validator
+        h = make_handler()
+        h._mock_ddc.get_user_config.return_value = {"id": "a@b.com", "min_players": Decimal(2)}
+        resp = h.handle(make_event("POST", "/getUserConfig", body={"email": "a@b.com"}, if_none_match='"abc"'))
+        assert resp["statusCode"] == 200
+        assert json.loads(resp["body"])["result"]["min_players"] == 2
+        assert "ETag" not in resp["headers"]
+        assert "Cache-Control" not in resp["headers"]
+
+    def test_etag_matches(self):
+        from api_gateway_handler import ApiGatewayHandler
+        event = make_event("GET", "/getRecentTimes", if_none_match='W/"abc"')
+        assert ApiGatewayHandler.etag_matches(event, '"abc"')
+        assert not ApiGatewayHandler.etag_matches(event, '"def"')
+        assert ApiGatewayHandler.etag_matches(make_event("GET", "/x", if_none_match="*"), '"def"')
+        assert not ApiGatewayHandler.etag_matches(make_event("GET", "/x"), '"abc"')
+
+    def test_write_routes_have_no_etag(self):
+        h = make_handler()
+        h._mock_ddc.add_email_to_all_emails_list.return_value = (True, "")
+        resp = h.handle(make_event("POST", "/register", body={"email": "a@b.com"}))
+        assert "ETag" not in resp["headers"]
+
+
 class TestRoutes:
     def test_get_recent_times(self):
         h = make_handler()
@@ -0,0 +1,53 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from unittest.mock import patch
+
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "lambda")
+
+
+def load_api_main_in_fresh_interpreter():
+    """Import api_main and serve one request in a clean process; return its loaded modules."""
+    script = (
+        "import json, sys, api_main\n"
+        "api_main.lambda_handler({'routeKey': 'GET /getRecentTimes', 'headers': {'origin': 'https://evil.com'}}, None)\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    env = dict(os.environ, AWS_DEFAULT_REGION="us-east-1")
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=LAMBDA_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return set(json.loads(output.strip().splitlines()[-1]))
+
+
+class TestApiMain:
+    @patch("api_main.ApiGatewayHandler")
+    def test_routes_api_events(self, mock_api_cls):
+        from api_main import lambda_handler
+
+        mock_api_cls.return_value.handle.return_value = {"statusCode": 200, "body": "ok"}
+        event = {"routeKey": "GET /getRecentTimes"}
+        assert lambda_handler(event, None)["statusCode"] == 200
+        mock_api_cls.return_value.handle.assert_called_once_with(event)
+
+    def test_rejects_scheduled_events(self):
+        from api_main import lambda_handler
+
+        assert lambda_handler({}, None)["statusCode"] == 400
+
+    def test_does_not_import_scraping_stack(self):
+        modules = load_api_main_in_fresh_interpreter()
+        for heavy in ("selenium", "astral", "holidays", "requests", "bethpage_black_bot"):
+            assert heavy not in modules
+
+    def test_dockerfile_copies_every_helper_it_imports(self):
+        with open(os.path.join(LAMBDA_DIR, "Dockerfile.api")) as f:
+            copied = set(re.findall(r"lambda_helpers/(\w+)\.py", f.read()))
+        loaded = {
+            name.split(".", 1)[1]
+            for name in load_api_main_in_fresh_interpreter()
+            if name.startswith("lambda_helpers.")
+        }
+        assert loaded <= copied
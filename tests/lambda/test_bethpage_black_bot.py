@@ -18,10 +18,11 @@ class TestGetNewTeeTimes:
             {"Date": "Sat", "Time": "9:00am", "Players": "2", "Holes": "18"},
         ]
         mock_scraper.get_tee_time_data.return_value = all_times
-        mock_ddc.get_all_emails_list.return_value = ["a@b.com"]
+        mock_ddc.get_all_emails_and_configs.return_value = (["a@b.com"], {})
         mock_ddc.get_latest_filtered_tee_times.return_value = {}
+        mock_ddc.get_seen_tee_time_keys.return_value = set()
 
-        mock_filterer.filter_tee_times_for_user.return_value = [all_times[0]]
+        mock_filterer.filter_tee_times_for_users.return_value = {"a@b.com": [all_times[0]]}
         mock_filterer.remove_existing_tee_times.return_value = [all_times[0]]
 
         bot = BethpageBlackBot()
@@ -32,6 +33,7 @@ class TestGetNewTeeTimes:
         assert "a@b.com" in result
         assert len(result["a@b.com"]) == 1
         mock_ddc.publish_teetimes.assert_called_once()
+        mock_ddc.update_seen_tee_time_keys.assert_called_once_with({("Sat", "8:00am", 3, 18)})
 
     @patch("bethpage_black_bot.TeeTimeFilterer")
     @patch("bethpage_black_bot.DynamoDBConnection")
@@ -41,9 +43,10 @@ class TestGetNewTeeTimes:
         from bethpage_black_bot import BethpageBlackBot
 
         mock_scraper_cls.return_value.get_tee_time_data.return_value = []
-        mock_ddc_cls.return_value.get_all_emails_list.return_value = ["a@b.com"]
+        mock_ddc_cls.return_value.get_all_emails_and_configs.return_value = (["a@b.com"], {})
         mock_ddc_cls.return_value.get_latest_filtered_tee_times.return_value = {}
-        mock_filterer_cls.return_value.filter_tee_times_for_user.return_value = []
+        mock_ddc_cls.return_value.get_seen_tee_time_keys.return_value = set()
+        mock_filterer_cls.return_value.filter_tee_times_for_users.return_value = {}
         mock_filterer_cls.return_value.remove_existing_tee_times.return_value = []
 
         bot = BethpageBlackBot()
@@ -52,20 +55,77 @@ class TestGetNewTeeTimes:
         result = bot.get_new_tee_times()
         assert result == {}
 
+    @patch("bethpage_black_bot.TeeTimeFilterer")
+    @patch("bethpage_black_bot.DynamoDBConnection")
+    @patch("bethpage_black_bot.WebScraper")
+    @patch("bethpage_black_bot.SecretHandler")
+    def test_unchanged_scrape_skips_processing(self, mock_secret, mock_scraper_cls, mock_ddc_cls, mock_filterer_cls):
+        from datetime import datetime
+        from bethpage_black_bot import BethpageBlackBot
+        from lambda_helpers.tee_time import fingerprint_tee_times
+
+        all_times = [{"Date": "Sat", "Time": "8:00am", "Players": "3", "Holes": "18"}]
+        mock_ddc = mock_ddc_cls.return_value
+        mock_scraper_cls.return_value.get_tee_time_data.return_value = all_times
+        mock_ddc.get_config_version.return_value = 7
+        mock_ddc.get_scrape_fingerprint.return_value = fingerprint_tee_times(
+            all_times, datetime.now().date().isoformat(), 7
+        )
+
+        bot = BethpageBlackBot()
+        bot.bethpage_email = "user"
+        bot.bethpage_password = "pass"
+        assert bot.get_new_tee_times() == {}
+
+        mock_ddc.get_seen_tee_time_keys.assert_not_called()
+        mock_ddc.get_all_emails_and_configs.assert_not_called()
+        mock_filterer_cls.return_value.filter_tee_times_for_users.assert_not_called()
+        mock_ddc.publish_teetimes.assert_not_called()
+
 
 class TestNotifyIfNewTeeTimes:
+    @patch("bethpage_black_bot.OneTimeLinkHandler")
     @patch("bethpage_black_bot.EmailSender")
     @patch("bethpage_black_bot.SecretHandler")
-    def test_sends_emails(self, mock_secret, mock_email_cls):
+    def test_sends_emails(self, mock_secret, mock_email_cls, mock_otlh_cls):
         from bethpage_black_bot import BethpageBlackBot
 
         mock_secret.get_bethpage_username_and_password.return_value = ("user", "pass")
-        bot = BethpageBlackBot()
+        mock_otlh_cls.return_value.generate_and_store_links.return_value = {"a@b.com": "guid-1"}
+        bot = BethpageBlackBot(pipeline_mode="serial")
 
         with patch.object(bot, "get_new_tee_times", return_value={"a@b.com": [{"Time": "8am"}]}):
             bot.notify_if_new_tee_times()
 
-        mock_email_cls.return_value.send_email.assert_called_once()
+        mock_email_cls.return_value.send_email.assert_called_once_with(
+            "a@b.com", [{"Time": "8am"}], pause_guid="guid-1"
+        )
+        mock_email_cls.return_value.send_error_email.assert_not_called()
+        mock_otlh_cls.return_value.generate_and_store_links.assert_called_once_with(
+            {"a@b.com": [{"Time": "8am"}]}, is_pause=True
+        )
+
+    @patch("bethpage_black_bot.OneTimeLinkHandler")
+    @patch("bethpage_black_bot.EmailSender")
+    @patch("bethpage_black_bot.SecretHandler")
+    def test_failed_send_reported_without_stopping_others(self, mock_secret, mock_email_cls, mock_otlh_cls):
+        from bethpage_black_bot import BethpageBlackBot
+
+        mock_secret.get_bethpage_username_and_password.return_value = ("user", "pass")
+        mock_sender = mock_email_cls.return_value
+        mock_sender.send_email.side_effect = lambda email, *args, **kwargs: (
+            (_ for _ in ()).throw(RuntimeError("rejected")) if email == "bad@b.com" else None
+        )
+        bot = BethpageBlackBot(pipeline_mode="serial")
+        new_times = {"bad@b.com": [{"Time": "8am"}], "good@b.com": [{"Time": "9am"}]}
+
+        with patch.object(bot, "get_new_tee_times", return_value=new_times):
+            bot.notify_if_new_tee_times()
+
+        assert mock_sender.send_email.call_count == 2
+        summary = mock_sender.send_error_email.call_args[0][0]
+        assert "bad@b.com" in summary
+        assert "good@b.com" not in summary
 
     @patch("bethpage_black_bot.EmailSender")
     @patch("bethpage_black_bot.SecretHandler")
@@ -74,10 +134,118 @@ class TestNotifyIfNewTeeTimes:
         import pytest
 
         mock_secret.get_bethpage_username_and_password.return_value = ("user", "pass")
-        bot = BethpageBlackBot()
+        bot = BethpageBlackBot(pipeline_mode="serial")
 
         with patch.object(bot, "get_new_tee_times", side_effect=RuntimeError("boom")):
             with pytest.raises(RuntimeError):
                 bot.notify_if_new_tee_times()
 
         mock_email_cls.return_value.send_error_email.assert_called_once()
+
+    @patch("bethpage_black_bot.OneTimeLinkHandler")
+    @patch("bethpage_black_bot.EmailSender")
+    @patch("bethpage_black_bot.SecretHandler")
+    def test_async_mode_sends_with_pipeline_links(self, mock_secret, mock_email_cls, mock_otlh_cls):
+        from bethpage_black_bot import BethpageBlackBot
+
+        mock_secret.get_bethpage_username_and_password.return_value = ("user", "pass")
+        bot = BethpageBlackBot(pipeline_mode="async")
+
+        async def fake_pipeline(otlh):
+            return {"a@b.com": [{"Time": "8am"}]}, {"a@b.com": "guid-1"}
+
+        with patch.object(bot, "get_new_tee_times_async", side_effect=fake_pipeline):
+            bot.notify_if_new_tee_times()
+
+        mock_email_cls.return_value.send_email.assert_called_once_with(
+            "a@b.com", [{"Time": "8am"}], pause_guid="guid-1"
+        )
+        mock_otlh_cls.return_value.generate_and_store_links.assert_not_called()
+
+
+class TestGetNewTeeTimesAsync:
+    def make_mocks(self, mock_scraper_cls, mock_ddc_cls, mock_filterer_cls, all_times):
+        mock_ddc = mock_ddc_cls.return_value
+        mock_scraper_cls.return_value.get_tee_time_data.return_value = all_times
+        mock_ddc.get_config_version.return_value = 3
+        mock_ddc.get_scrape_fingerprint.return_value = None
+        mock_ddc.get_seen_tee_time_keys.return_value = set()
+        mock_ddc.get_all_emails_and_configs.return_value = (["a@b.com"], {})
+        mock_filterer_cls.return_value.filter_tee_times_for_users.return_value = {"a@b.com": [all_times[0]]}
+        mock_filterer_cls.return_value.remove_existing_tee_times.return_value = [all_times[0]]
+        otlh = MagicMock()
+        otlh.generate_and_store_links.return_value = {"a@b.com": "guid-1"}
+        return mock_ddc, otlh
+
+    @patch("bethpage_black_bot.TeeTimeFilterer")
+    @patch("bethpage_black_bot.DynamoDBConnection")
+    @patch("bethpage_black_bot.WebScraper")
+    def test_matches_serial_result(self, mock_scraper_cls, mock_ddc_cls, mock_filterer_cls):
+        import asyncio
+        from bethpage_black_bot import BethpageBlackBot
+
+        all_times = [{"Date": "Sat", "Time": "8:00am", "Players": "3", "Holes": "18"}]
+        mock_ddc, otlh = self.make_mocks(mock_scraper_cls, mock_ddc_cls, mock_filterer_cls, all_times)
+
+        bot = BethpageBlackBot()
+        bot.bethpage_email = "user"
+        bot.bethpage_password = "pass"
+        new_times, pause_guids = asyncio.run(bot.get_new_tee_times_async(otlh))
+
+        assert list(new_times) == ["a@b.com"]
+        assert pause_guids == {"a@b.com": "guid-1"}
+        mock_ddc.get_all_emails_and_configs.assert_called_once_with(3)
+        mock_ddc.update_seen_tee_time_keys.assert_called_once_with({("Sat", "8:00am", 3, 18)})
+        mock_ddc.publish_teetimes.assert_called_once()
+        otlh.generate_and_store_links.assert_called_once_with(new_times, is_pause=True)
+
+    @patch("bethpage_black_bot.TeeTimeFilterer")
+    @patch("bethpage_black_bot.DynamoDBConnection")
+    @patch("bethpage_black_bot.WebScraper")
+    def test_reads_overlap_the_scrape(self, mock_scraper_cls, mock_ddc_cls, mock_filterer_cls):
+        import asyncio
+        import threading
+        from bethpage_black_bot import BethpageBlackBot
+
+        all_times = [{"Date": "Sat", "Time": "8:00am", "Players": "3", "Holes": "18"}]
+        mock_ddc, otlh = self.make_mocks(mock_scraper_cls, mock_ddc_cls, mock_filterer_cls, all_times)
+        fingerprint_read = threading.Event()
+        mock_ddc.get_scrape_fingerprint.side_effect = lambda: fingerprint_read.set() or None
+
+        def scrape():
+            # Only finishes if the DynamoDB reads ran while the scrape was in progress
+            assert fingerprint_read.wait(timeout=5)
+            return all_times
+
+        mock_scraper_cls.return_value.get_tee_time_data.side_effect = scrape
+
+        bot = BethpageBlackBot()
+        bot.bethpage_email = "user"
+        bot.bethpage_password = "pass"
+        new_times, _ = asyncio.run(bot.get_new_tee_times_async(otlh))
+        assert "a@b.com" in new_times
+
+    @patch("bethpage_black_bot.TeeTimeFilterer")
+    @patch("bethpage_black_bot.DynamoDBConnection")
+    @patch("bethpage_black_bot.WebScraper")
+    def test_unchanged_scrape_skips_writes(self, mock_scraper_cls, mock_ddc_cls, mock_filterer_cls):
+        import asyncio
+        from datetime import datetime
+        from bethpage_black_bot import BethpageBlackBot
+        from lambda_helpers.tee_time import fingerprint_tee_times
+
+        all_times = [{"Date": "Sat", "Time": "8:00am", "Players": "3", "Holes": "18"}]
+        mock_ddc, otlh = self.make_mocks(mock_scraper_cls, mock_ddc_cls, mock_filterer_cls, all_times)
+        mock_ddc.get_scrape_fingerprint.return_value = fingerprint_tee_times(
+            all_times, datetime.now().date().isoformat(), 3
+        )
+
+        bot = BethpageBlackBot()
+        bot.bethpage_email = "user"
+        bot.bethpage_password = "pass"
+        assert asyncio.run(bot.get_new_tee_times_async(otlh)) == ({}, {})
+        # Heartbeat runs skip the larger reads, as in serial mode
+        mock_ddc.get_seen_tee_time_keys.assert_not_called()
+        mock_ddc.get_all_emails_and_configs.assert_not_called()
+        mock_ddc.publish_teetimes.assert_not_called()
+        otlh.generate_and_store_links.assert_not_called()
@@ -0,0 +1,61 @@
+import builtins
+import json
+import logging
+import sys
+from lambda_helpers.cold_start_profiler import ColdStartProfiler
+
+
+def last_profile(caplog):
+    records = [r for r in caplog.records if "cold_start_profile" in r.getMessage()]
+    return json.loads(records[-1].getMessage())
+
+
+class TestColdStartProfiler:
+    def test_disabled_is_a_no_op(self, caplog):
+        profiler = ColdStartProfiler("main.lambda_handler", enabled=False)
+        original_import = builtins.__import__
+        profiler.install_import_hook()
+        assert builtins.__import__ is original_import
+        with profiler.phase("work"):
+            pass
+        with caplog.at_level(logging.INFO):
+            profiler.emit()
+        assert profiler.phase_times == {}
+        assert not [r for r in caplog.records if "cold_start_profile" in r.getMessage()]
+
+    def test_records_new_imports_and_phases(self, caplog):
+        sys.modules.pop("colorsys", None)
+        profiler = ColdStartProfiler("main.lambda_handler", enabled=True)
+        profiler.install_import_hook()
+        try:
+            with profiler.phase("import"):
+                import colorsys  # noqa: F401
+                import json as already_loaded  # noqa: F401
+        finally:
+            profiler.remove_import_hook()
+
+        assert "colorsys" in profiler.import_times
+        assert "json" not in profiler.import_times
+
+        with caplog.at_level(logging.INFO):
+            profiler.emit()
+        profile = last_profile(caplog)
+        assert profile["entry_point"] == "main.lambda_handler"
+        assert profile["cold_start"] is True
+        assert "colorsys" in profile["imports_ms"]
+        assert "import" in profile["phases_ms"]
+
+    def test_warm_invocations_log_phases_only(self, caplog):
+        profiler = ColdStartProfiler("main.lambda_handler", enabled=True)
+        profiler.install_import_hook()
+        with caplog.at_level(logging.INFO):
+            profiler.emit()
+            with profiler.phase("handle api request"):
+                pass
+            profiler.emit()
+
+        profile = last_profile(caplog)
+        assert profile["cold_start"] is False
+        assert "imports_ms" not in profile
+        assert list(profile["phases_ms"]) == ["handle api request"]
+        assert builtins.__import__ is not profiler._timed_import
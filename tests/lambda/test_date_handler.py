@@ -53,6 +53,22 @@ class TestStripOrdinalSuffix:
         assert self.dh.strip_ordinal_suffix("15") == "15"
 
 
+class TestDateLabels:
+    def setup_method(self):
+        self.dh = DateHandler()
+
+    def test_format_date_label(self):
+        assert self.dh.format_date_label(datetime(2026, 5, 30).date()) == "Saturday May 30th"
+
+    def test_parse_date_label(self):
+        day_of_week, date_obj = self.dh.parse_date_label("Saturday May 30th", year=2026)
+        assert day_of_week == "Saturday"
+        assert date_obj == datetime(2026, 5, 30).date()
+
+    def test_parse_time_label(self):
+        assert self.dh.parse_time_label("1:40pm").hour == 13
+
+
 class TestGetDateFromDayNumber:
     def setup_method(self):
         self.dh = DateHandler()
@@ -0,0 +1,31 @@
+from unittest.mock import MagicMock, patch
+from lambda_helpers.dynamo_db_batch import BATCH_MAX_RETRIES, retry_unprocessed
+
+
+class TestRetryUnprocessed:
+    @patch("lambda_helpers.dynamo_db_batch.time.sleep")
+    def test_resends_unprocessed_with_backoff(self, mock_sleep):
+        batch_call = MagicMock(side_effect=[
+            {"UnprocessedItems": {"table": ["b"]}},
+            {"UnprocessedItems": {}},
+        ])
+        assert retry_unprocessed(batch_call, {"table": ["a", "b"]}, "UnprocessedItems") is None
+        assert batch_call.call_args_list[1][1]["RequestItems"] == {"table": ["b"]}
+        mock_sleep.assert_called_once()
+
+    @patch("lambda_helpers.dynamo_db_batch.time.sleep")
+    def test_on_response_sees_every_response(self, mock_sleep):
+        responses = [
+            {"Responses": {"table": [1]}, "UnprocessedKeys": {"table": {"Keys": [2]}}},
+            {"Responses": {"table": [2]}},
+        ]
+        seen = []
+        retry_unprocessed(MagicMock(side_effect=responses), {}, "UnprocessedKeys", on_response=seen.append)
+        assert seen == responses
+
+    @patch("lambda_helpers.dynamo_db_batch.time.sleep")
+    def test_returns_leftovers_after_max_retries(self, mock_sleep):
+        batch_call = MagicMock(return_value={"UnprocessedItems": {"table": ["a"]}})
+        assert retry_unprocessed(batch_call, {"table": ["a"]}, "UnprocessedItems") == {"table": ["a"]}
+        assert batch_call.call_count == BATCH_MAX_RETRIES + 1
+        assert mock_sleep.call_count == BATCH_MAX_RETRIES
@@ -31,6 +31,103 @@ class TestPublishTeeTimes:
         assert len(latest_call) == 1
 
 
+class TestScrapeFingerprint:
+    def test_stored_on_latest_item_only(self):
+        conn, mock_table, _ = make_connection()
+        conn.publish_teetimes([], fingerprint="abc")
+        items = {c[1]["Item"]["id"]: c[1]["Item"] for c in mock_table.put_item.call_args_list}
+        assert items.pop("latest-tee-times")["scrape_fingerprint"] == "abc"
+        assert "scrape_fingerprint" not in list(items.values())[0]
+
+    def test_get_scrape_fingerprint(self):
+        conn, mock_table, _ = make_connection()
+        mock_table.get_item.return_value = {"Item": {"scrape_fingerprint": "abc"}}
+        assert conn.get_scrape_fingerprint() == "abc"
+        assert mock_table.get_item.call_args[1]["Key"] == {"id": "latest-tee-times"}
+
+    def test_get_scrape_fingerprint_missing(self):
+        conn, mock_table, _ = make_connection()
+        mock_table.get_item.return_value = {}
+        assert conn.get_scrape_fingerprint() is None
+
+
+SAT_8 = {"Date": "Sat", "Time": "8:00am", "Players": 4, "Holes": 18}
+SAT_9 = {"Date": "Sat", "Time": "9:00am", "Players": 2, "Holes": 18}
+SUN_7 = {"Date": "Sun", "Time": "7:00am", "Players": 1, "Holes": 18}
+
+
+class TestPublishHistory:
+    def publish(self, latest, tee_times):
+        conn, mock_table, _ = make_connection()
+        mock_table.get_item.return_value = {"Item": latest} if latest else {}
+        history_id = conn.publish_teetimes(tee_times)
+        items = [c[1]["Item"] for c in mock_table.put_item.call_args_list]
+        history = [i for i in items if i["id"] != "latest-tee-times"]
+        latest_item = next(i for i in items if i["id"] == "latest-tee-times")
+        return history_id, history, latest_item
+
+    def test_first_publish_is_snapshot(self):
+        history_id, history, latest = self.publish(None, [SAT_8])
+        assert history == [{"id": history_id, "history_type": "snapshot", "all_tee_times": [SAT_8]}]
+        assert latest["deltas_since_snapshot"] == 0
+
+    def test_change_stores_delta_only(self):
+        previous = {"id": "latest-tee-times", "all_tee_times": [SAT_8, SAT_9], "deltas_since_snapshot": 3}
+        _, history, latest = self.publish(previous, [SAT_9, SUN_7])
+        assert history[0]["history_type"] == "delta"
+        assert history[0]["added"] == [SUN_7]
+        assert history[0]["removed"] == [SAT_8]
+        assert "all_tee_times" not in history[0]
+        assert latest["deltas_since_snapshot"] == 4
+
+    def test_unchanged_list_adds_no_history(self):
+        previous = {"id": "latest-tee-times", "all_tee_times": [dict(SAT_8, Players="4")], "deltas_since_snapshot": 3}
+        history_id, history, latest = self.publish(previous, [SAT_8])
+        assert history_id is None
+        assert history == []
+        assert latest["deltas_since_snapshot"] == 3
+
+    def test_snapshot_after_threshold(self):
+        from lambda_helpers.dynamo_db_connection import SNAPSHOT_EVERY_N_DELTAS
+        previous = {"id": "latest-tee-times", "all_tee_times": [SAT_8], "deltas_since_snapshot": SNAPSHOT_EVERY_N_DELTAS}
+        _, history, latest = self.publish(previous, [SAT_9])
+        assert history[0]["history_type"] == "snapshot"
+        assert latest["deltas_since_snapshot"] == 0
+
+
+class TestGetTeeTimesAt:
+    HISTORY = [
+        {"id": "2026-05-28T07:00:00", "all_tee_times": [SAT_8]},  # legacy full copy
+        {"id": "2026-05-28T07:03:00", "history_type": "delta", "added": [SAT_9], "removed": []},
+        {"id": "2026-05-28T07:06:00", "history_type": "snapshot", "all_tee_times": [SAT_9]},
+        {"id": "2026-05-28T07:09:00", "history_type": "delta", "added": [SUN_7], "removed": [SAT_9]},
+    ]
+
+    def rebuild(self, timestamp, history):
+        conn, mock_table, _ = make_connection()
+        # The real scan filters by id <= timestamp
+        mock_table.scan.return_value = {"Items": [i for i in history if i["id"] <= timestamp]}
+        return conn.get_tee_times_at(timestamp)
+
+    def test_applies_deltas_after_latest_snapshot(self):
+        assert self.rebuild("2026-05-28T07:10:00", self.HISTORY) == [SUN_7]
+
+    def test_legacy_item_counts_as_snapshot(self):
+        assert self.rebuild("2026-05-28T07:04:00", self.HISTORY) == [SAT_8, SAT_9]
+
+    def test_before_any_snapshot(self):
+        assert self.rebuild("2026-05-27T00:00:00", self.HISTORY) is None
+
+    def test_follows_scan_pages(self):
+        conn, mock_table, _ = make_connection()
+        mock_table.scan.side_effect = [
+            {"Items": self.HISTORY[2:3], "LastEvaluatedKey": {"id": "x"}},
+            {"Items": self.HISTORY[3:]},
+        ]
+        assert conn.get_tee_times_at("2026-05-28T07:10:00") == [SUN_7]
+        assert mock_table.scan.call_args_list[1][1]["ExclusiveStartKey"] == {"id": "x"}
+
+
 class TestGetLatestTeeTimesObject:
     def test_found(self):
         conn, mock_table, _ = make_connection()
@@ -109,3 +206,130 @@ class TestCreateOrUpdateUserConfig:
         conn.create_or_update_user_config("a@b.com")
         item = mock_config.put_item.call_args[1]["Item"]
         assert item["min_players"] == 2  # default
+
+
+class TestGetUserConfigs:
+    def test_chunks_keys_by_100(self):
+        conn, _, _ = make_connection()
+        conn.dynamodb.batch_get_item.side_effect = lambda RequestItems: {
+            "Responses": {
+                "bethpage-black-bot-config": [
+                    {"id": key["id"]} for key in RequestItems["bethpage-black-bot-config"]["Keys"]
+                ]
+            }
+        }
+        emails = [f"user{i}@test.com" for i in range(250)]
+        result = conn.get_user_configs(emails)
+
+        assert conn.dynamodb.batch_get_item.call_count == 3
+        assert set(result) == set(emails)
+
+    @patch("lambda_helpers.dynamo_db_batch.time.sleep")
+    def test_retries_unprocessed_keys(self, mock_sleep):
+        conn, _, _ = make_connection()
+        conn.dynamodb.batch_get_item.side_effect = [
+            {
+                "Responses": {"bethpage-black-bot-config": [{"id": "a@b.com"}]},
+                "UnprocessedKeys": {"bethpage-black-bot-config": {"Keys": [{"id": "c@d.com"}]}},
+            },
+            {"Responses": {"bethpage-black-bot-config": [{"id": "c@d.com"}]}},
+        ]
+        result = conn.get_user_configs(["a@b.com", "c@d.com"])
+
+        assert set(result) == {"a@b.com", "c@d.com"}
+        second_request = conn.dynamodb.batch_get_item.call_args_list[1][1]["RequestItems"]
+        assert second_request["bethpage-black-bot-config"]["Keys"] == [{"id": "c@d.com"}]
+
+    def test_missing_users_omitted(self):
+        conn, _, _ = make_connection()
+        conn.dynamodb.batch_get_item.return_value = {"Responses": {"bethpage-black-bot-config": []}}
+        assert conn.get_user_configs(["a@b.com"]) == {}
+
+
+class TestConfigCache:
+    def setup_method(self):
+        from lambda_helpers.dynamo_db_connection import DynamoDBConnection
+        DynamoDBConnection._config_cache = {"version": None, "emails": None, "configs": None, "loaded_at": 0.0}
+
+    def teardown_method(self):
+        self.setup_method()
+
+    def make_versioned_connection(self, version):
+        conn, _, mock_config = make_connection()
+        items = {
+            "config-version": {"id": "config-version", "version": version},
+            "all-emails": {"id": "all-emails", "emails": ["a@b.com"]},
+        }
+        mock_config.get_item.side_effect = lambda Key: (
+            {"Item": items[Key["id"]]} if Key["id"] in items else {}
+        )
+        conn.dynamodb.batch_get_item.return_value = {
+            "Responses": {"bethpage-black-bot-config": [{"id": "a@b.com", "min_players": 3}]}
+        }
+        return conn
+
+    def test_warm_start_reuses_configs(self):
+        self.make_versioned_connection(4).get_all_emails_and_configs()
+        conn = self.make_versioned_connection(4)
+        emails, configs = conn.get_all_emails_and_configs()
+
+        assert emails == ["a@b.com"]
+        assert configs["a@b.com"]["min_players"] == 3
+        conn.dynamodb.batch_get_item.assert_not_called()
+
+    def test_version_change_reloads(self):
+        self.make_versioned_connection(4).get_all_emails_and_configs()
+        conn = self.make_versioned_connection(5)
+        conn.get_all_emails_and_configs()
+        conn.dynamodb.batch_get_item.assert_called_once()
+
+    def test_stale_cache_reloads_without_version_bump(self):
+        # e.g. a config edited in the console, which never bumps the version
+        from lambda_helpers.dynamo_db_connection import DynamoDBConnection
+        self.make_versioned_connection(4).get_all_emails_and_configs()
+        DynamoDBConnection._config_cache["loaded_at"] -= 3600
+        conn = self.make_versioned_connection(4)
+        conn.get_all_emails_and_configs(max_age=900)
+        conn.dynamodb.batch_get_item.assert_called_once()
+
+    def test_writes_bump_version(self):
+        conn, _, mock_config = make_connection()
+        conn.create_or_update_user_config("a@b.com", {"min_players": 3})
+        update_kwargs = mock_config.update_item.call_args[1]
+        assert update_kwargs["Key"] == {"id": "config-version"}
+        assert update_kwargs["UpdateExpression"] == "ADD #version :one"
+
+    def test_add_email_bumps_version(self):
+        conn, _, mock_config = make_connection()
+        mock_config.get_item.return_value = {"Item": {"id": "all-emails", "emails": []}}
+        conn.add_email_to_all_emails_list("new@test.com")
+        mock_config.update_item.assert_called_once()
+
+
+class TestSeenTeeTimeKeys:
+    def test_update_writes_compact_lists_by_date(self):
+        conn, mock_table, _ = make_connection()
+        conn.update_seen_tee_time_keys({("Sat", "8:00am", 4, 18), ("Sun", "9:00am", 2, 18)})
+        item = mock_table.put_item.call_args[1]["Item"]
+        assert item["id"] == "available-times-by-day"
+        assert item["Sat"] == ["8:00am|4|18"]
+        assert item["Sun"] == ["9:00am|2|18"]
+
+    def test_get_reads_compact_and_legacy_items(self):
+        from datetime import datetime
+        conn, mock_table, _ = make_connection()
+        mock_table.get_item.return_value = {"Item": {
+            "id": "available-times-by-day",
+            "last_reset_date": datetime.now().date().isoformat(),
+            "Sat": ["8:00am|4|18", {"Date": "Sat", "Time": "9:00am", "Players": "2", "Holes": "18"}],
+        }}
+        assert conn.get_seen_tee_time_keys() == {("Sat", "8:00am", 4, 18), ("Sat", "9:00am", 2, 18)}
+
+    def test_resets_on_new_day(self):
+        conn, mock_table, _ = make_connection()
+        mock_table.get_item.return_value = {"Item": {
+            "id": "available-times-by-day",
+            "last_reset_date": "2000-01-01",
+            "Sat": ["8:00am|4|18"],
+        }}
+        assert conn.get_seen_tee_time_keys() == set()
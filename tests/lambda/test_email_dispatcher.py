@@ -0,0 +1,280 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+
+from lambda_helpers.email_dispatcher import (
+    MAX_SEND_ATTEMPTS,
+    EmailDispatcher,
+    SendResult,
+    TokenBucket,
+    is_throttle_error,
+    summarize_failures,
+)
+
+
+def make_throttle_error():
+    return ClientError(
+        {"Error": {"Code": "Throttling", "Message": "Maximum sending rate exceeded."}}, "SendEmail"
+    )
+
+
+def make_dispatcher(sender=None, rate=1000, max_workers=4, bulk_send=False):
+    return EmailDispatcher(
+        sender or MagicMock(), rate=rate, max_workers=max_workers, bulk_send=bulk_send, sleep=MagicMock()
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket:
+    def test_burst_up_to_capacity_without_waiting(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=5, clock=clock, sleep=clock.sleep)
+        for _ in range(5):
+            bucket.acquire()
+        assert clock.now == 0.0
+
+    def test_waits_for_refill_once_empty(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=5, clock=clock, sleep=clock.sleep)
+        for _ in range(10):
+            bucket.acquire()
+        # 5 burst tokens, then 5 more at 5/second
+        assert abs(clock.now - 1.0) < 1e-9
+
+    def test_thread_safe(self):
+        bucket = TokenBucket(rate=0.001, capacity=100)
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(100)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert bucket.tokens < 1
+
+
+class TestIsThrottleError:
+    def test_throttling_code(self):
+        assert is_throttle_error(make_throttle_error())
+
+    def test_other_client_error(self):
+        error = ClientError({"Error": {"Code": "MessageRejected", "Message": "bad"}}, "SendEmail")
+        assert not is_throttle_error(error)
+
+    def test_non_client_error(self):
+        assert not is_throttle_error(RuntimeError("Throttling"))
+
+
+class TestEmailDispatcher:
+    def test_sends_to_every_recipient_in_order(self):
+        sender = MagicMock()
+        dispatcher = make_dispatcher(sender)
+        new_times = {f"u{i}@b.com": [{"Time": f"{i}am"}] for i in range(10)}
+
+        results = dispatcher.send_all(new_times, {"u3@b.com": "guid-3"})
+
+        assert [r.email for r in results] == list(new_times)
+        assert all(r.sent and r.attempts == 1 for r in results)
+        assert sender.send_email.call_count == 10
+        sender.send_email.assert_any_call("u3@b.com", [{"Time": "3am"}], pause_guid="guid-3")
+        sender.send_email.assert_any_call("u4@b.com", [{"Time": "4am"}], pause_guid=None)
+
+    def test_empty_input(self):
+        assert make_dispatcher().send_all({}) == []
+
+    def test_retries_throttled_send(self):
+        sender = MagicMock()
+        sender.send_email.side_effect = [make_throttle_error(), None]
+        dispatcher = make_dispatcher(sender)
+
+        results = dispatcher.send_all({"a@b.com": []})
+
+        assert results == [SendResult("a@b.com", True, 2)]
+        dispatcher.sleep.assert_called_once()
+
+    def test_gives_up_after_max_attempts(self):
+        sender = MagicMock()
+        sender.send_email.side_effect = make_throttle_error()
+
+        results = make_dispatcher(sender).send_all({"a@b.com": []})
+
+        assert not results[0].sent
+        assert results[0].attempts == MAX_SEND_ATTEMPTS
+        assert sender.send_email.call_count == MAX_SEND_ATTEMPTS
+
+    def test_non_throttle_error_not_retried(self):
+        sender = MagicMock()
+        sender.send_email.side_effect = [RuntimeError("rejected"), None]
+
+        results = make_dispatcher(sender, max_workers=1).send_all({"a@b.com": [], "c@d.com": []})
+
+        assert results[0] == SendResult("a@b.com", False, 1, "rejected")
+        assert results[1].sent
+
+    def test_every_send_takes_a_token(self):
+        dispatcher = make_dispatcher()
+        with patch.object(dispatcher.bucket, "acquire") as mock_acquire:
+            dispatcher.send_all({"a@b.com": [], "c@d.com": []})
+        assert mock_acquire.call_count == 2
+
+
+class TestSummarizeFailures:
+    def test_none_when_all_sent(self):
+        assert summarize_failures([SendResult("a@b.com", True, 1)]) is None
+
+    def test_lists_failed_recipients(self):
+        summary = summarize_failures([
+            SendResult("a@b.com", True, 1),
+            SendResult("c@d.com", False, 4, "Throttling"),
+        ])
+        assert "1 of 2" in summary
+        assert "c@d.com after 4 attempt(s): Throttling" in summary
+
+
+class StubSes:
+    """Local stand-in for the SES client: stores templates and records sends."""
+
+    def __init__(self, rejected=(), bulk_error=None, create_errors=()):
+        self.templates = {}
+        self.create_calls = 0
+        self.create_errors = list(create_errors)
+        self.bulk_calls = []
+        self.single_sends = []
+        self.rejected = set(rejected)
+        self.bulk_error = bulk_error
+        self.lock = threading.Lock()
+
+    def create_template(self, Template):
+        with self.lock:
+            self.create_calls += 1
+            if self.create_errors:
+                raise self.create_errors.pop(0)
+            if Template["TemplateName"] in self.templates:
+                raise ClientError({"Error": {"Code": "AlreadyExists", "Message": "exists"}}, "CreateTemplate")
+            self.templates[Template["TemplateName"]] = Template
+
+    def list_templates(self, **kwargs):
+        return {"TemplatesMetadata": []}
+
+    def send_bulk_templated_email(self, Source, Template, DefaultTemplateData, Destinations):
+        assert len(Destinations) <= 50
+        if Template not in self.templates:
+            raise ClientError({"Error": {"Code": "TemplateDoesNotExist", "Message": "gone"}}, "SendBulkTemplatedEmail")
+        if self.bulk_error:
+            raise self.bulk_error
+        with self.lock:
+            self.bulk_calls.append(Destinations)
+        return {"Status": [
+            {"Status": "MessageRejected", "Error": "rejected"}
+            if d["Destination"]["ToAddresses"][0] in self.rejected else {"Status": "Success", "MessageId": "m"}
+            for d in Destinations
+        ]}
+
+    def send_email(self, Source, Destination, Message):
+        with self.lock:
+            self.single_sends.append(Destination["ToAddresses"][0])
+
+
+def make_stub_sender(stub_ses):
+    with patch("lambda_helpers.email_sender.SecretHandler"), \
+         patch("lambda_helpers.email_sender.boto3") as mock_boto:
+        mock_boto.client.return_value = stub_ses
+        from lambda_helpers.email_sender import EmailSender
+        EmailSender._created_alert_templates.clear()
+        return EmailSender()
+
+
+SATURDAY_TIMES = [{"Date": "Saturday", "Time": "8:00am", "Players": "4", "Holes": "18"}]
+SUNDAY_TIMES = [{"Date": "Sunday", "Time": "9:00am", "Players": "4", "Holes": "18"}]
+
+
+class TestBulkSends:
+    def test_identical_payloads_share_bulk_calls(self):
+        ses = StubSes()
+        dispatcher = make_dispatcher(make_stub_sender(ses), bulk_send=True)
+        new_times = {f"u{i}@b.com": SATURDAY_TIMES for i in range(120)}
+        new_times["sunday@b.com"] = SUNDAY_TIMES
+        pause_guids = {email: f"guid-{email}" for email in new_times}
+
+        results = dispatcher.send_all(new_times, pause_guids)
+
+        assert all(r.sent for r in results)
+        assert [len(call) for call in ses.bulk_calls] == [50, 50, 20]
+        assert ses.single_sends == ["sunday@b.com"]
+        assert len(ses.templates) == 1
+        template = next(iter(ses.templates.values()))
+        assert "{{pause_url}}" in template["HtmlPart"]
+        first = ses.bulk_calls[0][0]
+        assert json.loads(first["ReplacementTemplateData"]) == {
+            "pause_url": "https://www.bethpage-black-bot.com/updateSettings/guid-u0@b.com"
+        }
+
+    def test_rejected_destinations_fall_back_to_single_send(self):
+        ses = StubSes(rejected={"u1@b.com"})
+        dispatcher = make_dispatcher(make_stub_sender(ses), bulk_send=True)
+
+        results = dispatcher.send_all({f"u{i}@b.com": SATURDAY_TIMES for i in range(3)})
+
+        assert all(r.sent for r in results)
+        assert ses.single_sends == ["u1@b.com"]
+
+    def test_failed_bulk_call_falls_back_to_single_sends(self):
+        error = ClientError({"Error": {"Code": "AccountSendingPausedException", "Message": "paused"}}, "SendBulkTemplatedEmail")
+        ses = StubSes(bulk_error=error)
+        dispatcher = make_dispatcher(make_stub_sender(ses), bulk_send=True)
+
+        results = dispatcher.send_all({"a@b.com": SATURDAY_TIMES, "c@d.com": SATURDAY_TIMES})
+
+        assert all(r.sent for r in results)
+        assert sorted(ses.single_sends) == ["a@b.com", "c@d.com"]
+
+    def test_bulk_disabled_sends_individually(self):
+        ses = StubSes()
+        dispatcher = make_dispatcher(make_stub_sender(ses), bulk_send=False)
+
+        dispatcher.send_all({"a@b.com": SATURDAY_TIMES, "c@d.com": SATURDAY_TIMES})
+
+        assert ses.bulk_calls == []
+        assert len(ses.single_sends) == 2
+
+    def test_bulk_destinations_take_a_token_each(self):
+        dispatcher = make_dispatcher(make_stub_sender(StubSes()), bulk_send=True)
+        with patch.object(dispatcher.bucket, "acquire") as mock_acquire:
+            dispatcher.send_all({f"u{i}@b.com": SATURDAY_TIMES for i in range(5)})
+        assert mock_acquire.call_count == 5
+
+    def test_template_pruned_by_another_container_is_recreated(self):
+        ses = StubSes()
+        sender = make_stub_sender(ses)
+        dispatcher = make_dispatcher(sender, bulk_send=True)
+        recipients = {f"u{i}@b.com": SATURDAY_TIMES for i in range(3)}
+        dispatcher.send_all(recipients)
+
+        # Still cached here, but deleted from SES by another container's prune
+        ses.templates.clear()
+        results = dispatcher.send_all(recipients)
+
+        assert all(r.sent for r in results)
+        assert ses.single_sends == []
+        assert len(ses.bulk_calls) == 2
+        assert ses.create_calls == 2
+
+    def test_throttled_template_creation_takes_no_send_tokens(self):
+        ses = StubSes(create_errors=[make_throttle_error(), make_throttle_error()])
+        dispatcher = make_dispatcher(make_stub_sender(ses), bulk_send=True)
+        with patch.object(dispatcher.bucket, "acquire") as mock_acquire:
+            results = dispatcher.send_all({f"u{i}@b.com": SATURDAY_TIMES for i in range(5)})
+
+        assert all(r.sent for r in results)
+        assert ses.create_calls == 3
+        assert len(ses.bulk_calls) == 1
+        assert mock_acquire.call_count == 5
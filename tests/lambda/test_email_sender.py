@@ -57,6 +57,17 @@ class TestSendEmail:
         assert "Book on Bethpage" in html
 
 
+    def test_pause_link_per_recipient(self):
+        sender, mock_ses = make_sender()
+        times = [{"Date": "Saturday", "Time": "8:00am", "Players": "2", "Holes": "18"}]
+        sender.send_email("a@test.com", times, pause_guid="guid-a")
+        sender.send_email("b@test.com", times, pause_guid="guid-b")
+        first, second = [c[1]["Message"]["Body"]["Html"]["Data"] for c in mock_ses.send_email.call_args_list]
+        assert "/updateSettings/guid-a" in first and "guid-b" not in first
+        assert "/updateSettings/guid-b" in second
+        assert "{{pause_url}}" not in second
+
+
 class TestSendErrorEmail:
     def test_sends_plain_text(self):
         sender, mock_ses = make_sender()
@@ -88,3 +99,37 @@ class TestSendOneTimeLinkEmail:
         call_kwargs = mock_ses.send_email.call_args
         html = call_kwargs[1]["Message"]["Body"]["Html"]["Data"]
         assert "guid-123" in html
+
+
+class TestAlertTemplates:
+    def test_ensure_alert_template_creates_once(self):
+        sender, mock_ses = make_sender()
+        sender._created_alert_templates.clear()
+        times = [{"Date": "Saturday", "Time": "8:00am", "Players": "2", "Holes": "18"}]
+        first = sender.ensure_alert_template(times)
+        second = sender.ensure_alert_template(times)
+        assert first == second
+        assert first.startswith("bethpage-alert-")
+        mock_ses.create_template.assert_called_once()
+
+    def test_ensure_alert_template_tolerates_existing(self):
+        from botocore.exceptions import ClientError
+        sender, mock_ses = make_sender()
+        sender._created_alert_templates.clear()
+        mock_ses.create_template.side_effect = ClientError(
+            {"Error": {"Code": "AlreadyExists", "Message": "exists"}}, "CreateTemplate"
+        )
+        times = [{"Date": "Sunday", "Time": "8:00am", "Players": "2", "Holes": "18"}]
+        assert sender.ensure_alert_template(times).startswith("bethpage-alert-")
+
+    def test_prune_deletes_only_old_alert_templates(self):
+        from datetime import datetime, timedelta, timezone
+        sender, mock_ses = make_sender()
+        now = datetime.now(timezone.utc)
+        mock_ses.list_templates.return_value = {"TemplatesMetadata": [
+            {"Name": "bethpage-alert-old", "CreatedTimestamp": now - timedelta(days=3)},
+            {"Name": "bethpage-alert-new", "CreatedTimestamp": now},
+            {"Name": "other-template", "CreatedTimestamp": now - timedelta(days=30)},
+        ]}
+        assert sender.prune_alert_templates() == 1
+        mock_ses.delete_template.assert_called_once_with(TemplateName="bethpage-alert-old")
@@ -0,0 +1,59 @@
+from unittest.mock import patch
+
+from lambda_helpers.email_templates import (
+    PAUSE_URL_PLACEHOLDER,
+    RENDERED_ALERTS_KEPT,
+    TeeTimeAlertTemplates,
+    alert_fingerprint,
+    render_alert_template,
+)
+
+TIMES = [
+    {"Date": "Saturday", "Time": "8:00am", "Players": "3", "Holes": "18"},
+    {"Date": "Saturday", "Time": "9:00am", "Players": "2", "Holes": "18"},
+]
+
+
+def setup_function():
+    TeeTimeAlertTemplates.clear()
+
+
+class TestAlertFingerprint:
+    def test_same_times_same_fingerprint(self):
+        assert alert_fingerprint(TIMES) == alert_fingerprint([dict(t) for t in TIMES])
+
+    def test_order_matters(self):
+        assert alert_fingerprint(TIMES) != alert_fingerprint(list(reversed(TIMES)))
+
+
+class TestRenderAlertTemplate:
+    def test_pause_placeholder_only_when_requested(self):
+        assert PAUSE_URL_PLACEHOLDER in render_alert_template(TIMES, with_pause_link=True)
+        assert PAUSE_URL_PLACEHOLDER not in render_alert_template(TIMES, with_pause_link=False)
+
+    def test_rowspan_per_date(self):
+        html = render_alert_template(TIMES, with_pause_link=False)
+        assert "rowspan='2'>Saturday" in html
+
+
+class TestTeeTimeAlertTemplates:
+    def test_renders_each_time_set_once(self):
+        with patch(
+            "lambda_helpers.email_templates.render_alert_template", wraps=render_alert_template
+        ) as mock_render:
+            first = TeeTimeAlertTemplates.render(TIMES, "guid-1")
+            second = TeeTimeAlertTemplates.render([dict(t) for t in TIMES], "guid-2")
+        assert mock_render.call_count == 1
+        assert "/updateSettings/guid-1" in first
+        assert "/updateSettings/guid-2" in second
+        assert first.replace("guid-1", "guid-2") == second
+
+    def test_without_pause_guid_has_no_pause_link(self):
+        html = TeeTimeAlertTemplates.render(TIMES)
+        assert "Pause notifications" not in html
+        assert PAUSE_URL_PLACEHOLDER not in html
+
+    def test_cache_is_bounded(self):
+        for i in range(RENDERED_ALERTS_KEPT + 5):
+            TeeTimeAlertTemplates.render([{"Date": "Sat", "Time": f"{i}", "Players": 2, "Holes": 18}], "g")
+        assert len(TeeTimeAlertTemplates._rendered) == RENDERED_ALERTS_KEPT
@@ -0,0 +1,181 @@
+import json
+import threading
+import time as time_module
+from datetime import date, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+import pytest
+from lambda_helpers.foreup_api_client import ForeUpApiClient, ForeUpApiError
+from lambda_helpers.tee_time import TeeTime
+
+# Responses recorded from the foreUP booking backend, trimmed to the fields we read
+RECORDED_TIMES = {
+    "05-30-2026": [
+        {"time": "2026-05-30 08:10", "available_spots": 4, "holes": 18, "schedule_id": 2431},
+        {"time": "2026-05-30 13:40", "available_spots": 2, "holes": "9/18", "schedule_id": 2431},
+    ],
+    "05-31-2026": [
+        {"time": "2026-05-31 07:00", "available_spots": 1, "holes": 9, "schedule_id": 2431},
+    ],
+}
+
+
+class StubForeUpHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+    failures_remaining = {}  # {date param: number of 500s to return first}
+    error_bodies = {}  # {date param: payload returned with a 200 instead of the times}
+    response_delay_seconds = 0
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode())
+        if urlparse(self.path).path != "/api/booking/users/login":
+            return self.send_json(404, {})
+        if form.get("password") != ["right-password"]:
+            return self.send_json(401, {"success": False})
+        self.send_json(200, {"jwt": "stub-token"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        StubForeUpHandler.requests_seen.append((url.path, self.headers.get("X-Authorization")))
+        if url.path != "/api/booking/times":
+            return self.send_json(404, {})
+        if self.headers.get("X-Authorization") != "Bearer stub-token":
+            return self.send_json(401, {"success": False})
+        day = parse_qs(url.query)["date"][0]
+        with StubForeUpHandler.lock:
+            StubForeUpHandler.in_flight += 1
+            StubForeUpHandler.max_in_flight = max(StubForeUpHandler.max_in_flight, StubForeUpHandler.in_flight)
+            should_fail = StubForeUpHandler.failures_remaining.get(day, 0) > 0
+            if should_fail:
+                StubForeUpHandler.failures_remaining[day] -= 1
+        time_module.sleep(StubForeUpHandler.response_delay_seconds)
+        with StubForeUpHandler.lock:
+            StubForeUpHandler.in_flight -= 1
+        if should_fail:
+            return self.send_json(500, {"error": "try again"})
+        if day in StubForeUpHandler.error_bodies:
+            return self.send_json(200, StubForeUpHandler.error_bodies[day])
+        self.send_json(200, RECORDED_TIMES.get(day, False))
+
+
+@pytest.fixture
+def stub_server():
+    StubForeUpHandler.requests_seen = []
+    StubForeUpHandler.failures_remaining = {}
+    StubForeUpHandler.error_bodies = {}
+    StubForeUpHandler.response_delay_seconds = 0
+    StubForeUpHandler.max_in_flight = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubForeUpHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(base_url, password="right-password"):
+    return ForeUpApiClient("user@test.com", password, base_url=base_url, booking_class_id="1234")
+
+
+class TestForeUpApiClient:
+    def test_fetches_and_parses_every_date(self, stub_server):
+        client = make_client(stub_server)
+        tee_times = client.get_tee_time_data(dates=[date(2026, 5, 30), date(2026, 5, 31), date(2026, 6, 1)])
+
+        assert [t.to_dict() for t in tee_times] == [
+            {"Date": "Saturday May 30th", "Time": "8:10am", "Players": 4, "Holes": 18},
+            {"Date": "Saturday May 30th", "Time": "1:40pm", "Players": 2, "Holes": 18},
+            {"Date": "Sunday May 31st", "Time": "7:00am", "Players": 1, "Holes": 9},
+        ]
+        assert tee_times[1].time == time(13, 40)
+
+    def test_nine_or_eighteen_slot_matches_selenium_parse(self):
+        client = make_client("http://unused")
+        from_api = client.parse_time_slot({"time": "2026-05-30 13:40", "available_spots": 2, "holes": "9/18"})
+        from_page = TeeTime.from_labels("Saturday May 30th", "1:40pm", "2", "9/18", year=2026)
+        assert from_api.key == from_page.key == ("Saturday May 30th", "1:40pm", 2, 18)
+
+    def test_requests_are_authorized(self, stub_server):
+        make_client(stub_server).get_tee_time_data(dates=[date(2026, 5, 30)])
+        assert StubForeUpHandler.requests_seen == [("/api/booking/times", "Bearer stub-token")]
+
+    def test_days_fetched_concurrently_and_merged_in_date_order(self, stub_server):
+        StubForeUpHandler.response_delay_seconds = 0.1
+        client = make_client(stub_server)
+        dates = [date(2026, 5, 31), date(2026, 6, 1), date(2026, 5, 30), date(2026, 6, 2)]
+        tee_times = client.get_tee_time_data(dates=dates)
+
+        assert StubForeUpHandler.max_in_flight > 1
+        assert StubForeUpHandler.max_in_flight <= client.max_workers
+        assert [t.date for t in tee_times] == [date(2026, 5, 30), date(2026, 5, 30), date(2026, 5, 31)]
+
+    @patch("lambda_helpers.foreup_api_client.time.sleep")
+    def test_failed_day_is_retried(self, mock_sleep, stub_server):
+        StubForeUpHandler.failures_remaining = {"05-30-2026": 2}
+        tee_times = make_client(stub_server).get_tee_time_data(dates=[date(2026, 5, 30)])
+        assert len(tee_times) == 2
+
+    @patch("lambda_helpers.foreup_api_client.time.sleep")
+    def test_day_failing_every_attempt_raises(self, mock_sleep, stub_server):
+        StubForeUpHandler.failures_remaining = {"05-30-2026": 10}
+        with pytest.raises(ForeUpApiError):
+            make_client(stub_server).get_tee_time_data(dates=[date(2026, 5, 30), date(2026, 5, 31)])
+
+    def test_unbookable_day_is_empty(self, stub_server):
+        StubForeUpHandler.error_bodies = {"05-31-2026": []}
+        tee_times = make_client(stub_server).get_tee_time_data(
+            dates=[date(2026, 5, 30), date(2026, 5, 31), date(2026, 6, 1)]
+        )
+        assert [t.date for t in tee_times] == [date(2026, 5, 30), date(2026, 5, 30)]
+
+    @patch("lambda_helpers.foreup_api_client.time.sleep")
+    def test_error_object_with_200_raises(self, mock_sleep, stub_server):
+        StubForeUpHandler.error_bodies = {"05-31-2026": {"success": False, "msg": "Invalid api key"}}
+        with pytest.raises(ForeUpApiError, match="Invalid api key"):
+            make_client(stub_server).get_tee_time_data(dates=[date(2026, 5, 30), date(2026, 5, 31)])
+
+    def test_bad_login_raises(self, stub_server):
+        with pytest.raises(ForeUpApiError):
+            make_client(stub_server, password="wrong").get_tee_time_data(dates=[date(2026, 5, 30)])
+
+    def test_missing_booking_class_raises(self, stub_server):
+        client = ForeUpApiClient("user@test.com", "right-password", base_url=stub_server, booking_class_id="")
+        with pytest.raises(ForeUpApiError):
+            client.get_tee_time_data()
+
+
+class TestWebScraperHttpMode:
+    @patch("lambda_helpers.web_scraper.ForeUpApiClient")
+    def test_http_mode_skips_selenium(self, mock_client_cls):
+        from lambda_helpers.web_scraper import WebScraper
+        mock_client_cls.return_value.get_tee_time_data.return_value = ["tee time"]
+        scraper = WebScraper("user", "pass", scrape_mode="http")
+
+        with patch.object(scraper, "get_tee_time_data_with_selenium") as mock_selenium:
+            assert scraper.get_tee_time_data() == ["tee time"]
+        mock_selenium.assert_not_called()
+
+    @patch("lambda_helpers.web_scraper.ForeUpApiClient")
+    def test_http_failure_falls_back_to_selenium(self, mock_client_cls):
+        from lambda_helpers.web_scraper import WebScraper
+        mock_client_cls.return_value.get_tee_time_data.side_effect = ForeUpApiError("boom")
+        scraper = WebScraper("user", "pass", scrape_mode="http")
+
+        with patch.object(scraper, "get_tee_time_data_with_selenium", return_value=["from chrome"]):
+            assert scraper.get_tee_time_data() == ["from chrome"]
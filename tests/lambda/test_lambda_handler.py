@@ -1,17 +1,25 @@
+import json
+import os
+import subprocess
+import sys
 from unittest.mock import patch, MagicMock
 
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "lambda")
+
 
 class TestLambdaHandler:
-    @patch("main.OneTimeLinkHandler")
-    @patch("main.BethpageBlackBot")
+    @patch("lambda_helpers.one_time_link_handler.OneTimeLinkHandler")
+    @patch("bethpage_black_bot.BethpageBlackBot")
     @patch("main.ApiGatewayHandler")
     def test_scheduled_event(self, mock_api_cls, mock_bot_cls, mock_otlh_cls):
         from main import lambda_handler
 
-        mock_api_cls.return_value.format_api_response.return_value = {"statusCode": 200, "body": "ok"}
+        mock_api_cls.format_api_response.return_value = {"statusCode": 200, "body": "ok"}
         result = lambda_handler({}, None)
+        mock_api_cls.assert_not_called()
         mock_bot_cls.return_value.notify_if_new_tee_times.assert_called_once()
-        mock_otlh_cls.return_value.remove_old_one_time_links.assert_called_once()
+        # Expired links are left to DynamoDB TTL rather than scanned for each run
+        mock_otlh_cls.return_value.remove_old_one_time_links.assert_not_called()
         assert result["statusCode"] == 200
 
     @patch("main.ApiGatewayHandler")
@@ -23,3 +31,15 @@ class TestLambdaHandler:
         result = lambda_handler(event, None)
         mock_api_cls.return_value.handle.assert_called_once_with(event)
         assert result["statusCode"] == 200
+
+    def test_api_event_does_not_load_scraping_stack(self):
+        script = (
+            "import json, sys, main\n"
+            "main.lambda_handler({'routeKey': 'GET /getRecentTimes', 'headers': {'origin': 'https://evil.com'}}, None)\n"
+            "print(json.dumps([m for m in ('selenium', 'astral', 'holidays', 'bethpage_black_bot') if m in sys.modules]))\n"
+        )
+        env = dict(os.environ, AWS_DEFAULT_REGION="us-east-1")
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=LAMBDA_DIR, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        assert json.loads(output.strip().splitlines()[-1]) == []
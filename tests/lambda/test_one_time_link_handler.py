@@ -1,3 +1,4 @@
+from decimal import Decimal
 from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, MagicMock
 from freezegun import freeze_time
@@ -26,6 +27,13 @@ class TestGenerateOneTimeLink:
         # UUID4 has 36 characters with hyphens
         assert len(link["id"]) == 36
 
+    @freeze_time("2026-06-01T12:00:00+00:00")
+    def test_expire_at_is_epoch_seconds(self):
+        h, _ = make_handler()
+        link = h.generate_one_time_link("test@example.com")
+        assert link["expire_at"] == int(datetime(2026, 6, 1, 13, tzinfo=timezone.utc).timestamp())
+        assert datetime.fromisoformat(link["expire_time"]).timestamp() == link["expire_at"]
+
     def test_expire_time_is_future(self):
         h, _ = make_handler()
         link = h.generate_one_time_link("test@example.com")
@@ -50,6 +58,22 @@ class TestIsOneTimeLinkValid:
         assert valid is False
         assert "expired" in msg.lower()
 
+    def test_expire_at_preferred_over_iso(self):
+        h, _ = make_handler()
+        future = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+        past_epoch = Decimal(int((datetime.now(timezone.utc) - timedelta(hours=1)).timestamp()))
+        item = {"expire_time": future, "expire_at": past_epoch, "email": "test@example.com"}
+        valid, msg = h.is_one_time_link_valid(item)
+        assert valid is False
+        assert "expired" in msg.lower()
+
+    def test_valid_expire_at_without_iso(self):
+        h, _ = make_handler()
+        future_epoch = Decimal(int((datetime.now(timezone.utc) + timedelta(hours=1)).timestamp()))
+        valid, email = h.is_one_time_link_valid({"expire_at": future_epoch, "email": "test@example.com"})
+        assert valid is True
+        assert email == "test@example.com"
+
     def test_missing_expire_time(self):
         h, _ = make_handler()
         item = {"email": "test@example.com"}
@@ -57,6 +81,55 @@ class TestIsOneTimeLinkValid:
         assert valid is False
 
 
+class TestGenerateAndStoreLinks:
+    def test_writes_in_chunks_of_25(self):
+        h, _ = make_handler()
+        h.dynamodb.batch_write_item.return_value = {"UnprocessedItems": {}}
+        emails = [f"u{i}@b.com" for i in range(60)]
+
+        guids = h.generate_and_store_links(emails, is_pause=True)
+
+        assert list(guids) == emails
+        assert len(set(guids.values())) == 60
+        chunks = [
+            call[1]["RequestItems"]["bethpage-black-bot-one-time-links"]
+            for call in h.dynamodb.batch_write_item.call_args_list
+        ]
+        assert [len(chunk) for chunk in chunks] == [25, 25, 10]
+        first_item = chunks[0][0]["PutRequest"]["Item"]
+        assert first_item["pause"] is True
+        assert first_item["id"] == guids[first_item["email"]]
+
+    @patch("lambda_helpers.dynamo_db_batch.time.sleep")
+    def test_retries_unprocessed_items(self, mock_sleep):
+        h, mock_table = make_handler()
+        h.dynamodb.batch_write_item.side_effect = lambda RequestItems: (
+            {"UnprocessedItems": RequestItems} if h.dynamodb.batch_write_item.call_count == 1
+            else {"UnprocessedItems": {}}
+        )
+
+        h.generate_and_store_links(["a@b.com", "c@d.com"])
+
+        assert h.dynamodb.batch_write_item.call_count == 2
+        mock_sleep.assert_called_once()
+        mock_table.put_item.assert_not_called()
+
+    @patch("lambda_helpers.dynamo_db_batch.time.sleep")
+    def test_falls_back_to_put_item(self, mock_sleep):
+        h, mock_table = make_handler()
+        h.dynamodb.batch_write_item.side_effect = lambda RequestItems: {"UnprocessedItems": RequestItems}
+
+        guids = h.generate_and_store_links(["a@b.com"])
+
+        mock_table.put_item.assert_called_once()
+        assert mock_table.put_item.call_args[1]["Item"]["id"] == guids["a@b.com"]
+
+    def test_empty_list(self):
+        h, _ = make_handler()
+        assert h.generate_and_store_links([]) == {}
+        h.dynamodb.batch_write_item.assert_not_called()
+
+
 class TestValidateOneTimeLinkAndGetEmail:
     def test_item_exists_and_valid(self):
         h, mock_table = make_handler()
@@ -95,6 +168,7 @@ class TestOneTimeLinkToStr:
 class TestRemoveOldOneTimeLinks:
     def test_removes_expired_keeps_valid(self):
         h, mock_table = make_handler()
+        h.dynamodb.batch_write_item.return_value = {"UnprocessedItems": {}}
         future = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
         past = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
 
@@ -105,7 +179,40 @@ class TestRemoveOldOneTimeLinks:
             ]
         }
 
+        removed, backfilled = h.remove_old_one_time_links()
+
+        # Should delete only the expired one, in a batch
+        assert (removed, backfilled) == (1, 1)
+        h.dynamodb.batch_write_item.assert_called_once_with(RequestItems={
+            "bethpage-black-bot-one-time-links": [{"DeleteRequest": {"Key": {"id": "expired"}}}]
+        })
+        mock_table.delete_item.assert_not_called()
+
+    @freeze_time("2026-06-01T12:00:00+00:00")
+    def test_backfills_expire_at_on_live_legacy_links(self):
+        h, mock_table = make_handler()
+        mock_table.scan.return_value = {
+            "Items": [{"id": "legacy", "email": "a@b.com", "expire_time": "2026-06-01T13:00:00+00:00"}]
+        }
+
+        h.remove_old_one_time_links()
+
+        update = mock_table.update_item.call_args[1]
+        assert update["Key"] == {"id": "legacy"}
+        assert update["ExpressionAttributeValues"] == {
+            ":expire_at": int(datetime(2026, 6, 1, 13, tzinfo=timezone.utc).timestamp())
+        }
+        h.dynamodb.batch_write_item.assert_not_called()
+
+    def test_scan_filters_to_expired_or_legacy_and_paginates(self):
+        h, mock_table = make_handler()
+        mock_table.scan.side_effect = [
+            {"Items": [], "LastEvaluatedKey": {"id": "x"}},
+            {"Items": []},
+        ]
+
         h.remove_old_one_time_links()
 
-        # Should delete only the expired one
-        mock_table.delete_item.assert_called_once_with(Key={"id": "expired"})
+        assert mock_table.scan.call_count == 2
+        assert "FilterExpression" in mock_table.scan.call_args_list[0][1]
+        assert mock_table.scan.call_args_list[1][1]["ExclusiveStartKey"] == {"id": "x"}
@@ -0,0 +1,130 @@
+import pytest
+from unittest.mock import MagicMock
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from lambda_helpers import page_waits
+from lambda_helpers.page_waits import (
+    AdaptiveTimeouts,
+    DayIsActive,
+    DayReplaced,
+    SelectHasOptions,
+    TilesSettled,
+    wait_for,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_timeouts():
+    AdaptiveTimeouts.reset()
+    yield
+    AdaptiveTimeouts.reset()
+
+
+def make_driver(tile_counts, header_shown=False):
+    """Driver whose tile list returns each count in turn, then repeats the last one."""
+    driver = MagicMock()
+    counts = list(tile_counts)
+
+    def find_elements(by, selector):
+        if by == By.XPATH:
+            return [MagicMock()] if header_shown else []
+        count = counts.pop(0) if len(counts) > 1 else counts[0]
+        return [MagicMock() for _ in range(count)]
+
+    driver.find_elements.side_effect = find_elements
+    return driver
+
+
+class TestTilesSettled:
+    def test_waits_for_count_to_stop_changing(self):
+        condition = TilesSettled()
+        driver = make_driver([2, 5, 5])
+        assert condition(driver) is False
+        assert condition(driver) is False
+        assert condition(driver) is True
+        assert len(condition.tiles) == 5
+
+    def test_no_times_header_settles_immediately(self):
+        condition = TilesSettled()
+        assert condition(make_driver([0], header_shown=True)) is True
+        assert condition.tiles == []
+
+    def test_empty_list_without_header_keeps_waiting(self):
+        assert TilesSettled()(make_driver([0])) is False
+
+
+class TestSelectHasOptions:
+    def test_returns_element_once_options_have_text(self):
+        driver = MagicMock()
+        select = driver.find_element.return_value
+        select.find_elements.return_value = [MagicMock(text=" "), MagicMock(text="Bethpage Black Course")]
+        assert SelectHasOptions((By.ID, "schedule_select"))(driver) is select
+
+    def test_empty_options_keep_waiting(self):
+        driver = MagicMock()
+        driver.find_element.return_value.find_elements.return_value = []
+        assert SelectHasOptions((By.ID, "schedule_select"))(driver) is False
+
+
+class TestAdaptiveTimeouts:
+    def test_unknown_step_uses_max(self):
+        assert AdaptiveTimeouts.get("login form") == page_waits.MAX_TIMEOUT_SECONDS
+
+    def test_scales_with_slowest_recent_wait(self):
+        AdaptiveTimeouts.record("login form", 0.5)
+        AdaptiveTimeouts.record("login form", 1.5)
+        assert AdaptiveTimeouts.get("login form") == 4.5
+
+    def test_clamped_to_bounds(self):
+        AdaptiveTimeouts.record("fast", 0.01)
+        AdaptiveTimeouts.record("slow", 30)
+        assert AdaptiveTimeouts.get("fast") == page_waits.MIN_TIMEOUT_SECONDS
+        assert AdaptiveTimeouts.get("slow") == page_waits.MAX_TIMEOUT_SECONDS
+        assert AdaptiveTimeouts.get("slow", max_timeout=2) == 2
+
+    def test_wait_for_records_duration(self):
+        wait_for(MagicMock(), "ready", lambda driver: True)
+        assert len(AdaptiveTimeouts._recent_waits["ready"]) == 1
+
+    def test_timeout_records_full_timeout(self):
+        with pytest.raises(TimeoutException):
+            wait_for(MagicMock(), "never", lambda driver: False, max_timeout=0.2)
+        assert list(AdaptiveTimeouts._recent_waits["never"]) == [0.2]
+
+
+class TestDayIsActive:
+    def test_matches_selected_day_text(self):
+        driver = MagicMock()
+        cell = MagicMock(text=" 31 ")
+        driver.find_elements.return_value = [cell]
+        assert DayIsActive("31")(driver) is cell
+        assert DayIsActive("30")(driver) is False
+
+    def test_no_active_cell_keeps_waiting(self):
+        driver = MagicMock()
+        driver.find_elements.return_value = []
+        assert DayIsActive("31")(driver) is False
+
+
+class TestDayReplaced:
+    def test_stale_marker_means_replaced(self):
+        marker = MagicMock()
+        marker.is_enabled.side_effect = StaleElementReferenceException()
+        driver = MagicMock()
+        driver.execute_script.return_value = "8:00am"
+        assert DayReplaced(marker, "8:00am")(driver) is True
+
+    def test_list_updated_in_place_means_replaced(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = "9:10am"
+        assert DayReplaced(MagicMock(), "8:00am")(driver) is True
+
+    def test_previous_days_tiles_keep_waiting(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = "8:00am"
+        assert DayReplaced(MagicMock(), "8:00am")(driver) is False
+
+    def test_times_appearing_after_empty_day_means_replaced(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = "8:00am"
+        assert DayReplaced(MagicMock(), "")(driver) is True
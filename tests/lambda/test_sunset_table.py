@@ -0,0 +1,40 @@
+from datetime import date
+from unittest.mock import patch
+from lambda_helpers.sunset_table import SunsetTable
+
+
+def reset_cache(precomputed=None):
+    SunsetTable._sunset_cache = {}
+    SunsetTable._precomputed = precomputed
+
+
+class TestGetSunset:
+    def setup_method(self):
+        reset_cache()
+
+    def teardown_method(self):
+        reset_cache()
+
+    def test_computed_once_per_date(self):
+        reset_cache(precomputed={})
+        with patch.object(SunsetTable, "compute_sunset", wraps=SunsetTable.compute_sunset) as mock_compute:
+            for _ in range(5):
+                SunsetTable.get_sunset(date(2026, 6, 20))
+            SunsetTable.get_sunset(date(2026, 6, 21))
+        assert mock_compute.call_count == 2
+
+    def test_precomputed_table_skips_astral(self):
+        reset_cache(precomputed={"2026-06-20": "2026-06-20T20:30:00-04:00"})
+        with patch.object(SunsetTable, "compute_sunset") as mock_compute:
+            sunset = SunsetTable.get_sunset(date(2026, 6, 20))
+        mock_compute.assert_not_called()
+        assert (sunset.hour, sunset.minute) == (20, 30)
+
+    def test_shipped_table_matches_astral(self):
+        sunset = SunsetTable.get_sunset(date(2026, 6, 21))
+        assert sunset == SunsetTable.compute_sunset(date(2026, 6, 21))
+
+    def test_missing_table_falls_back_to_astral(self):
+        with patch("lambda_helpers.sunset_table.SUNSET_TABLE_PATH", "/nonexistent/sunset_table.json"):
+            sunset = SunsetTable.get_sunset(date(2026, 6, 21))
+        assert sunset == SunsetTable.compute_sunset(date(2026, 6, 21))
@@ -0,0 +1,98 @@
+from datetime import date, time
+from decimal import Decimal
+from lambda_helpers.tee_time import (
+    TeeTime,
+    build_seen_set,
+    decode_compact,
+    encode_compact,
+    fingerprint_tee_times,
+    tee_time_key,
+    tee_time_to_dict,
+)
+
+
+class TestTeeTimeKey:
+    def test_players_and_holes_normalized(self):
+        as_strings = {"Date": "Sat", "Time": "8:00am", "Players": "4", "Holes": "18"}
+        as_ints = {"Date": "Sat", "Time": "8:00am", "Players": 4, "Holes": 18}
+        from_dynamo = {"Date": "Sat", "Time": "8:00am", "Players": Decimal(4), "Holes": Decimal(18)}
+        assert tee_time_key(as_strings) == tee_time_key(as_ints) == tee_time_key(from_dynamo)
+
+    def test_nine_or_eighteen_counts_as_eighteen_holes(self):
+        key = tee_time_key({"Date": "Sat", "Time": "8:00am", "Players": "4", "Holes": "9/18"})
+        assert key == ("Sat", "8:00am", 4, 18)
+
+    def test_non_numeric_holes_kept_as_string(self):
+        key = tee_time_key({"Date": "Sat", "Time": "8:00am", "Players": "4", "Holes": "TBD"})
+        assert key == ("Sat", "8:00am", 4, "TBD")
+        assert tee_time_key({"Date": "Sat", "Time": "8:00am", "Players": "4", "Holes": "9/x"})[3] == "9/x"
+
+    def test_build_seen_set_dedupes(self):
+        times = [
+            {"Date": "Sat", "Time": "8:00am", "Players": "4", "Holes": "18"},
+            {"Date": "Sat", "Time": "8:00am", "Players": 4, "Holes": 18},
+        ]
+        assert len(build_seen_set(times)) == 1
+
+
+class TestCompactEncoding:
+    def test_round_trip(self):
+        key = ("Saturday May 30th", "8:00am", 4, 18)
+        encoded = encode_compact(key)
+        assert encoded == "8:00am|4|18"
+        assert decode_compact("Saturday May 30th", encoded) == key
+
+    def test_decodes_legacy_dict(self):
+        legacy = {"Date": "Saturday May 30th", "Time": "8:00am", "Players": "4", "Holes": "18"}
+        assert decode_compact("Saturday May 30th", legacy) == ("Saturday May 30th", "8:00am", 4, 18)
+
+
+class TestFingerprint:
+    TIMES = [
+        {"Date": "Saturday May 30th", "Time": "8:00am", "Players": "4", "Holes": "18"},
+        {"Date": "Sunday May 31st", "Time": "9:00am", "Players": 2, "Holes": 18},
+    ]
+
+    def test_ignores_order_and_count_types(self):
+        reordered = [
+            {"Date": "Sunday May 31st", "Time": "9:00am", "Players": "2", "Holes": "18"},
+            {"Date": "Saturday May 30th", "Time": "8:00am", "Players": 4, "Holes": 18},
+        ]
+        assert fingerprint_tee_times(self.TIMES, "2026-05-28", 3) == fingerprint_tee_times(reordered, "2026-05-28", 3)
+
+    def test_changes_with_times_and_context(self):
+        base = fingerprint_tee_times(self.TIMES, "2026-05-28", 3)
+        assert fingerprint_tee_times(self.TIMES[:1], "2026-05-28", 3) != base
+        assert fingerprint_tee_times(self.TIMES, "2026-05-29", 3) != base
+        assert fingerprint_tee_times(self.TIMES, "2026-05-28", 4) != base
+
+
+class TestTeeTime:
+    def test_from_dict_parses_fields(self):
+        t = TeeTime.from_dict(
+            {"Date": "Saturday May 30th", "Time": "8:10am", "Players": "4", "Holes": "18"}, year=2026
+        )
+        assert t.date == date(2026, 5, 30)
+        assert t.time == time(8, 10)
+        assert t.players == 4
+        assert t.holes == 18
+        assert t.day_of_week == "Saturday"
+
+    def test_dict_round_trip(self):
+        original = {"Date": "Saturday May 30th", "Time": "8:10am", "Players": 4, "Holes": 18}
+        assert TeeTime.from_dict(original).to_dict() == original
+
+    def test_from_dynamodb_decimals(self):
+        item = {"Date": "Sunday May 31st", "Time": "1:00pm", "Players": Decimal(2), "Holes": Decimal(18)}
+        t = TeeTime.from_dict(item)
+        assert (t.players, t.holes) == (2, 18)
+        assert t.to_dynamodb_item()["Players"] == 2
+
+    def test_key_matches_dict_key(self):
+        as_dict = {"Date": "Saturday May 30th", "Time": "8:10am", "Players": "4", "Holes": "18"}
+        assert tee_time_key(TeeTime.from_dict(as_dict)) == tee_time_key(as_dict)
+
+    def test_to_dict_adapter_passes_dicts_through(self):
+        as_dict = {"Date": "Saturday May 30th", "Time": "8:10am", "Players": "4", "Holes": "18"}
+        assert tee_time_to_dict(as_dict) is as_dict
+        assert tee_time_to_dict(TeeTime.from_dict(as_dict))["Players"] == 4
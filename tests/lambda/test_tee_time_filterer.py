@@ -26,71 +26,105 @@ class TestParseDateString:
         assert date_obj.day == 1
 
 
-class TestIsPlayableDay:
+def matches(f, config, date_label, time_label, players="4", holes="18", last_out_of_state_date=date.max):
+    """Run one slot through tee_time_matches_filter, the check production uses."""
+    from lambda_helpers.compiled_user_filter import CompiledUserFilter
+    from lambda_helpers.tee_time import TeeTime
+    slot = f.parse_tee_time(TeeTime.from_labels(date_label, time_label, players, holes, year=2026))
+    return f.tee_time_matches_filter(CompiledUserFilter.from_config(config), slot, last_out_of_state_date)
+
+
+class TestPlayableDay:
     def setup_method(self):
         self.f = make_filterer()
 
     def test_matching_day_of_week(self):
         config = BethpageBlackBotConfig({"playable_days_of_week": ["Saturday"]})
-        assert self.f.is_playable_day(config, "Saturday", date(2026, 3, 14)) is True
+        assert matches(self.f, config, "Saturday March 14th", "10:00am") is True
 
     def test_non_matching_day_of_week(self):
-        config = BethpageBlackBotConfig({"playable_days_of_week": ["Saturday"]})
-        assert self.f.is_playable_day(config, "Monday", date(2026, 3, 16)) is False
+        config = BethpageBlackBotConfig({"playable_days_of_week": ["Saturday"], "include_holidays": False})
+        assert matches(self.f, config, "Monday March 16th", "10:00am") is False
 
     def test_extra_playable_day(self):
         config = BethpageBlackBotConfig({
             "playable_days_of_week": [],
             "extra_playable_days": ["3/16/2026"],
         })
-        assert self.f.is_playable_day(config, "Monday", date(2026, 3, 16)) is True
+        assert matches(self.f, config, "Monday March 16th", "10:00am") is True
 
     def test_holiday(self):
         config = BethpageBlackBotConfig({
             "playable_days_of_week": [],
             "include_holidays": True,
         })
-        # July 4 is a real US holiday — now matched correctly after the format fix
-        assert self.f.is_playable_day(config, "Saturday", date(2026, 7, 4)) is True
+        # July 4 is a real US holiday
+        assert matches(self.f, config, "Saturday July 4th", "10:00am") is True
 
     def test_holiday_disabled(self):
         config = BethpageBlackBotConfig({
             "playable_days_of_week": [],
             "include_holidays": False,
         })
-        assert self.f.is_playable_day(config, "Saturday", date(2026, 7, 4)) is False
+        assert matches(self.f, config, "Saturday July 4th", "10:00am") is False
 
 
-class TestIsAfterEarliestAcceptableTime:
+class TestEarliestAcceptableTime:
     def setup_method(self):
         self.f = make_filterer()
 
     def test_after(self):
         config = BethpageBlackBotConfig({"earliest_playable_time": "8:00am"})
-        assert self.f.is_after_earliest_acceptable_time(config, time(9, 0)) is True
+        assert matches(self.f, config, "Saturday June 20th", "9:00am") is True
 
     def test_before(self):
         config = BethpageBlackBotConfig({"earliest_playable_time": "8:00am"})
-        assert self.f.is_after_earliest_acceptable_time(config, time(7, 0)) is False
+        assert matches(self.f, config, "Saturday June 20th", "7:00am") is False
 
     def test_equal_returns_false(self):
         config = BethpageBlackBotConfig({"earliest_playable_time": "8:00am"})
-        assert self.f.is_after_earliest_acceptable_time(config, time(8, 0)) is False
+        assert matches(self.f, config, "Saturday June 20th", "8:00am") is False
 
 
-class TestIsFarEnoughBeforeSunset:
+class TestBeforeSunset:
     def setup_method(self):
         self.f = make_filterer()
 
     def test_well_before_sunset(self):
-        config = BethpageBlackBotConfig({"minimum_minutes_before_sunset": 240})
+        config = BethpageBlackBotConfig({"earliest_playable_time": "7:00am", "minimum_minutes_before_sunset": 240})
         # Early morning is definitely before sunset - 4 hours
-        assert self.f.is_far_enough_before_sunset(config, date(2026, 6, 21), time(8, 0)) is True
+        assert matches(self.f, config, "Sunday June 21st", "8:00am") is True
 
     def test_too_close_to_sunset(self):
-        config = BethpageBlackBotConfig({"minimum_minutes_before_sunset": 240})
+        config = BethpageBlackBotConfig({"earliest_playable_time": "7:00am", "minimum_minutes_before_sunset": 240})
         # Late evening is too close to sunset
-        assert self.f.is_far_enough_before_sunset(config, date(2026, 6, 21), time(20, 0)) is False
+        assert matches(self.f, config, "Sunday June 21st", "8:00pm") is False
+
+
+class TestDateRangeBlackoutAndBookingWindow:
+    def setup_method(self):
+        self.f = make_filterer()
+
+    def test_outside_date_range(self):
+        config = BethpageBlackBotConfig({"start_date": "7/1", "end_date": "8/31"})
+        assert matches(self.f, config, "Saturday June 20th", "10:00am") is False
+        assert matches(self.f, config, "Saturday July 11th", "10:00am") is True
+
+    def test_blacked_out_date(self):
+        config = BethpageBlackBotConfig({"blackout_dates": ["2026-06-20"]})
+        assert matches(self.f, config, "Saturday June 20th", "10:00am") is False
+        assert matches(self.f, config, "Sunday June 21st", "10:00am") is True
+
+    def test_out_of_state_golfer_limited_to_booking_window(self):
+        config = BethpageBlackBotConfig({"in_state_golfer": False})
+        window_end = date(2026, 6, 20)
+        assert matches(self.f, config, "Saturday June 20th", "10:00am", last_out_of_state_date=window_end) is True
+        assert matches(self.f, config, "Sunday June 21st", "10:00am", last_out_of_state_date=window_end) is False
+
+    def test_in_state_golfer_ignores_booking_window(self):
+        config = BethpageBlackBotConfig({"in_state_golfer": True})
+        window_end = date(2026, 6, 20)
+        assert matches(self.f, config, "Sunday June 21st", "10:00am", last_out_of_state_date=window_end) is True
 
 
 class TestRemoveExistingTeeTimes:
@@ -117,6 +151,15 @@ class TestRemoveExistingTeeTimes:
         result = self.f.remove_existing_tee_times(current, None)
         assert result == current
 
+    def test_string_and_int_counts_match(self):
+        existing = [{"Date": "Sat", "Time": "8:00am", "Players": 2, "Holes": 18}]
+        current = [{"Date": "Sat", "Time": "8:00am", "Players": "2", "Holes": "18"}]
+        assert self.f.remove_existing_tee_times(current, existing) == []
+
+    def test_accepts_prebuilt_key_set(self):
+        current = [{"Date": "Sat", "Time": "8:00am", "Players": "2", "Holes": "18"}]
+        assert self.f.remove_existing_tee_times(current, {("Sat", "8:00am", 2, 18)}) == []
+
     def test_all_overlap(self):
         items = [{"Date": "Sat", "Time": "8:00am", "Players": "2", "Holes": "18"}]
         result = self.f.remove_existing_tee_times(items, items)
@@ -151,6 +194,21 @@ class TestFilterTeeTimesForUser:
         assert result[0]["Players"] == "3"
         assert result[0]["Holes"] == "18"
 
+    def test_accepts_tee_time_records(self):
+        from lambda_helpers.tee_time import TeeTime
+        f = make_filterer()
+        f.db_table = MagicMock()
+        f.db_table.get_user_config.return_value = BethpageBlackBotConfig({
+            "playable_days_of_week": ["Saturday"],
+            "earliest_playable_time": "7:00am",
+            "minimum_minutes_before_sunset": 60,
+        }).config_to_dynamodb_item("user@test.com")
+
+        good = TeeTime.from_labels("Saturday June 20th", "9:00am", "3", "18")
+        nine_holes = TeeTime.from_labels("Saturday June 20th", "9:00am", "3", "9")
+        result = f.filter_tee_times_for_user([good, nine_holes], "user@test.com")
+        assert result == [good]
+
     def test_notifications_disabled_returns_empty(self):
         f = make_filterer()
         config = BethpageBlackBotConfig({"notifications_enabled": False})
@@ -161,3 +219,50 @@ class TestFilterTeeTimesForUser:
         tee_times = [{"Date": "Saturday June 20th", "Time": "9:00am", "Players": "3", "Holes": "18"}]
         result = f.filter_tee_times_for_user(tee_times, "user@test.com")
         assert result == []
+
+
+class TestCompiledUserFilter:
+    def test_from_config_pre_parses_fields(self):
+        from lambda_helpers.compiled_user_filter import CompiledUserFilter
+        config = BethpageBlackBotConfig({
+            "earliest_playable_time": "7:30am",
+            "playable_days_of_week": ["Saturday", "Sunday"],
+            "blackout_dates": ["2026-06-20"],
+            "start_date": "4/1",
+            "end_date": "10/31",
+        })
+        user_filter = CompiledUserFilter.from_config(config)
+        assert user_filter.earliest_playable_time == time(7, 30)
+        assert user_filter.playable_days_of_week == frozenset({"Saturday", "Sunday"})
+        assert user_filter.blackout_dates == frozenset({"2026-06-20"})
+        assert user_filter.date_range == ((4, 1), (10, 31))
+
+    def test_unparseable_date_range_allows_all_dates(self):
+        from lambda_helpers.compiled_user_filter import CompiledUserFilter
+        config = BethpageBlackBotConfig({"start_date": "bad", "end_date": "11/30"})
+        user_filter = CompiledUserFilter.from_config(config)
+        assert user_filter.date_range is None
+        assert user_filter.is_in_date_range(date(2026, 1, 1)) is True
+
+    def test_user_config_compiled_once_per_run(self):
+        f = make_filterer()
+        f.db_table = MagicMock()
+        f.db_table.get_user_config.return_value = BethpageBlackBotConfig().config_to_dynamodb_item("user@test.com")
+
+        tee_times = [{"Date": "Saturday June 20th", "Time": "9:00am", "Players": "3", "Holes": "18"}]
+        f.filter_tee_times_for_user(tee_times, "user@test.com")
+        f.filter_tee_times_for_user(tee_times, "user@test.com")
+
+        f.db_table.get_user_config.assert_called_once_with("user@test.com")
+
+    def test_bulk_loaded_configs_skip_get_item(self):
+        f = make_filterer()
+        f.db_table = MagicMock()
+        f.db_table.get_user_configs.return_value = {
+            "user@test.com": BethpageBlackBotConfig({"min_players": 4}).config_to_dynamodb_item("user@test.com")
+        }
+        f.load_user_configs(["user@test.com", "new@test.com"])
+
+        assert f.get_user_filter("user@test.com").min_players == 4
+        assert f.get_user_filter("new@test.com").min_players == 2  # defaults
+        f.db_table.get_user_config.assert_not_called()
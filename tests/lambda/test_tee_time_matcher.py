@@ -0,0 +1,110 @@
+import random
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from lambda_helpers.bethpage_black_config import BethpageBlackBotConfig
+from lambda_helpers.date_handler import DateHandler
+from lambda_helpers.tee_time_filterer import TeeTimeFilterer
+
+DAYS_OF_WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def make_filterer(configs):
+    db = MagicMock()
+    db.get_user_config.side_effect = lambda email: configs.get(email)
+    return TeeTimeFilterer(db_connection=db)
+
+
+def date_label(days_from_today):
+    day = datetime.now().date() + timedelta(days=days_from_today)
+    return day.strftime(f"%A %B {day.day}{DateHandler().get_day_suffix(day.day)}")
+
+
+def make_random_users(count, rng):
+    configs = {}
+    for i in range(count):
+        email = f"user{i}@test.com"
+        extra_day = datetime.now().date() + timedelta(days=rng.randint(0, 8))
+        configs[email] = BethpageBlackBotConfig({
+            "playable_days_of_week": rng.sample(DAYS_OF_WEEK, rng.randint(0, 3)),
+            "earliest_playable_time": rng.choice(["6:00am", "8:00am", "10:00am", "1:00pm"]),
+            "min_players": rng.randint(1, 4),
+            "minimum_minutes_before_sunset": rng.choice([0, 120, 240]),
+            "include_holidays": rng.random() < 0.5,
+            "in_state_golfer": rng.random() < 0.5,
+            "notifications_enabled": rng.random() < 0.8,
+            "extra_playable_days": [f"{extra_day.month}/{extra_day.day}/{extra_day.year}"],
+            "blackout_dates": [extra_day.isoformat()] if rng.random() < 0.2 else [],
+            "start_date": rng.choice(["1/1", "3/1", "11/1"]),
+            "end_date": rng.choice(["12/31", "11/30", "3/31"]),
+        }).config_to_dynamodb_item(email)
+    return configs
+
+
+def make_random_tee_times(rng):
+    tee_times = []
+    for offset in range(9):
+        for _ in range(8):
+            hour = rng.randint(6, 19)
+            tee_times.append({
+                "Date": date_label(offset),
+                "Time": f"{hour % 12 or 12}:{rng.choice(['00', '30'])}{'am' if hour < 12 else 'pm'}",
+                "Players": rng.choice(["1", "2", "3", "4", 4]),
+                "Holes": rng.choice(["18", 18, "9"]),
+            })
+    return tee_times
+
+
+class TestTeeTimeMatcher:
+    def test_matches_per_user_filter(self):
+        rng = random.Random(7)
+        configs = make_random_users(200, rng)
+        tee_times = make_random_tee_times(rng)
+        emails = list(configs)
+
+        per_user = make_filterer(configs).filter_tee_times_for_users(tee_times, emails, use_index=False)
+        indexed = make_filterer(configs).filter_tee_times_for_users(tee_times, emails, use_index=True)
+
+        assert indexed == per_user
+        assert per_user  # sanity check: the random data produces matches
+
+    def test_disabled_users_never_match(self):
+        configs = {
+            "off@test.com": BethpageBlackBotConfig({
+                "notifications_enabled": False,
+                "playable_days_of_week": DAYS_OF_WEEK,
+            }).config_to_dynamodb_item("off@test.com")
+        }
+        tee_times = [{"Date": date_label(1), "Time": "9:00am", "Players": "4", "Holes": "18"}]
+        result = make_filterer(configs).filter_tee_times_for_users(tee_times, list(configs))
+        assert result == {}
+
+    def test_out_of_state_user_excluded_past_window(self):
+        configs = {
+            "oos@test.com": BethpageBlackBotConfig({
+                "in_state_golfer": False,
+                "playable_days_of_week": DAYS_OF_WEEK,
+                "start_date": "1/1",
+                "end_date": "12/31",
+                "minimum_minutes_before_sunset": 0,
+            }).config_to_dynamodb_item("oos@test.com")
+        }
+        near = {"Date": date_label(1), "Time": "9:00am", "Players": "4", "Holes": "18"}
+        far = {"Date": date_label(8), "Time": "9:00am", "Players": "4", "Holes": "18"}
+        result = make_filterer(configs).filter_tee_times_for_users([near, far], list(configs))
+        assert result == {"oos@test.com": [near]}
+
+    def test_user_reached_through_two_buckets_matches_once(self):
+        saturday = next(offset for offset in range(9) if date_label(offset).startswith("Saturday"))
+        day = datetime.now().date() + timedelta(days=saturday)
+        configs = {
+            "both@test.com": BethpageBlackBotConfig({
+                "playable_days_of_week": ["Saturday"],
+                "extra_playable_days": [f"{day.month}/{day.day}/{day.year}"],
+                "start_date": "1/1",
+                "end_date": "12/31",
+                "minimum_minutes_before_sunset": 0,
+            }).config_to_dynamodb_item("both@test.com")
+        }
+        slot = {"Date": date_label(saturday), "Time": "9:00am", "Players": "4", "Holes": "18"}
+        result = make_filterer(configs).filter_tee_times_for_users([slot], list(configs))
+        assert result == {"both@test.com": [slot]}
@@ -0,0 +1,227 @@
+import json
+from unittest.mock import MagicMock, patch
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from lambda_helpers import web_scraper
+from lambda_helpers.web_scraper import WebScraper
+
+DAY = "Saturday May 30th"
+
+
+def make_scraper():
+    scraper = WebScraper("user", "pass", scrape_mode="selenium")
+    scraper.driver = MagicMock()
+    return scraper
+
+
+def make_tile(start_time, holes, players):
+    tile = MagicMock()
+    spans = {
+        "div.booking-start-time-label": MagicMock(text=start_time),
+        "span.booking-slot-holes.js-booking-slot-holes": MagicMock(),
+        "span.booking-slot-players.js-booking-slot-players": MagicMock(),
+    }
+    spans["span.booking-slot-holes.js-booking-slot-holes"].find_element.return_value.text = holes
+    spans["span.booking-slot-players.js-booking-slot-players"].find_element.return_value.text = players
+    tile.find_element.side_effect = lambda by, selector: spans[selector]
+    return tile
+
+
+class TestExtractTimeTiles:
+    def test_parses_script_result(self):
+        scraper = make_scraper()
+        scraper.driver.execute_script.return_value = json.dumps([
+            {"time": "8:10am", "holes": "18", "players": "4"},
+            {"time": "1:40pm", "holes": "9", "players": "2"},
+        ])
+        result = scraper.extract_time_tiles(DAY)
+        assert [t.to_dict() for t in result] == [
+            {"Date": DAY, "Time": "8:10am", "Players": 4, "Holes": 18},
+            {"Date": DAY, "Time": "1:40pm", "Players": 2, "Holes": 9},
+        ]
+
+    def test_missing_field_is_malformed(self):
+        scraper = make_scraper()
+        scraper.driver.execute_script.return_value = json.dumps([{"time": "8:10am", "holes": None, "players": "4"}])
+        assert scraper.extract_time_tiles(DAY) is None
+
+    def test_non_json_is_malformed(self):
+        scraper = make_scraper()
+        scraper.driver.execute_script.return_value = None
+        assert scraper.extract_time_tiles(DAY) is None
+
+
+class TestAddAvailableTimesFromDay:
+    def test_uses_single_script_call(self):
+        scraper = make_scraper()
+        tile = make_tile("8:10am", "18", "4")
+        scraper.driver.find_elements.return_value = [tile]
+        scraper.driver.execute_script.return_value = json.dumps([{"time": "8:10am", "holes": "18", "players": "4"}])
+
+        tee_times = []
+        scraper.add_available_times_from_day(DAY, tee_times)
+
+        assert len(tee_times) == 1
+        tile.find_element.assert_not_called()
+
+    def test_falls_back_to_per_tile_reads(self):
+        scraper = make_scraper()
+        scraper.driver.find_elements.return_value = [make_tile("8:10am", "18", "4")]
+        scraper.driver.execute_script.return_value = "not json"
+
+        tee_times = []
+        scraper.add_available_times_from_day(DAY, tee_times)
+
+        assert [t.to_dict() for t in tee_times] == [{"Date": DAY, "Time": "8:10am", "Players": 4, "Holes": 18}]
+
+
+class FakeSpaDriver:
+    """
+    Signed-in foreUP tab: getting the URL it is already on is a fragment
+    navigation that leaves the current view alone, as in Chrome.
+    """
+
+    def __init__(self, view):
+        self.view = view
+        self.current_url = web_scraper.BETHPAGE_TEE_TIMES_WEBSITE_URL
+
+    def get(self, url):
+        if url.split("#")[0] != self.current_url.split("#")[0]:
+            self.view = "booking" if url == web_scraper.BETHPAGE_TEE_TIMES_WEBSITE_URL else "blank"
+        self.current_url = url
+
+    def find_element(self, by, value):
+        if self.view == "booking" and value == web_scraper.RESIDENT_BUTTON_XPATH:
+            return MagicMock()
+        raise NoSuchElementException(value)
+
+    def find_elements(self, by, value):
+        return []  # signed in, so no login link
+
+
+class TestBrowserReuse:
+    def setup_method(self):
+        WebScraper._shared_driver = None
+
+    def teardown_method(self):
+        WebScraper._shared_driver = None
+
+    def make_reusing_scraper(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(web_scraper, "COOKIES_PATH", str(tmp_path / "cookies.json"))
+        return WebScraper("user", "pass", scrape_mode="selenium", reuse_browser=True)
+
+    def test_close_parks_driver_and_saves_cookies(self, tmp_path, monkeypatch):
+        scraper = self.make_reusing_scraper(tmp_path, monkeypatch)
+        scraper.driver = MagicMock()
+        scraper.driver.get_cookies.return_value = [{"name": "PHPSESSID", "value": "abc"}]
+
+        scraper.close_driver()
+
+        assert WebScraper._shared_driver is scraper.driver
+        scraper.driver.quit.assert_not_called()
+        assert json.loads((tmp_path / "cookies.json").read_text()) == [{"name": "PHPSESSID", "value": "abc"}]
+
+    def test_start_driver_attaches_shared_driver(self, tmp_path, monkeypatch):
+        shared = MagicMock()
+        WebScraper._shared_driver = shared
+        scraper = self.make_reusing_scraper(tmp_path, monkeypatch)
+
+        with patch.object(web_scraper.webdriver, "Chrome") as chrome:
+            scraper.start_driver()
+
+        chrome.assert_not_called()
+        assert scraper.driver is shared
+        assert [c.args for c in shared.get.call_args_list] == [
+            ("about:blank",), (web_scraper.BETHPAGE_TEE_TIMES_WEBSITE_URL,)
+        ]
+
+    def test_reused_driver_left_on_calendar_reloads_booking_page(self, tmp_path, monkeypatch):
+        WebScraper._shared_driver = FakeSpaDriver(view="calendar")
+        scraper = self.make_reusing_scraper(tmp_path, monkeypatch)
+
+        with patch.object(web_scraper.webdriver, "Chrome") as chrome:
+            scraper.start_driver()
+        with patch.object(scraper, "login") as login:
+            assert scraper.ensure_logged_in() is True
+
+        chrome.assert_not_called()
+        assert scraper.driver.view == "booking"
+        login.assert_not_called()
+
+    def test_dead_shared_driver_is_discarded(self, tmp_path, monkeypatch):
+        shared = MagicMock()
+        shared.get.side_effect = WebDriverException("chrome not reachable")
+        WebScraper._shared_driver = shared
+        scraper = self.make_reusing_scraper(tmp_path, monkeypatch)
+
+        assert scraper.attach_shared_driver() is False
+        assert WebScraper._shared_driver is None
+        shared.quit.assert_called_once()
+
+    def test_valid_session_skips_login(self, tmp_path, monkeypatch):
+        scraper = self.make_reusing_scraper(tmp_path, monkeypatch)
+        scraper.driver = MagicMock()
+        scraper.driver.find_elements.return_value = []
+
+        with patch.object(scraper, "login") as login:
+            assert scraper.ensure_logged_in() is True
+        login.assert_not_called()
+
+    def test_expired_session_logs_in_again(self, tmp_path, monkeypatch):
+        scraper = self.make_reusing_scraper(tmp_path, monkeypatch)
+        scraper.driver = MagicMock()
+        scraper.driver.find_elements.return_value = [MagicMock(**{"is_displayed.return_value": True})]
+        scraper.driver.get_cookies.return_value = []
+
+        with patch.object(scraper, "login", return_value=True) as login:
+            assert scraper.ensure_logged_in() is True
+        login.assert_called_once()
+        assert (tmp_path / "cookies.json").exists()
+
+    def test_load_cookies_restores_saved_session(self, tmp_path, monkeypatch):
+        scraper = self.make_reusing_scraper(tmp_path, monkeypatch)
+        (tmp_path / "cookies.json").write_text(json.dumps([{"name": "PHPSESSID", "value": "abc"}]))
+        scraper.driver = MagicMock()
+
+        scraper.load_cookies()
+
+        scraper.driver.add_cookie.assert_called_once_with({"name": "PHPSESSID", "value": "abc"})
+        scraper.driver.refresh.assert_called_once()
+
+    def test_without_reuse_driver_is_quit(self):
+        scraper = make_scraper()
+        driver = scraper.driver
+        scraper.close_driver()
+        driver.quit.assert_called_once()
+        assert WebScraper._shared_driver is None
+
+
+class TestScrapeCalendar:
+    def run_scrape(self, day_texts, signature="8:00am"):
+        scraper = make_scraper()
+        scraper.driver.execute_script.return_value = signature
+        days = [MagicMock(text=text) for text in day_texts] + [None]
+        with patch.object(scraper, "ensure_logged_in", return_value=True), \
+             patch.object(scraper, "move_to_calendar_page", return_value=True), \
+             patch.object(scraper, "get_available_day", side_effect=days), \
+             patch.object(scraper, "wait_for_day_to_activate") as activate, \
+             patch.object(scraper, "wait_for_day_to_replace") as replace, \
+             patch.object(scraper, "add_available_times_from_day"), \
+             patch.object(web_scraper, "DateHandler"):
+            scraper.scrape_calendar()
+        return activate, replace
+
+    def test_first_day_skips_replace_wait(self):
+        activate, replace = self.run_scrape(["30"])
+        activate.assert_called_once_with("30")
+        replace.assert_not_called()
+
+    def test_later_days_wait_for_previous_list(self):
+        activate, replace = self.run_scrape(["30", "31"])
+        assert [c.args for c in activate.call_args_list] == [("30",), ("31",)]
+        replace.assert_called_once()
+
+    def test_consecutive_empty_days_skip_replace_wait(self):
+        # Fully booked days all show the same no-times header, which nothing could tell apart
+        activate, replace = self.run_scrape(["30", "31", "1"], signature="")
+        assert [c.args for c in activate.call_args_list] == [("30",), ("31",), ("1",)]
+        replace.assert_not_called()